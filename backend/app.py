@@ -1,15 +1,22 @@
 """
 Main FastAPI application for Open DPIA Assistant
 """
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, Header, HTTPException, Query, Request, status
+from fastapi import Response as HTTPResponse
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
-from typing import List, Optional
-import os
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from pydantic import TypeAdapter
+from starlette.concurrency import run_in_threadpool
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+import asyncio
 
-from db import get_db, init_db
-from models import Assessment, Response, Mitigation, AssessmentStatus, RiskLevel
+from db import AsyncReadSessionLocal, get_db, get_read_db, init_async_db, close_db
+from models import Assessment, Response, Mitigation, AssessmentStatus, RiskLevel, ASSESSMENT_DETAIL_LOADERS
 from schemas import (
     AssessmentCreate,
     AssessmentUpdate,
@@ -18,23 +25,84 @@ from schemas import (
     ResponseCreate,
     ResponseUpdate,
     ResponseResponse,
+    ResponseBatchCreate,
+    ResponseBatchResult,
+    AssessmentChanges,
     MitigationCreate,
     MitigationUpdate,
     MitigationResponse,
     RiskSummary,
     QuestionsResponse,
+    QuestionCategory,
     GDPRArticle,
+    SearchResponse,
+    BulkExportRequest,
+    BulkExportStatus,
+    ExportFormat,
+    TableFormat,
+    PortfolioStats,
+)
+from config import (
+    CORS_ORIGINS,
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    MAX_BATCH_RESPONSES,
+    RISK_STREAM_DEBOUNCE,
+    RISK_STREAM_KEEPALIVE,
+    STATIC_PAYLOAD_MAX_AGE,
+    MAX_SEARCH_RESULTS,
+    EXPORT_STREAM_BATCH,
+    BULK_EXPORT_CONCURRENCY,
+    BULK_EXPORT_MAX_ASSESSMENTS,
+    BULK_EXPORT_JOBS_KEPT,
+    EXPORT_TABLE_CHUNK,
+    STATS_CACHE_TTL,
+    STATS_CACHE_MAX_BYTES,
 )
-from config import CORS_ORIGINS
 from utils import (
     calculate_response_risk_score,
-    calculate_assessment_risk,
+    score_responses,
+    detect_risk_modifiers,
     determine_risk_level,
-    export_to_pdf,
-    export_to_json,
-    load_questions,
-    load_gdpr_articles,
+    report_renderer,
+    export_cache,
+    export_cache_key,
+    RenderQueueFull,
+    RenderTimeout,
+    JSONExportEncoder,
+    HTMLReportRenderer,
     get_question_by_id,
+    question_catalog,
+    gdpr_catalog,
+    encode_cursor,
+    decode_cursor,
+    apply_response_delta,
+    adjust_category_totals,
+    read_portfolio_stats,
+    read_risk_summary,
+    refresh_assessment_risk,
+    touch_assessment,
+    mark_assessment_in_progress,
+    upsert_responses,
+    load_mitigations,
+    record_tombstones,
+    read_changes,
+    CacheBackend,
+    MemoryCache,
+    NullCache,
+    get_cache_backend,
+    invalidate_assessment,
+    format_etag,
+    etag_matches,
+    etag_versions,
+    http_date,
+    UpdateHub,
+    EncodedPayload,
+    get_search_index,
+    BulkExportJobs,
+    stream_bulk_export,
+    table_encoder,
+    TABLE_MEDIA_TYPES,
 )
 
 # Initialize FastAPI app
@@ -51,14 +119,106 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Last-Modified", "X-Export-Job"],
 )
 
 
+@app.exception_handler(OperationalError)
+@app.exception_handler(PoolTimeoutError)
+async def database_busy_handler(request: Request, exc: Exception):
+    """Ask clients to retry writes that timed out waiting for the database"""
+    if isinstance(exc, OperationalError) and "database is locked" not in str(exc.orig):
+        raise exc
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Database is busy, try again shortly"},
+        headers={"Retry-After": "1"},
+    )
+
+
+async def compute_risk_summary(assessment_id: str) -> Optional[Tuple[int, bytes]]:
+    """Encoded risk summary of an assessment and its version, None if it is gone"""
+    # Off the write connection: on SQLite the read pool sees the commit that
+    # published the update; a lagging replica catches up on the next change
+    async with AsyncReadSessionLocal() as db:
+        version = await db.scalar(select(Assessment.version).where(Assessment.id == assessment_id))
+        if version is None:
+            return None
+        summary = await db.run_sync(read_risk_summary, assessment_id)
+    
+    return version, RiskSummary.model_validate(summary).model_dump_json().encode()
+
+
+# Pushes one recomputed risk summary to every stream of an assessment
+risk_summary_hub = UpdateHub(compute_risk_summary, RISK_STREAM_DEBOUNCE)
+
+
 # Initialize database on startup
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database tables"""
-    init_db()
+    """Initialize database tables, encode the static payloads and build the search index"""
+    await init_async_db()
+    get_question_payloads()
+    get_gdpr_article_payloads()
+    get_search_index()
+    report_renderer.start()
+    await run_in_threadpool(export_cache.load)
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close database connections"""
+    await risk_summary_hub.close()
+    await close_db()
+    await run_in_threadpool(report_renderer.shutdown)
+
+
+def validator_headers(version: int, last_modified: Optional[datetime]) -> dict:
+    """ETag and Last-Modified headers for an assessment version"""
+    headers = {"ETag": format_etag(version), "Cache-Control": "no-cache"}
+    if last_modified:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+async def get_validators(db: AsyncSession, assessment_id: str) -> dict:
+    """Read the validator headers of an assessment, 404 if it does not exist"""
+    row = (await db.execute(
+        select(Assessment.version, Assessment.created_at, Assessment.updated_at)
+        .where(Assessment.id == assessment_id)
+    )).first()
+    
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Assessment not found"
+        )
+    
+    return validator_headers(row.version, row.updated_at or row.created_at)
+
+
+async def claim_assessment(db: AsyncSession, assessment_id: str, if_match: Optional[str]) -> int:
+    """
+    Bump the version of an assessment before changing it and return the new
+    version, which the changed rows store as their revision
+    With If-Match, the version is only bumped if it still matches (412 otherwise)
+    """
+    expected = etag_versions(if_match) if if_match else None
+    
+    version = await db.run_sync(touch_assessment, assessment_id, expected)
+    if version:
+        return version
+    
+    if expected is not None and await db.get(Assessment, assessment_id) is not None:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Assessment has been modified"
+        )
+    
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Assessment not found"
+    )
 
 
 @app.get("/")
@@ -78,7 +238,7 @@ async def root():
 @app.post("/api/assessments", response_model=AssessmentResponse, status_code=status.HTTP_201_CREATED)
 async def create_assessment(
     assessment: AssessmentCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new assessment"""
     db_assessment = Assessment(
@@ -89,36 +249,72 @@ async def create_assessment(
     )
     
     db.add(db_assessment)
-    db.commit()
-    db.refresh(db_assessment)
+    await db.commit()
+    await db.refresh(db_assessment)
+    await db.refresh(db_assessment, ["responses"])
     
     return db_assessment
 
 
 @app.get("/api/assessments", response_model=List[AssessmentListResponse])
 async def list_assessments(
-    status: Optional[str] = None,
+    http_response: HTTPResponse,
+    status_filter: Optional[str] = Query(None, alias="status"),
     risk_level: Optional[str] = None,
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    skip: int = Query(0, ge=0, deprecated=True),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """List all assessments with optional filters"""
-    query = db.query(Assessment)
+    """
+    List assessments with optional filters, newest first
+    Pass the X-Next-Cursor response header back as `cursor` for the next page
+    """
+    query = select(Assessment)
     
-    if status:
-        query = query.filter(Assessment.status == status)
+    if status_filter:
+        query = query.where(Assessment.status == status_filter)
     
     if risk_level:
-        query = query.filter(Assessment.overall_risk_level == risk_level)
+        query = query.where(Assessment.overall_risk_level == risk_level)
+    
+    if cursor:
+        try:
+            created_at, assessment_id = decode_cursor(cursor)
+            created_at = datetime.fromisoformat(created_at)
+        except (ValueError, TypeError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        query = query.where(or_(
+            Assessment.created_at < created_at,
+            and_(Assessment.created_at == created_at, Assessment.id < assessment_id),
+        ))
+    elif skip:
+        query = query.offset(skip)
     
-    assessments = query.offset(skip).limit(limit).all()
+    query = query.order_by(Assessment.created_at.desc(), Assessment.id.desc())
+    assessments = (await db.scalars(query.limit(limit + 1))).all()
+    
+    if len(assessments) > limit:
+        assessments = assessments[:limit]
+        last = assessments[-1]
+        http_response.headers["X-Next-Cursor"] = encode_cursor(
+            [last.created_at.isoformat(), last.id]
+        )
+    
+    # Count responses for the whole page in one grouped query
+    response_counts = dict((await db.execute(
+        select(Response.assessment_id, func.count(Response.id))
+        .where(Response.assessment_id.in_([a.id for a in assessments]))
+        .group_by(Response.assessment_id)
+    )).all()) if assessments else {}
     
-    # Add response count to each assessment
     result = []
     for assessment in assessments:
         assessment_dict = AssessmentListResponse.from_orm(assessment).dict()
-        assessment_dict["response_count"] = len(assessment.responses)
+        assessment_dict["response_count"] = response_counts.get(assessment.id, 0)
         result.append(assessment_dict)
     
     return result
@@ -127,28 +323,55 @@ async def list_assessments(
 @app.get("/api/assessments/{assessment_id}", response_model=AssessmentResponse)
 async def get_assessment(
     assessment_id: str,
-    db: Session = Depends(get_db)
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get a specific assessment by ID"""
-    assessment = db.query(Assessment).filter(Assessment.id == assessment_id).first()
+    headers = await get_validators(db, assessment_id)
     
-    if not assessment:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Assessment not found"
+    if if_none_match and etag_matches(if_none_match, headers["ETag"]):
+        return HTTPResponse(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    # Serve the encoded payload of this version if it is cached
+    cache = get_cache_backend()
+    payload = cache.get(assessment_id, f"detail:{headers['ETag']}")
+    
+    if payload is None:
+        assessment = await db.scalar(
+            select(Assessment)
+            .where(Assessment.id == assessment_id)
+            .options(*ASSESSMENT_DETAIL_LOADERS)
         )
+        
+        if not assessment:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Assessment not found"
+            )
+        
+        payload = AssessmentResponse.model_validate(assessment).model_dump_json().encode()
+        headers = validator_headers(assessment.version, assessment.updated_at or assessment.created_at)
+        cache.set(assessment_id, f"detail:{headers['ETag']}", payload)
     
-    return assessment
+    return HTTPResponse(content=payload, media_type="application/json", headers=headers)
 
 
 @app.put("/api/assessments/{assessment_id}", response_model=AssessmentResponse)
 async def update_assessment(
     assessment_id: str,
     assessment_update: AssessmentUpdate,
-    db: Session = Depends(get_db)
+    http_response: HTTPResponse,
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db)
 ):
-    """Update an assessment"""
-    assessment = db.query(Assessment).filter(Assessment.id == assessment_id).first()
+    """Update an assessment (honours If-Match)"""
+    await claim_assessment(db, assessment_id, if_match)
+    
+    assessment = await db.scalar(
+        select(Assessment)
+        .where(Assessment.id == assessment_id)
+        .options(*ASSESSMENT_DETAIL_LOADERS)
+    )
     
     if not assessment:
         raise HTTPException(
@@ -161,8 +384,13 @@ async def update_assessment(
     for field, value in update_data.items():
         setattr(assessment, field, value)
     
-    db.commit()
-    db.refresh(assessment)
+    await db.commit()
+    await db.refresh(assessment, ["updated_at"])
+    invalidate_assessment(assessment_id)
+    
+    http_response.headers.update(
+        validator_headers(assessment.version, assessment.updated_at or assessment.created_at)
+    )
     
     return assessment
 
@@ -170,10 +398,13 @@ async def update_assessment(
 @app.delete("/api/assessments/{assessment_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_assessment(
     assessment_id: str,
-    db: Session = Depends(get_db)
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db)
 ):
-    """Delete an assessment"""
-    assessment = db.query(Assessment).filter(Assessment.id == assessment_id).first()
+    """Delete an assessment (honours If-Match)"""
+    await claim_assessment(db, assessment_id, if_match)
+    
+    assessment = await db.get(Assessment, assessment_id)
     
     if not assessment:
         raise HTTPException(
@@ -181,8 +412,11 @@ async def delete_assessment(
             detail="Assessment not found"
         )
     
-    db.delete(assessment)
-    db.commit()
+    await db.run_sync(adjust_category_totals, assessment_id, -1)
+    await db.delete(assessment)
+    await db.commit()
+    invalidate_assessment(assessment_id)
+    risk_summary_hub.publish(assessment_id)
     
     return None
 
@@ -190,37 +424,70 @@ async def delete_assessment(
 @app.get("/api/assessments/{assessment_id}/risk-summary", response_model=RiskSummary)
 async def get_risk_summary(
     assessment_id: str,
-    db: Session = Depends(get_db)
+    http_response: HTTPResponse,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get risk summary for an assessment"""
-    assessment = db.query(Assessment).filter(Assessment.id == assessment_id).first()
+    headers = await get_validators(db, assessment_id)
     
-    if not assessment:
+    if if_none_match and etag_matches(if_none_match, headers["ETag"]):
+        return HTTPResponse(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    http_response.headers.update(headers)
+    
+    # Risk is maintained incrementally on every response write
+    return await db.run_sync(read_risk_summary, assessment_id)
+
+
+@app.get("/api/assessments/{assessment_id}/risk-summary/stream")
+async def stream_risk_summary(
+    assessment_id: str,
+    last_event_id: Optional[str] = Header(None)
+):
+    """
+    Stream the risk summary of an assessment as server-sent events
+    Sends the current summary, then a new one after responses change. Event
+    ids are assessment versions; on reconnect the current summary is skipped
+    if the Last-Event-ID is still current. A "deleted" event ends the stream.
+    """
+    async with AsyncReadSessionLocal() as db:
+        exists = await db.scalar(select(Assessment.id).where(Assessment.id == assessment_id))
+    
+    if not exists:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Assessment not found"
         )
     
-    # Get all responses
-    responses = [
-        {
-            "question_id": r.question_id,
-            "category": r.category,
-            "answer": r.answer,
-            "risk_score": r.risk_score,
-        }
-        for r in assessment.responses
-    ]
-    
-    # Calculate risk
-    risk_analysis = calculate_assessment_risk(responses)
+    sent = int(last_event_id) if last_event_id and last_event_id.isdigit() else 0
     
-    # Update assessment with calculated risk
-    assessment.overall_risk_score = risk_analysis["overall_risk_score"]
-    assessment.overall_risk_level = RiskLevel(risk_analysis["overall_risk_level"])
-    db.commit()
+    async def events():
+        nonlocal sent
+        # Subscribe before reading the current summary so no write is missed
+        async with risk_summary_hub.subscribe(assessment_id) as updates:
+            update = await compute_risk_summary(assessment_id)
+            while update is not None:
+                version, payload = update
+                # Updates computed concurrently may arrive out of order
+                if version > sent:
+                    sent = version
+                    yield b"event: risk-summary\nid: %d\ndata: %s\n\n" % (version, payload)
+                
+                while True:
+                    try:
+                        update = await asyncio.wait_for(updates.get(), RISK_STREAM_KEEPALIVE)
+                        break
+                    except asyncio.TimeoutError:
+                        yield b": keep-alive\n\n"
+            
+            yield b"event: deleted\ndata: {}\n\n"
     
-    return risk_analysis
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 # ============================================================================
@@ -231,18 +498,9 @@ async def get_risk_summary(
 async def create_response(
     assessment_id: str,
     response: ResponseCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """Submit a response to a question"""
-    # Verify assessment exists
-    assessment = db.query(Assessment).filter(Assessment.id == assessment_id).first()
-    
-    if not assessment:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Assessment not found"
-        )
-    
+    """Submit a response to a question (insert or update by question)"""
     # Get question data
     question_data = get_question_by_id(response.question_id)
     
@@ -258,52 +516,118 @@ async def create_response(
         response.answer,
         question_data
     )
+    special_category_data, children_data = detect_risk_modifiers(response.answer)
     
-    # Check if response already exists
-    existing_response = db.query(Response).filter(
-        Response.assessment_id == assessment_id,
-        Response.question_id == response.question_id
-    ).first()
-    
-    if existing_response:
-        # Update existing response
-        existing_response.answer = response.answer
-        existing_response.notes = response.notes
-        existing_response.risk_score = risk_score
-        existing_response.category = question_data.get("category")
-        db.commit()
-        db.refresh(existing_response)
-        return existing_response
-    
-    # Create new response
-    db_response = Response(
-        assessment_id=assessment_id,
-        question_id=response.question_id,
-        category=question_data.get("category"),
-        answer=response.answer,
-        risk_score=risk_score,
-        notes=response.notes,
-    )
-    
-    db.add(db_response)
+    # Update assessment status; also verifies the assessment exists
+    version = await db.run_sync(mark_assessment_in_progress, assessment_id)
+    if not version:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Assessment not found"
+        )
     
-    # Update assessment status
-    if assessment.status == AssessmentStatus.DRAFT:
-        assessment.status = AssessmentStatus.IN_PROGRESS
+    # Insert or update the response in a single statement
+    (db_response,), _ = await db.run_sync(upsert_responses, assessment_id, [{
+        "question_id": response.question_id,
+        "category": question_data.get("category"),
+        "answer": response.answer,
+        "risk_score": risk_score,
+        "special_category_data": special_category_data,
+        "children_data": children_data,
+        "notes": response.notes,
+    }], version)
+    await db.run_sync(load_mitigations, [db_response])
     
-    db.commit()
-    db.refresh(db_response)
+    await db.commit()
+    invalidate_assessment(assessment_id)
+    risk_summary_hub.publish(assessment_id)
     
     return db_response
 
 
+@app.post("/api/assessments/{assessment_id}/responses:batch", response_model=ResponseBatchResult)
+async def create_responses_batch(
+    assessment_id: str,
+    batch: ResponseBatchCreate,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Submit answers for a whole wizard step in one transaction
+    Later answers to the same question replace earlier ones
+    """
+    if len(batch.responses) > MAX_BATCH_RESPONSES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {MAX_BATCH_RESPONSES} responses per batch"
+        )
+    
+    # Last answer per question wins
+    items = list({item.question_id: item for item in batch.responses}.values())
+    
+    # Get question data
+    questions = [get_question_by_id(item.question_id) for item in items]
+    missing = [item.question_id for item, question in zip(items, questions) if not question]
+    
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Question not found: {', '.join(missing)}"
+        )
+    
+    # Score all answers in one pass
+    risk_scores = score_responses((item.question_id, item.answer) for item in items)
+    
+    # Update assessment status; also verifies the assessment exists
+    version = await db.run_sync(mark_assessment_in_progress, assessment_id)
+    if not version:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Assessment not found"
+        )
+    
+    rows = []
+    for item, question_data, risk_score in zip(items, questions, risk_scores):
+        special_category_data, children_data = detect_risk_modifiers(item.answer)
+        rows.append({
+            "question_id": item.question_id,
+            "category": question_data.get("category"),
+            "answer": item.answer,
+            "risk_score": risk_score,
+            "special_category_data": special_category_data,
+            "children_data": children_data,
+            "notes": item.notes,
+        })
+    
+    db_responses, risk_summary = await db.run_sync(upsert_responses, assessment_id, rows, version)
+    await db.run_sync(load_mitigations, db_responses)
+    await db.commit()
+    invalidate_assessment(assessment_id)
+    risk_summary_hub.publish(assessment_id)
+    
+    return {
+        "responses": db_responses,
+        "risk_summary": risk_summary,
+    }
+
+
 @app.get("/api/assessments/{assessment_id}/responses", response_model=List[ResponseResponse])
 async def get_responses(
     assessment_id: str,
-    db: Session = Depends(get_db)
+    http_response: HTTPResponse,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all responses for an assessment"""
-    assessment = db.query(Assessment).filter(Assessment.id == assessment_id).first()
+    headers = await get_validators(db, assessment_id)
+    
+    if if_none_match and etag_matches(if_none_match, headers["ETag"]):
+        return HTTPResponse(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    assessment = await db.scalar(
+        select(Assessment)
+        .where(Assessment.id == assessment_id)
+        .options(*ASSESSMENT_DETAIL_LOADERS)
+    )
     
     if not assessment:
         raise HTTPException(
@@ -311,17 +635,76 @@ async def get_responses(
             detail="Assessment not found"
         )
     
+    http_response.headers.update(
+        validator_headers(assessment.version, assessment.updated_at or assessment.created_at)
+    )
+    
     return assessment.responses
 
 
+@app.get("/api/assessments/{assessment_id}/changes", response_model=AssessmentChanges)
+async def get_changes(
+    assessment_id: str,
+    since: int = Query(0, ge=0, description="Cursor returned by the previous sync; 0 for everything"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Get the responses and mitigations created, updated or deleted after a
+    cursor, and the cursor to send next time
+    """
+    row = (await db.execute(
+        select(Assessment.version, Assessment.pruned_revision).where(Assessment.id == assessment_id)
+    )).first()
+    
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Assessment not found"
+        )
+    
+    if since > row.version:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor is ahead of the assessment"
+        )
+    
+    # Deletions after the cursor may have been pruned
+    if 0 < since < row.pruned_revision:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Cursor has expired, sync again from 0"
+        )
+    
+    return await db.run_sync(read_changes, assessment_id, since, row.version)
+
+
 @app.put("/api/responses/{response_id}", response_model=ResponseResponse)
 async def update_response(
     response_id: str,
     response_update: ResponseUpdate,
-    db: Session = Depends(get_db)
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db)
 ):
-    """Update a response"""
-    response = db.query(Response).filter(Response.id == response_id).first()
+    """
+    Update a response
+    If-Match is checked against the ETag of the parent assessment
+    """
+    assessment_id = await db.scalar(select(Response.assessment_id).where(Response.id == response_id))
+    
+    if not assessment_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Response not found"
+        )
+    
+    # Lock the assessment before reading the values the deltas are based on
+    version = await claim_assessment(db, assessment_id, if_match)
+    
+    response = await db.scalar(
+        select(Response)
+        .where(Response.id == response_id)
+        .options(selectinload(Response.mitigations))
+    )
     
     if not response:
         raise HTTPException(
@@ -331,7 +714,18 @@ async def update_response(
     
     # Update fields
     if response_update.answer is not None:
+        await db.run_sync(
+            apply_response_delta,
+            response.assessment_id,
+            response.category,
+            response.risk_score,
+            response.answer,
+            -1,
+        )
         response.answer = response_update.answer
+        response.special_category_data, response.children_data = detect_risk_modifiers(
+            response_update.answer
+        )
         
         # Recalculate risk score
         question_data = get_question_by_id(response.question_id)
@@ -341,16 +735,88 @@ async def update_response(
                 response_update.answer,
                 question_data
             )
+        
+        await db.run_sync(
+            apply_response_delta,
+            response.assessment_id,
+            response.category,
+            response.risk_score,
+            response.answer,
+        )
+        await db.run_sync(refresh_assessment_risk, response.assessment_id)
     
     if response_update.notes is not None:
         response.notes = response_update.notes
     
-    db.commit()
-    db.refresh(response)
+    response.revision = version
+    
+    await db.commit()
+    await db.refresh(response, ["updated_at"])
+    invalidate_assessment(response.assessment_id)
+    if response_update.answer is not None:
+        risk_summary_hub.publish(response.assessment_id)
     
     return response
 
 
+@app.delete("/api/responses/{response_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_response(
+    response_id: str,
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Delete a response and its mitigations
+    If-Match is checked against the ETag of the parent assessment
+    """
+    assessment_id = await db.scalar(select(Response.assessment_id).where(Response.id == response_id))
+    
+    if not assessment_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Response not found"
+        )
+    
+    # Lock the assessment before reading the values the deltas are based on
+    version = await claim_assessment(db, assessment_id, if_match)
+    
+    response = await db.scalar(
+        select(Response)
+        .where(Response.id == response_id)
+        .options(selectinload(Response.mitigations))
+    )
+    
+    if not response:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Response not found"
+        )
+    
+    await db.run_sync(
+        apply_response_delta,
+        response.assessment_id,
+        response.category,
+        response.risk_score,
+        response.answer,
+        -1,
+    )
+    await db.run_sync(record_tombstones, assessment_id, version, "response", [response.id])
+    await db.run_sync(
+        record_tombstones,
+        assessment_id,
+        version,
+        "mitigation",
+        [mitigation.id for mitigation in response.mitigations],
+    )
+    await db.delete(response)
+    await db.run_sync(refresh_assessment_risk, assessment_id)
+    await db.commit()
+    invalidate_assessment(assessment_id)
+    risk_summary_hub.publish(assessment_id)
+    
+    return None
+
+
 # ============================================================================
 # Mitigation Endpoints
 # ============================================================================
@@ -358,11 +824,11 @@ async def update_response(
 @app.post("/api/mitigations", response_model=MitigationResponse, status_code=status.HTTP_201_CREATED)
 async def create_mitigation(
     mitigation: MitigationCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a mitigation measure"""
     # Verify response exists
-    response = db.query(Response).filter(Response.id == mitigation.response_id).first()
+    response = await db.get(Response, mitigation.response_id)
     
     if not response:
         raise HTTPException(
@@ -370,16 +836,19 @@ async def create_mitigation(
             detail="Response not found"
         )
     
+    version = await db.run_sync(touch_assessment, response.assessment_id)
     db_mitigation = Mitigation(
         response_id=mitigation.response_id,
         description=mitigation.description,
         gdpr_article=mitigation.gdpr_article,
         priority=mitigation.priority,
+        revision=version,
     )
     
     db.add(db_mitigation)
-    db.commit()
-    db.refresh(db_mitigation)
+    await db.commit()
+    await db.refresh(db_mitigation)
+    invalidate_assessment(response.assessment_id)
     
     return db_mitigation
 
@@ -388,10 +857,10 @@ async def create_mitigation(
 async def update_mitigation(
     mitigation_id: str,
     mitigation_update: MitigationUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Update a mitigation measure"""
-    mitigation = db.query(Mitigation).filter(Mitigation.id == mitigation_id).first()
+    mitigation = await db.get(Mitigation, mitigation_id)
     
     if not mitigation:
         raise HTTPException(
@@ -404,31 +873,132 @@ async def update_mitigation(
     for field, value in update_data.items():
         setattr(mitigation, field, value)
     
-    db.commit()
-    db.refresh(mitigation)
+    assessment_id = await db.scalar(
+        select(Response.assessment_id).where(Response.id == mitigation.response_id)
+    )
+    mitigation.revision = await db.run_sync(touch_assessment, assessment_id)
+    await db.commit()
+    await db.refresh(mitigation)
+    invalidate_assessment(assessment_id)
     
     return mitigation
 
 
+# ============================================================================
+# Portfolio Statistics Endpoints
+# ============================================================================
+
+# Encoded statistics by limit, apart from the per-assessment response cache
+stats_cache: CacheBackend = (
+    MemoryCache(STATS_CACHE_MAX_BYTES, STATS_CACHE_TTL)
+    if STATS_CACHE_TTL > 0
+    else NullCache()
+)
+
+
+@app.get("/api/stats", response_model=PortfolioStats)
+async def get_portfolio_stats(
+    limit: int = Query(10, ge=1, le=100, description="Organizations and categories to list"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Dashboard statistics over all assessments: counts by status and risk
+    level, the organizations with the most assessments and their average
+    risk, and the categories with the most high-risk responses
+    Computed at most once per STATS_CACHE_TTL seconds
+    """
+    payload = stats_cache.get("portfolio", str(limit))
+    
+    if payload is None:
+        stats = await db.run_sync(read_portfolio_stats, limit)
+        payload = PortfolioStats.model_validate(stats).model_dump_json().encode()
+        stats_cache.set("portfolio", str(limit), payload)
+    
+    return HTTPResponse(
+        content=payload,
+        media_type="application/json",
+        headers={"Cache-Control": f"max-age={int(STATS_CACHE_TTL)}"},
+    )
+
+
 # ============================================================================
 # Questions & GDPR Articles Endpoints
 # ============================================================================
 
+def build_question_payloads(catalog) -> Tuple[EncodedPayload, Dict[str, EncodedPayload]]:
+    """Validate the question catalog and encode all questions and each category"""
+    questions = QuestionsResponse.model_validate(catalog.data)
+    categories: Dict[str, EncodedPayload] = {}
+    for category in questions.categories:
+        categories.setdefault(category.id, EncodedPayload(category.model_dump_json().encode()))
+    return EncodedPayload(questions.model_dump_json().encode()), categories
+
+
+def build_gdpr_article_payloads(catalog) -> Tuple[EncodedPayload, Dict[str, EncodedPayload]]:
+    """Validate the GDPR articles and encode the list and each article"""
+    adapter = TypeAdapter(List[GDPRArticle])
+    articles = adapter.validate_python(catalog.articles)
+    by_number: Dict[str, EncodedPayload] = {}
+    for article in articles:
+        by_number.setdefault(article.number, EncodedPayload(article.model_dump_json().encode()))
+    return EncodedPayload(adapter.dump_json(articles)), by_number
+
+
+def get_question_payloads() -> Tuple[EncodedPayload, Dict[str, EncodedPayload]]:
+    """Encoded question payloads, rebuilt when questions.json changes"""
+    return question_catalog.derived("payloads", build_question_payloads)
+
+
+def get_gdpr_article_payloads() -> Tuple[EncodedPayload, Dict[str, EncodedPayload]]:
+    """Encoded GDPR article payloads, rebuilt when gdpr_articles.json changes"""
+    return gdpr_catalog.derived("payloads", build_gdpr_article_payloads)
+
+
+def serve_payload(
+    payload: EncodedPayload,
+    if_none_match: Optional[str],
+    accept_encoding: Optional[str]
+) -> HTTPResponse:
+    """Send the best encoded variant of a payload, or 304 if the client has it"""
+    encoding, body = payload.select(accept_encoding)
+    headers = {
+        "ETag": payload.etag(encoding),
+        "Cache-Control": f"public, max-age={STATIC_PAYLOAD_MAX_AGE}",
+        "Vary": "Accept-Encoding",
+    }
+    
+    # Any variant is as fresh as any other
+    if if_none_match and any(etag_matches(if_none_match, etag) for etag in payload.etags):
+        return HTTPResponse(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    
+    return HTTPResponse(content=body, media_type="application/json", headers=headers)
+
+
 @app.get("/api/questions", response_model=QuestionsResponse)
-async def get_questions():
+async def get_questions(
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None)
+):
     """Get all questions"""
-    questions_data = load_questions()
-    return questions_data
+    questions, _ = get_question_payloads()
+    return serve_payload(questions, if_none_match, accept_encoding)
 
 
-@app.get("/api/questions/{category}")
-async def get_questions_by_category(category: str):
+@app.get("/api/questions/{category}", response_model=QuestionCategory)
+async def get_questions_by_category(
+    category: str,
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None)
+):
     """Get questions by category"""
-    questions_data = load_questions()
+    _, categories = get_question_payloads()
+    payload = categories.get(category)
     
-    for cat in questions_data.get("categories", []):
-        if cat.get("id") == category:
-            return cat
+    if payload:
+        return serve_payload(payload, if_none_match, accept_encoding)
     
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
@@ -437,20 +1007,27 @@ async def get_questions_by_category(category: str):
 
 
 @app.get("/api/gdpr-articles", response_model=List[GDPRArticle])
-async def get_gdpr_articles():
+async def get_gdpr_articles(
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None)
+):
     """Get all GDPR articles"""
-    gdpr_data = load_gdpr_articles()
-    return gdpr_data.get("articles", [])
+    articles, _ = get_gdpr_article_payloads()
+    return serve_payload(articles, if_none_match, accept_encoding)
 
 
 @app.get("/api/gdpr-articles/{article_number}", response_model=GDPRArticle)
-async def get_gdpr_article(article_number: str):
+async def get_gdpr_article(
+    article_number: str,
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None)
+):
     """Get a specific GDPR article"""
-    gdpr_data = load_gdpr_articles()
+    _, articles = get_gdpr_article_payloads()
+    payload = articles.get(article_number)
     
-    for article in gdpr_data.get("articles", []):
-        if article.get("number") == article_number:
-            return article
+    if payload:
+        return serve_payload(payload, if_none_match, accept_encoding)
     
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
@@ -458,26 +1035,28 @@ async def get_gdpr_article(article_number: str):
     )
 
 
+@app.get("/api/search", response_model=SearchResponse)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    type: Optional[str] = Query(None, pattern="^(question|gdpr_article)$"),
+    limit: int = Query(20, ge=1, le=MAX_SEARCH_RESULTS)
+):
+    """Search GDPR articles and questions, best matches first"""
+    total, results = get_search_index().search(q, limit, type)
+    return {"query": q, "total": total, "results": results}
+
+
 # ============================================================================
 # Export Endpoints
 # ============================================================================
 
-@app.get("/api/assessments/{assessment_id}/export/pdf")
-async def export_assessment_pdf(
-    assessment_id: str,
-    db: Session = Depends(get_db)
-):
-    """Export assessment as PDF"""
-    assessment = db.query(Assessment).filter(Assessment.id == assessment_id).first()
-    
-    if not assessment:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Assessment not found"
-        )
-    
-    # Prepare assessment data
-    assessment_data = {
+# File extension of each report media type (HTML when ReportLab is missing)
+REPORT_EXTENSIONS = {"application/pdf": "pdf", "text/html": "html"}
+
+
+def report_data(assessment: Assessment) -> dict:
+    """Data a report is rendered from; needs the assessment's responses loaded"""
+    return {
         "id": assessment.id,
         "title": assessment.title,
         "description": assessment.description,
@@ -494,34 +1073,84 @@ async def export_assessment_pdf(
                 "risk_score": r.risk_score,
                 "notes": r.notes,
             }
-            for r in assessment.responses
+            # Stable order, so unchanged data hashes to the same cache key
+            for r in sorted(assessment.responses, key=lambda r: r.question_id)
         ],
     }
+
+
+@app.get("/api/assessments/{assessment_id}/export/pdf")
+async def export_assessment_pdf(
+    assessment_id: str,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Export assessment as PDF"""
+    assessment = await db.scalar(
+        select(Assessment)
+        .where(Assessment.id == assessment_id)
+        .options(selectinload(Assessment.responses))
+    )
     
-    # Generate PDF
-    filepath = export_to_pdf(assessment_data)
-    
-    # Return file
-    if os.path.exists(filepath):
-        return FileResponse(
-            filepath,
-            media_type="application/pdf",
-            filename=os.path.basename(filepath)
+    if not assessment:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Assessment not found"
         )
     
-    raise HTTPException(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        detail="Failed to generate PDF"
+    assessment_data = report_data(assessment)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    
+    # Serve an earlier export of exactly this data
+    key = export_cache_key(assessment_data, "pdf")
+    content = None
+    cached = await run_in_threadpool(export_cache.get, key)
+    if cached:
+        path, media_type = cached
+        try:
+            content = await run_in_threadpool(path.read_bytes)
+        except FileNotFoundError:
+            # Evicted since the lookup
+            pass
+    
+    if content is None:
+        # Generate PDF in the rendering pool
+        try:
+            media_type, content = await report_renderer.render(assessment_data)
+        except RenderQueueFull:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many exports in progress, try again shortly",
+                headers={"Retry-After": "5"}
+            )
+        except RenderTimeout:
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail="Generating the PDF took too long"
+            )
+        await run_in_threadpool(export_cache.put, key, content, REPORT_EXTENSIONS[media_type])
+    
+    filename = f"dpia_assessment_{assessment_id}_{timestamp}.{REPORT_EXTENSIONS.get(media_type, 'pdf')}"
+    
+    return HTTPResponse(
+        content=content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
 
 
 @app.get("/api/assessments/{assessment_id}/export/json")
 async def export_assessment_json(
     assessment_id: str,
-    db: Session = Depends(get_db)
+    compact: bool = Query(False, description="Omit indentation and whitespace"),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Export assessment as JSON"""
-    assessment = db.query(Assessment).filter(Assessment.id == assessment_id).first()
+    """
+    Export assessment as JSON
+    The document is encoded while the responses are read from a server-side
+    cursor, so memory use does not grow with the assessment and nothing is
+    written to disk
+    """
+    assessment = await db.get(Assessment, assessment_id)
     
     if not assessment:
         raise HTTPException(
@@ -540,34 +1169,265 @@ async def export_assessment_json(
         "overall_risk_score": assessment.overall_risk_score,
         "created_at": str(assessment.created_at),
         "updated_at": str(assessment.updated_at),
-        "responses": [
-            {
-                "question_id": r.question_id,
-                "answer": r.answer,
-                "risk_score": r.risk_score,
-                "notes": r.notes,
-            }
-            for r in assessment.responses
-        ],
     }
     
-    # Generate JSON
-    filepath = export_to_json(assessment_data)
+    async def body():
+        encoder = JSONExportEncoder(indent=None if compact else 2)
+        yield encoder.start(assessment_data)
+        
+        # The endpoint's session is closed before the body is sent
+        async with AsyncReadSessionLocal() as stream_db:
+            result = await stream_db.stream(
+                select(Response.question_id, Response.answer, Response.risk_score, Response.notes)
+                .where(Response.assessment_id == assessment_id)
+                .order_by(Response.question_id)
+                .execution_options(yield_per=EXPORT_STREAM_BATCH)
+            )
+            async for rows in result.mappings().partitions():
+                yield encoder.responses(rows)
+            
+            risk_summary = await stream_db.run_sync(read_risk_summary, assessment_id)
+        
+        yield encoder.end(risk_summary)
+    
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"dpia_assessment_{assessment_id}_{timestamp}.json"
     
-    # Return file
-    if os.path.exists(filepath):
-        return FileResponse(
-            filepath,
-            media_type="application/json",
-            filename=os.path.basename(filepath)
+    return StreamingResponse(
+        body(),
+        media_type="application/json",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@app.get("/api/assessments/{assessment_id}/export/html")
+async def export_assessment_html(
+    assessment_id: str,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Export assessment as an HTML report
+    The report is rendered while the responses are read from a server-side
+    cursor and sent as it is rendered
+    """
+    assessment = await db.get(Assessment, assessment_id)
+    
+    if not assessment:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Assessment not found"
         )
     
-    raise HTTPException(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        detail="Failed to generate JSON"
+    assessment_data = {
+        "title": assessment.title,
+        "description": assessment.description,
+        "organization": assessment.organization,
+        "overall_risk_level": assessment.overall_risk_level.value if assessment.overall_risk_level else "low",
+        "overall_risk_score": assessment.overall_risk_score,
+    }
+    
+    async def body():
+        renderer = HTMLReportRenderer()
+        yield renderer.start(assessment_data)
+        
+        # The endpoint's session is closed before the body is sent
+        async with AsyncReadSessionLocal() as stream_db:
+            result = await stream_db.stream(
+                select(Response.question_id, Response.answer, Response.risk_score, Response.notes)
+                .where(Response.assessment_id == assessment_id)
+                .order_by(Response.question_id)
+                .execution_options(yield_per=EXPORT_STREAM_BATCH)
+            )
+            async for rows in result.mappings().partitions():
+                yield renderer.responses(rows)
+        
+        yield renderer.end()
+    
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"dpia_assessment_{assessment_id}_{timestamp}.html"
+    
+    return StreamingResponse(
+        body(),
+        media_type="text/html; charset=utf-8",
+        headers={"Content-Disposition": f'inline; filename="{filename}"'},
+    )
+
+
+@app.get("/api/exports/responses.{format}")
+async def export_responses_table(format: TableFormat):
+    """
+    Export every response with its assessment as CSV, Arrow or Parquet
+    Rows are read from a server-side cursor and encoded a chunk at a time, so
+    memory use does not grow with the number of responses
+    """
+    try:
+        encoder = table_encoder(format.value)
+    except RuntimeError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail=str(exc)
+        )
+    
+    async def body():
+        yield encoder.start()
+        
+        async with AsyncReadSessionLocal() as db:
+            result = await db.stream(
+                select(
+                    Response.assessment_id,
+                    Assessment.title.label("assessment_title"),
+                    Assessment.organization,
+                    Assessment.status.label("assessment_status"),
+                    Assessment.overall_risk_level,
+                    Assessment.overall_risk_score,
+                    Response.id.label("response_id"),
+                    Response.question_id,
+                    Response.category,
+                    Response.answer,
+                    Response.risk_score,
+                    Response.special_category_data,
+                    Response.children_data,
+                    Response.notes,
+                    Response.created_at,
+                    Response.updated_at,
+                )
+                .join(Assessment, Assessment.id == Response.assessment_id)
+                .order_by(Response.assessment_id, Response.question_id)
+                .execution_options(yield_per=EXPORT_TABLE_CHUNK)
+            )
+            async for records in result.mappings().partitions():
+                # Encoding a chunk is CPU-bound
+                yield await run_in_threadpool(encoder.chunk, records)
+        
+        yield await run_in_threadpool(encoder.end)
+    
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"dpia_responses_{timestamp}.{format.value}"
+    
+    return StreamingResponse(
+        body(),
+        media_type=TABLE_MEDIA_TYPES[format.value],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+bulk_export_jobs = BulkExportJobs(BULK_EXPORT_JOBS_KEPT)
+
+
+async def export_assessment_files(assessment_id: str, formats: List[ExportFormat]) -> List[Tuple[str, bytes]]:
+    """Render the export files of one assessment for a bulk export"""
+    async with AsyncReadSessionLocal() as db:
+        assessment = await db.scalar(
+            select(Assessment)
+            .where(Assessment.id == assessment_id)
+            .options(selectinload(Assessment.responses))
+        )
+        if assessment is None:
+            raise LookupError("Assessment not found")
+        assessment_data = report_data(assessment)
+        risk_summary = await db.run_sync(read_risk_summary, assessment_id)
+    
+    files = []
+    name = f"dpia_assessment_{assessment_id}"
+    
+    if ExportFormat.PDF in formats:
+        key = export_cache_key(assessment_data, "pdf")
+        content = None
+        cached = await run_in_threadpool(export_cache.get, key)
+        if cached:
+            path, media_type = cached
+            try:
+                content = await run_in_threadpool(path.read_bytes)
+            except FileNotFoundError:
+                # Evicted since the lookup
+                pass
+        if content is None:
+            # Bulk jobs wait for a free worker instead of failing
+            media_type, content = await report_renderer.render(assessment_data, wait=True)
+            await run_in_threadpool(export_cache.put, key, content, REPORT_EXTENSIONS[media_type])
+        files.append((f"{name}.{REPORT_EXTENSIONS.get(media_type, 'pdf')}", content))
+    
+    if ExportFormat.JSON in formats:
+        encoder = JSONExportEncoder()
+        header = {key: value for key, value in assessment_data.items() if key != "responses"}
+        files.append((
+            f"{name}.json",
+            encoder.start(header) + encoder.responses(assessment_data["responses"]) + encoder.end(risk_summary),
+        ))
+    
+    return files
+
+
+@app.post("/api/exports/bulk")
+async def bulk_export(
+    export_filter: BulkExportRequest,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Export every assessment matching the filter as one ZIP archive
+    Assessments are rendered in parallel and the archive is streamed as they
+    complete; the X-Export-Job header names the job to poll for progress
+    """
+    query = select(Assessment.id)
+    
+    if export_filter.status:
+        query = query.where(Assessment.status.in_([AssessmentStatus(s.value) for s in export_filter.status]))
+    
+    if export_filter.risk_level:
+        query = query.where(Assessment.overall_risk_level.in_([RiskLevel(r.value) for r in export_filter.risk_level]))
+    
+    if export_filter.organization:
+        query = query.where(Assessment.organization == export_filter.organization)
+    
+    if export_filter.created_from:
+        query = query.where(Assessment.created_at >= export_filter.created_from)
+    
+    if export_filter.created_to:
+        query = query.where(Assessment.created_at <= export_filter.created_to)
+    
+    assessment_ids = (await db.scalars(
+        query.order_by(Assessment.created_at, Assessment.id).limit(BULK_EXPORT_MAX_ASSESSMENTS + 1)
+    )).all()
+    
+    if len(assessment_ids) > BULK_EXPORT_MAX_ASSESSMENTS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {BULK_EXPORT_MAX_ASSESSMENTS} assessments per bulk export"
+        )
+    
+    formats = list(dict.fromkeys(export_filter.formats))
+    job = bulk_export_jobs.create(len(assessment_ids))
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    
+    return StreamingResponse(
+        stream_bulk_export(
+            job,
+            assessment_ids,
+            lambda assessment_id: export_assessment_files(assessment_id, formats),
+            BULK_EXPORT_CONCURRENCY,
+        ),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f'attachment; filename="dpia_assessments_{timestamp}.zip"',
+            "X-Export-Job": job.id,
+        },
     )
 
 
+@app.get("/api/exports/bulk/{job_id}", response_model=BulkExportStatus)
+async def get_bulk_export_status(job_id: str):
+    """Progress of a bulk export"""
+    job = bulk_export_jobs.get(job_id)
+    
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Export job not found"
+        )
+    
+    return job.to_dict()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,225 @@
+"""
+Latency of the assessment endpoints under many parallel clients, with the
+previous blocking session handlers and with the async session handlers
+
+Usage (from the backend directory):
+    python benchmarks/concurrency.py [--clients 200] [--requests-per-client 5]
+
+Runs against a throwaway SQLite database. Clients fetch assessments, every
+Nth one a large assessment, so slow requests are mixed in. Each statement
+is delayed by --query-latency to stand in for the network round trip to a
+database server; with blocking handlers that wait happens on the event loop
+and every other request queues behind it.
+
+Both variants get a connection pool as large as the number of clients.
+With the default pool the blocking variant stalls outright: the event loop
+blocks in pool checkout waiting for connections that only the loop itself
+can release, until the 30 s pool timeout.
+"""
+import argparse
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+QUERY_LATENCY = 0.0
+
+
+class SlowCursor(sqlite3.Cursor):
+    """Cursor that waits before each statement, like a remote database"""
+
+    def execute(self, *args):
+        time.sleep(QUERY_LATENCY)
+        return super().execute(*args)
+
+    def executemany(self, *args):
+        time.sleep(QUERY_LATENCY)
+        return super().executemany(*args)
+
+
+class SlowConnection(sqlite3.Connection):
+    def cursor(self, factory=SlowCursor):
+        return super().cursor(factory)
+
+
+def populate(engine, assessments: int, large_responses: int) -> dict:
+    from sqlalchemy import text
+
+    rows = [{"id": str(uuid.uuid4()), "title": f"Assessment {i}"} for i in range(assessments)]
+    large = rows[0]["id"]
+
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO assessments (id, title, organization, status, overall_risk_score, created_at) "
+            "VALUES (:id, :title, 'Org', 'IN_PROGRESS', 0.5, datetime('now'))"
+        ), rows)
+        conn.execute(text(
+            "INSERT INTO responses (id, assessment_id, question_id, category, answer, risk_score, "
+            "special_category_data, children_data) "
+            "VALUES (:id, :assessment_id, :question_id, 'general', '{\"v\": \"yes\"}', 0.5, 0, 0)"
+        ), [
+            {"id": str(uuid.uuid4()), "assessment_id": row["id"], "question_id": f"q-{j}"}
+            for row in rows
+            for j in range(large_responses if row["id"] == large else 5)
+        ])
+
+    return {"large": large, "small": [row["id"] for row in rows[1:]]}
+
+
+def build_blocking_app(pool_size: int):
+    """The assessment endpoint as it was: async handler, sync session"""
+    from fastapi import Depends, FastAPI, HTTPException
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session, sessionmaker
+
+    from config import DATABASE_URL
+    from models import Assessment
+    from schemas import AssessmentResponse
+
+    engine = create_engine(
+        DATABASE_URL,
+        connect_args={"check_same_thread": False, "factory": SlowConnection},
+        pool_size=pool_size,
+    )
+    SessionLocal = sessionmaker(autoflush=False, expire_on_commit=False, bind=engine)
+    app = FastAPI()
+
+    def get_sync_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @app.get("/api/assessments/{assessment_id}", response_model=AssessmentResponse)
+    async def get_assessment(assessment_id: str, db: Session = Depends(get_sync_db)):
+        assessment = db.query(Assessment).filter(Assessment.id == assessment_id).first()
+        if not assessment:
+            raise HTTPException(status_code=404, detail="Assessment not found")
+        return assessment
+
+    return app
+
+
+def build_async_app(pool_size: int):
+    """The API as it is, on an engine with the same latency and pool size"""
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+    from app import app
+    from config import DATABASE_URL
+    from db import get_db, get_read_db, to_async_url
+
+    engine = create_async_engine(
+        to_async_url(DATABASE_URL),
+        connect_args={"factory": SlowConnection},
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=pool_size,
+    )
+    AsyncSessionLocal = async_sessionmaker(
+        engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
+
+    async def get_slow_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = get_slow_db
+    app.dependency_overrides[get_read_db] = get_slow_db
+    return app, engine
+
+
+async def run_load(app, ids: dict, clients: int, per_client: int, large_every: int) -> dict:
+    import httpx
+
+    latencies = []
+
+    async def client(index: int) -> None:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+            for n in range(per_client):
+                if (index * per_client + n) % large_every == 0:
+                    assessment_id = ids["large"]
+                else:
+                    assessment_id = ids["small"][(index + n) % len(ids["small"])]
+                started = time.perf_counter()
+                response = await http.get(f"/api/assessments/{assessment_id}")
+                latencies.append(time.perf_counter() - started)
+                response.raise_for_status()
+
+    # Warm up connections and compiled statement caches
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        for assessment_id in [ids["large"], *ids["small"][:10]]:
+            await http.get(f"/api/assessments/{assessment_id}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(clients)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "throughput": len(latencies) / elapsed,
+        "p50": latencies[len(latencies) // 2],
+        "p99": latencies[max(int(len(latencies) * 0.99) - 1, 0)],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests-per-client", type=int, default=5)
+    parser.add_argument("--assessments", type=int, default=1000)
+    parser.add_argument("--large-responses", type=int, default=300)
+    parser.add_argument("--large-every", type=int, default=50, help="Every Nth request fetches the large assessment")
+    parser.add_argument("--query-latency", type=float, default=2.0, help="Milliseconds added to each statement")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+
+        from db import engine, init_db
+
+        init_db()
+        print(
+            f"Populating {args.assessments} assessments "
+            f"(one with {args.large_responses} responses)..."
+        )
+        ids = populate(engine, args.assessments, args.large_responses)
+        engine.dispose()
+
+        global QUERY_LATENCY
+        QUERY_LATENCY = args.query_latency / 1000
+
+        results = {}
+        results["blocking"] = asyncio.run(run_load(
+            build_blocking_app(args.clients), ids, args.clients,
+            args.requests_per_client, args.large_every,
+        ))
+
+        async_app, async_engine = build_async_app(args.clients)
+        results["async"] = asyncio.run(run_load(
+            async_app, ids, args.clients, args.requests_per_client,
+            args.large_every,
+        ))
+        asyncio.run(async_engine.dispose())
+
+    print(
+        f"\n{args.clients} parallel clients, {args.requests_per_client} requests each, "
+        f"{args.query_latency} ms per statement"
+    )
+    for name, result in results.items():
+        print(
+            f"  {name:9} p50 {result['p50'] * 1000:8.1f} ms   p99 {result['p99'] * 1000:8.1f} ms   "
+            f"{result['throughput']:7.1f} req/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Render throughput of the HTML report, with the previous f-string renderer
+and with the compiled streaming renderer
+
+Usage (from the backend directory):
+    python benchmarks/html_report.py [--responses 1000] [--repeat 50]
+
+Reports are rendered from generated data using the question catalog, with
+markup in the user fields. The previous renderer is kept here as the
+baseline; it builds the whole document in one f-string and escapes nothing.
+Exits with status 1 if the streaming renderer leaves user markup unescaped
+or does not resolve question text, so it can be run as a check.
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+MARKUP = "<script>alert('x')</script>"
+
+
+def render_html_fstring(assessment_data):
+    """The HTML report renderer before it was compiled and streamed"""
+    html_content = f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>DPIA Assessment - {assessment_data.get('title')}</title>
+        <style>
+            body {{ font-family: Arial, sans-serif; margin: 40px; }}
+            h1 {{ color: #2c3e50; }}
+            h2 {{ color: #34495e; margin-top: 30px; }}
+            .risk-badge {{
+                display: inline-block;
+                padding: 5px 15px;
+                border-radius: 5px;
+                font-weight: bold;
+            }}
+            .risk-low {{ background-color: #2ecc71; color: white; }}
+            .risk-medium {{ background-color: #f39c12; color: white; }}
+            .risk-high {{ background-color: #e74c3c; color: white; }}
+            .risk-critical {{ background-color: #c0392b; color: white; }}
+            .response {{ margin: 20px 0; padding: 15px; background-color: #ecf0f1; border-radius: 5px; }}
+        </style>
+    </head>
+    <body>
+        <h1>Data Protection Impact Assessment</h1>
+        <h2>{assessment_data.get('title')}</h2>
+        <p><strong>Organization:</strong> {assessment_data.get('organization')}</p>
+        <p><strong>Date:</strong> {datetime.now().strftime('%B %d, %Y')}</p>
+
+        <h2>Risk Assessment</h2>
+        <p>
+            <strong>Risk Level:</strong>
+            <span class="risk-badge risk-{assessment_data.get('overall_risk_level', 'low')}">
+                {assessment_data.get('overall_risk_level', 'N/A').upper()}
+            </span>
+        </p>
+        <p><strong>Risk Score:</strong> {assessment_data.get('overall_risk_score', 0):.2f}</p>
+
+        <h2>Description</h2>
+        <p>{assessment_data.get('description', 'No description provided.')}</p>
+
+        <h2>Responses</h2>
+        {"".join(f'''
+        <div class="response">
+            <p><strong>Question:</strong> {r.get('question_id')}</p>
+            <p><strong>Answer:</strong> {json.dumps(r.get('answer'))}</p>
+            <p><strong>Risk Score:</strong> {r.get('risk_score', 0):.2f}</p>
+            {f"<p><strong>Notes:</strong> {r.get('notes')}</p>" if r.get('notes') else ""}
+        </div>
+        ''' for r in assessment_data.get('responses', []))}
+    </body>
+    </html>
+    """
+
+    return html_content
+
+
+def build_assessment(size: int) -> dict:
+    from utils import question_catalog
+
+    questions = list(question_catalog.questions.values())
+    responses = []
+    for i in range(size):
+        question = questions[i % len(questions)] if questions else {"id": f"q-{i}"}
+        options = [option.get("value") for option in question.get("options") or []]
+        if question.get("type") == "multi-select":
+            answer = options[:2]
+        elif options:
+            answer = options[i % len(options)]
+        else:
+            answer = f"Free text answer {i} {MARKUP}"
+        responses.append({
+            "question_id": question.get("id"),
+            "answer": answer,
+            "risk_score": (i % 10) / 10,
+            "notes": f"Reviewed by the DPO & legal {MARKUP}" if i % 3 == 0 else None,
+        })
+
+    return {
+        "id": "benchmark",
+        "title": f"Customer analytics {MARKUP}",
+        "description": f"Processing of <b>behavioural</b> data & profiles {MARKUP}",
+        "organization": "Example & Co",
+        "status": "completed",
+        "overall_risk_level": "high",
+        "overall_risk_score": 0.72,
+        "responses": responses,
+    }
+
+
+def measure(render, repeat: int):
+    """Median seconds per full render, and seconds to the first chunk"""
+    totals, firsts, size = [], [], 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        chunks = render()
+        first = next(chunks)
+        firsts.append(time.perf_counter() - started)
+        size = len(first) + sum(len(chunk) for chunk in chunks)
+        totals.append(time.perf_counter() - started)
+    return statistics.median(totals), statistics.median(firsts), size
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--responses", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    from utils import render_html_report, question_catalog
+
+    data = build_assessment(args.responses)
+    variants = {
+        "f-string": lambda: iter([render_html_fstring(data).encode("utf-8")]),
+        "compiled, streamed": lambda: render_html_report(data),
+    }
+
+    print(f"{args.responses} responses, median of {args.repeat} renders")
+    print(f"{'renderer':>20} {'ms/render':>10} {'first chunk ms':>15} {'MB/s':>8} {'KiB':>8}")
+    for name, render in variants.items():
+        total, first, size = measure(render, args.repeat)
+        print(
+            f"{name:>20} {total * 1000:>10.2f} {first * 1000:>15.3f} "
+            f"{size / total / 1e6:>8.1f} {size / 1024:>8.0f}"
+        )
+
+    report = b"".join(render_html_report(data)).decode("utf-8")
+    failed = False
+    if MARKUP in report:
+        print("FAIL: user markup is not escaped")
+        failed = True
+    texts = [question.get("text") for question in question_catalog.questions.values()]
+    if texts and not any(text and text in report for text in texts):
+        print("FAIL: question text is not resolved from the catalog")
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""
+Number of SQL statements issued to serialize a full assessment, for growing
+numbers of responses
+
+Usage (from the backend directory):
+    python benchmarks/query_counts.py [--sizes 10 100 1000 5000]
+
+Runs against a throwaway SQLite database. Exits with status 1 if the
+endpoints issue more statements for larger assessments, or more than the
+expected number, so it can be run as a check.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Endpoint -> maximum number of statements
+ENDPOINTS = {
+    "/api/assessments/{id}": 3,
+    "/api/assessments/{id}/responses": 3,
+}
+
+
+def populate(engine, size: int) -> str:
+    from sqlalchemy import text
+
+    assessment_id = str(uuid.uuid4())
+    responses = [
+        {"id": str(uuid.uuid4()), "assessment_id": assessment_id, "question_id": f"q-{i}"}
+        for i in range(size)
+    ]
+
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO assessments (id, title, organization, status, overall_risk_score) "
+            "VALUES (:id, 'Assessment', 'Org', 'IN_PROGRESS', 0.5)"
+        ), {"id": assessment_id})
+        conn.execute(text(
+            "INSERT INTO responses (id, assessment_id, question_id, category, answer, risk_score, "
+            "special_category_data, children_data) "
+            "VALUES (:id, :assessment_id, :question_id, 'general', '{\"v\": \"yes\"}', 0.5, 0, 0)"
+        ), responses)
+        conn.execute(text(
+            "INSERT INTO mitigations (id, response_id, description, status) "
+            "VALUES (:id, :response_id, 'Mitigation', 'PROPOSED')"
+        ), [
+            {"id": str(uuid.uuid4()), "response_id": response["id"]}
+            for response in responses[::2]
+        ])
+
+    return assessment_id
+
+
+def count_lazy(assessment_id: str) -> int:
+    """Statements issued when the relationships are lazy loaded"""
+    from sqlalchemy import event
+
+    from db import SessionLocal, engine
+    from models import Assessment
+    from schemas import AssessmentResponse
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        with SessionLocal() as db:
+            assessment = db.get(Assessment, assessment_id)
+            AssessmentResponse.model_validate(assessment, from_attributes=True)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    return len(statements)
+
+
+async def count_endpoints(app, assessment_id: str) -> dict:
+    import httpx
+    from sqlalchemy import event
+
+    from db import async_engine, read_async_engine
+
+    # The GET endpoints use the read engine, which SQLite files always have
+    engines = {async_engine.sync_engine, (read_async_engine or async_engine).sync_engine}
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", listener)
+
+    counts = {}
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+            for endpoint in ENDPOINTS:
+                statements.clear()
+                response = await http.get(endpoint.format(id=assessment_id))
+                response.raise_for_status()
+                counts[endpoint] = len(statements)
+    finally:
+        for engine in engines:
+            event.remove(engine, "before_cursor_execute", listener)
+    return counts
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+        os.environ.pop("READ_DATABASE_URL", None)
+
+        from app import app
+        from db import close_db, engine, init_db
+
+        init_db()
+
+        rows = []
+        for size in args.sizes:
+            assessment_id = populate(engine, size)
+            counts = asyncio.run(count_endpoints(app, assessment_id))
+            rows.append((size, count_lazy(assessment_id), counts))
+
+        asyncio.run(close_db())
+        engine.dispose()
+
+    print(f"{'responses':>10} {'lazy':>8} " + " ".join(f"{endpoint:>34}" for endpoint in ENDPOINTS))
+    for size, lazy, counts in rows:
+        print(f"{size:>10} {lazy:>8} " + " ".join(f"{counts[endpoint]:>34}" for endpoint in ENDPOINTS))
+
+    failed = False
+    for endpoint, limit in ENDPOINTS.items():
+        observed = {counts[endpoint] for _, _, counts in rows}
+        if len(observed) > 1 or max(observed) > limit:
+            print(f"FAIL {endpoint}: {sorted(observed)} statements (expected a constant <= {limit})")
+            failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
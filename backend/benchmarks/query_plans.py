@@ -0,0 +1,161 @@
+"""
+Query plans and timings for the hot lookup paths, with and without the
+indexes added for them in migrations 0001 and 0005
+
+Usage (from the backend directory):
+    python benchmarks/query_plans.py [--assessments 20000] [--responses-per-assessment 40]
+
+Runs against a throwaway SQLite database.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, text  # noqa: E402
+
+from db import Base  # noqa: E402
+import models  # noqa: E402,F401
+
+INDEXES = [
+    "ix_assessments_status_risk_created",
+    "ix_assessments_created_id",
+    "ux_responses_assessment_question",
+    "ix_mitigations_response_id",
+    "ix_assessments_organization_score",
+]
+
+QUERIES = {
+    "response by (assessment, question)": (
+        "SELECT id FROM responses WHERE assessment_id = :assessment_id AND question_id = :question_id"
+    ),
+    "mitigations by response": (
+        "SELECT id FROM mitigations WHERE response_id = :response_id"
+    ),
+    "filtered assessment list": (
+        "SELECT id FROM assessments WHERE status = 'COMPLETED' AND overall_risk_level = 'HIGH' "
+        "ORDER BY created_at DESC, id DESC LIMIT 100"
+    ),
+    "assessment list page": (
+        "SELECT id FROM assessments ORDER BY created_at DESC, id DESC LIMIT 100"
+    ),
+    "organization statistics": (
+        "SELECT organization, COUNT(*), AVG(overall_risk_score) FROM assessments "
+        "GROUP BY organization ORDER BY COUNT(*) DESC, organization LIMIT 10"
+    ),
+}
+
+
+def populate(engine, assessments: int, per_assessment: int) -> dict:
+    statuses = ["DRAFT", "IN_PROGRESS", "COMPLETED"]
+    levels = ["LOW", "MEDIUM", "HIGH", "CRITICAL"]
+    sample = {}
+
+    with engine.begin() as conn:
+        assessment_rows = []
+        response_rows = []
+        mitigation_rows = []
+        for i in range(assessments):
+            assessment_id = str(uuid.uuid4())
+            assessment_rows.append({
+                "id": assessment_id,
+                "title": f"Assessment {i}",
+                "organization": f"Org {i % 50}",
+                "status": statuses[i % 3],
+                "level": levels[i % 4],
+                "offset": f"-{i} seconds",
+            })
+            for j in range(per_assessment):
+                response_id = str(uuid.uuid4())
+                response_rows.append({
+                    "id": response_id,
+                    "assessment_id": assessment_id,
+                    "question_id": f"q-{j}",
+                })
+                if j % 10 == 0:
+                    mitigation_rows.append({"id": str(uuid.uuid4()), "response_id": response_id})
+            sample = {
+                "assessment_id": assessment_id,
+                "question_id": f"q-{per_assessment // 2}",
+                "response_id": response_rows[-1]["id"],
+            }
+
+        conn.execute(text(
+            "INSERT INTO assessments (id, title, organization, status, overall_risk_level, "
+            "overall_risk_score, created_at) VALUES (:id, :title, :organization, :status, :level, "
+            "0.5, datetime('now', :offset))"
+        ), assessment_rows)
+        conn.execute(text(
+            "INSERT INTO responses (id, assessment_id, question_id, category, answer, risk_score) "
+            "VALUES (:id, :assessment_id, :question_id, 'general', '\"yes\"', 0.5)"
+        ), response_rows)
+        conn.execute(text(
+            "INSERT INTO mitigations (id, response_id, description, status) "
+            "VALUES (:id, :response_id, 'Mitigation', 'PROPOSED')"
+        ), mitigation_rows)
+
+    return sample
+
+
+def measure(engine, params: dict, repeat: int) -> dict:
+    results = {}
+    with engine.connect() as conn:
+        for name, sql in QUERIES.items():
+            plan = conn.execute(text("EXPLAIN QUERY PLAN " + sql), params).all()
+            started = time.perf_counter()
+            for _ in range(repeat):
+                conn.execute(text(sql), params).all()
+            elapsed = (time.perf_counter() - started) / repeat
+            results[name] = (" | ".join(row[-1] for row in plan), elapsed)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--assessments", type=int, default=20000)
+    parser.add_argument("--responses-per-assessment", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{tmp}/bench.db")
+        Base.metadata.create_all(engine)
+
+        with engine.begin() as conn:
+            for name in INDEXES:
+                conn.execute(text(f"DROP INDEX {name}"))
+
+        print(
+            f"Populating {args.assessments} assessments x "
+            f"{args.responses_per_assessment} responses..."
+        )
+        params = populate(engine, args.assessments, args.responses_per_assessment)
+        before = measure(engine, params, args.repeat)
+
+        indexes = {
+            index.name: index
+            for table in Base.metadata.sorted_tables
+            for index in table.indexes
+        }
+        with engine.begin() as conn:
+            for name in INDEXES:
+                indexes[name].create(conn, checkfirst=True)
+            conn.execute(text("ANALYZE"))
+        after = measure(engine, params, args.repeat)
+
+    for name in QUERIES:
+        plan_before, time_before = before[name]
+        plan_after, time_after = after[name]
+        print(f"\n{name}")
+        print(f"  before: {time_before * 1000:8.3f} ms  {plan_before}")
+        print(f"  after:  {time_after * 1000:8.3f} ms  {plan_after}")
+
+
+if __name__ == "__main__":
+    main()
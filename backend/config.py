@@ -10,12 +10,53 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # Database
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./dpia_assistant.db")
 
+# Async URL used by the API; derived from DATABASE_URL when unset
+# (sqlite -> sqlite+aiosqlite, postgresql -> postgresql+asyncpg)
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+
+# Optional database for read-only endpoints (e.g. a Postgres replica). SQLite
+# files get a query-only read pool on the same file when it is unset, so reads
+# never wait for the single writer connection.
+READ_DATABASE_URL = os.getenv("READ_DATABASE_URL")
+
+# SQLite connection profile, applied as PRAGMAs to every new connection
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", "-65536")),  # negative: KiB
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "foreign_keys": os.getenv("SQLITE_FOREIGN_KEYS", "ON"),
+}
+
+# Connection pool (per engine; pre-ping and recycle apply to server databases)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
 # CORS settings
 CORS_ORIGINS = [
     "http://localhost:3000",
     "http://localhost:3001",
 ]
 
+# Pagination
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# Maximum number of answers accepted by the batch response endpoint
+MAX_BATCH_RESPONSES = 500
+
+# In-process cache of serialized assessments (0 bytes disables it)
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "300"))
+
+# Risk summary streams: seconds to coalesce response writes before pushing
+# one update, and seconds between keep-alive comments on idle streams
+RISK_STREAM_DEBOUNCE = float(os.getenv("RISK_STREAM_DEBOUNCE", "0.25"))
+RISK_STREAM_KEEPALIVE = float(os.getenv("RISK_STREAM_KEEPALIVE", "15"))
+
 # Security
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
@@ -43,7 +84,51 @@ RISK_THRESHOLDS = {
 QUESTIONS_FILE = BASE_DIR / "data" / "questions.json"
 GDPR_ARTICLES_FILE = BASE_DIR / "data" / "gdpr_articles.json"
 
+# Seconds between checks of the data files for changes (hot reload)
+CATALOG_CHECK_INTERVAL = float(os.getenv("CATALOG_CHECK_INTERVAL", "2.0"))
+
+# Browser/CDN cache lifetime of the question and GDPR article payloads; they
+# only change with the data files and are revalidated by content-hash ETag
+STATIC_PAYLOAD_MAX_AGE = int(os.getenv("STATIC_PAYLOAD_MAX_AGE", "86400"))
+
+# Days deletion records are kept for delta sync (manage.py prune-tombstones);
+# clients with an older cursor get 410 and sync again from scratch
+TOMBSTONE_RETENTION_DAYS = int(os.getenv("TOMBSTONE_RETENTION_DAYS", "30"))
+
+# Rows per category in the portfolio-wide category totals. Each assessment
+# writes to one of them, so concurrent writers rarely wait on the same row
+CATEGORY_TOTAL_SHARDS = int(os.getenv("CATEGORY_TOTAL_SHARDS", "16"))
+
+# Seconds the portfolio statistics may be served from cache (0 disables)
+STATS_CACHE_TTL = float(os.getenv("STATS_CACHE_TTL", "10"))
+STATS_CACHE_MAX_BYTES = 4 * 1024 * 1024
+
+# Most results returned by the search endpoint
+MAX_SEARCH_RESULTS = 50
+
 # Export settings
 EXPORT_DIR = BASE_DIR / "exports"
 EXPORT_DIR.mkdir(exist_ok=True)
 
+# Total size of the rendered exports kept in EXPORT_DIR (0 disables the cache)
+EXPORT_CACHE_MAX_BYTES = int(os.getenv("EXPORT_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+
+# Responses fetched per round trip when streaming exports
+EXPORT_STREAM_BATCH = int(os.getenv("EXPORT_STREAM_BATCH", "500"))
+
+# Rows per chunk of the tabular response export (and Parquet row group); the
+# export holds about one chunk in memory
+EXPORT_TABLE_CHUNK = int(os.getenv("EXPORT_TABLE_CHUNK", "10000"))
+
+# PDF rendering process pool: worker processes, jobs that may wait for a
+# free worker, and seconds from submission until a job is abandoned
+PDF_RENDER_WORKERS = int(os.getenv("PDF_RENDER_WORKERS", str(min(4, os.cpu_count() or 1))))
+PDF_RENDER_QUEUE = int(os.getenv("PDF_RENDER_QUEUE", "16"))
+PDF_RENDER_TIMEOUT = float(os.getenv("PDF_RENDER_TIMEOUT", "60"))
+
+
+# Bulk exports: assessments rendered at once per job, most assessments per
+# job, and finished jobs whose status is kept
+BULK_EXPORT_CONCURRENCY = int(os.getenv("BULK_EXPORT_CONCURRENCY", str(PDF_RENDER_WORKERS)))
+BULK_EXPORT_MAX_ASSESSMENTS = int(os.getenv("BULK_EXPORT_MAX_ASSESSMENTS", "1000"))
+BULK_EXPORT_JOBS_KEPT = 100
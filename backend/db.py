@@ -1,39 +1,212 @@
 """
 Database configuration and session management
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from config import DATABASE_URL
-
-# Create engine
-engine = create_engine(
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from config import (
     DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {},
+    ASYNC_DATABASE_URL,
+    READ_DATABASE_URL,
+    SQLITE_PRAGMAS,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
 )
 
+# Async drivers used by the API for each sync backend
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def to_async_url(url: str) -> str:
+    """
+    Map a database URL onto the async driver of its backend
+    """
+    url = make_url(url)
+    drivername = ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername)
+    return url.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+def is_sqlite_file(url: str) -> bool:
+    """
+    Whether a database URL points at an SQLite database file
+    """
+    url = make_url(url)
+    return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+
+
+def engine_options(url: str, is_async: bool = False, read_only: bool = False) -> dict:
+    """
+    Pool and driver options for an engine on the given URL
+    """
+    url = make_url(url)
+    if url.get_backend_name() != "sqlite":
+        return {
+            "pool_size": DB_POOL_SIZE,
+            "max_overflow": DB_MAX_OVERFLOW,
+            "pool_pre_ping": DB_POOL_PRE_PING,
+            "pool_recycle": DB_POOL_RECYCLE,
+        }
+
+    if url.database in (None, "", ":memory:"):
+        # In-memory databases live in a single connection
+        return {} if is_async else {"connect_args": {"check_same_thread": False}}
+
+    options = {"pool_size": DB_POOL_SIZE, "max_overflow": DB_MAX_OVERFLOW}
+    if not read_only:
+        # SQLite has a single writer. Writers queue for one pooled connection
+        # instead of in SQLite's busy handler, which does not wake them in
+        # order and lets some of them time out under load.
+        options.update(pool_size=1, max_overflow=0)
+    if is_async:
+        # aiosqlite defaults to a new connection (and thread) per session
+        options["poolclass"] = AsyncAdaptedQueuePool
+    else:
+        options["connect_args"] = {"check_same_thread": False}
+    return options
+
+
+def apply_connection_profile(engine: Engine, read_only: bool = False) -> None:
+    """
+    Configure every new connection of an engine: the SQLite PRAGMA profile,
+    and read-only transactions for engines that only serve reads
+
+    SQLite transactions on engines that write start with BEGIN IMMEDIATE, so
+    they wait for the write lock up front (busy_timeout). A deferred
+    transaction that upgrades from a read to a write lock fails at once with
+    "database is locked" when another writer committed in between.
+    """
+    dialect = engine.dialect.name
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            if dialect == "sqlite":
+                for name, value in SQLITE_PRAGMAS.items():
+                    cursor.execute(f"PRAGMA {name} = {value}")
+                if read_only:
+                    cursor.execute("PRAGMA query_only = ON")
+            elif read_only and dialect == "postgresql":
+                cursor.execute("SET SESSION CHARACTERISTICS AS TRANSACTION READ ONLY")
+        finally:
+            cursor.close()
+        if dialect == "sqlite" and not read_only:
+            # Let on_begin emit BEGIN instead of the driver
+            dbapi_connection.isolation_level = None
+
+    if dialect == "sqlite" and not read_only:
+        @event.listens_for(engine, "begin")
+        def on_begin(connection):
+            connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def create_api_engine(async_url: str, read_only: bool = False):
+    """
+    Create an async engine with the connection profile applied
+    """
+    api_engine = create_async_engine(
+        async_url,
+        **engine_options(async_url, is_async=True, read_only=read_only),
+    )
+    apply_connection_profile(api_engine.sync_engine, read_only=read_only)
+    return api_engine
+
+
+# Create engine (maintenance commands and migrations)
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
+apply_connection_profile(engine)
+
 # Create session
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+# Create async engine (API requests)
+ASYNC_URL = ASYNC_DATABASE_URL or to_async_url(DATABASE_URL)
+async_engine = create_api_engine(ASYNC_URL)
+
+# Create async session
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+# Read-only engine for GET endpoints: READ_DATABASE_URL, or the same file for
+# SQLite so reads do not queue behind writers for the single write connection
+if READ_DATABASE_URL:
+    read_async_engine = create_api_engine(to_async_url(READ_DATABASE_URL), read_only=True)
+elif is_sqlite_file(ASYNC_URL):
+    read_async_engine = create_api_engine(ASYNC_URL, read_only=True)
+else:
+    read_async_engine = None
+
+AsyncReadSessionLocal = async_sessionmaker(
+    read_async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+) if read_async_engine else AsyncSessionLocal
 
 # Base class for models
 Base = declarative_base()
 
 
-def get_db():
+async def get_db():
     """
-    Dependency function to get database session
+    Dependency function to get an async database session
     """
-    db = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
+
+async def get_read_db():
+    """
+    Dependency function to get an async session for read-only endpoints
+    Uses the read engine when READ_DATABASE_URL is set
+    """
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+
+def upsert_insert(db, model):
+    """
+    Dialect-specific INSERT that supports ON CONFLICT (SQLite and PostgreSQL)
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(model)
+    return sqlite.insert(model)
 
 
 def init_db():
     """
     Initialize database tables
     """
-    from models import Assessment, Response, Mitigation
+    import models  # noqa: F401  (registers the tables on Base.metadata)
     Base.metadata.create_all(bind=engine)
 
+
+async def init_async_db():
+    """
+    Initialize database tables without blocking the event loop
+    """
+    import models  # noqa: F401  (registers the tables on Base.metadata)
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def close_db():
+    """
+    Close pooled API connections (aiosqlite connections hold worker threads)
+    """
+    await async_engine.dispose()
+    if read_async_engine is not None:
+        await read_async_engine.dispose()
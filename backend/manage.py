@@ -0,0 +1,130 @@
+"""
+Maintenance commands for Open DPIA Assistant
+
+Usage:
+    python manage.py migrate [--revision REV]
+    python manage.py check-aggregates [--assessment ID] [--repair]
+    python manage.py rescore [--chunk-size N]
+    python manage.py prune-tombstones [--days N]
+"""
+import argparse
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from config import TOMBSTONE_RETENTION_DAYS
+from db import SessionLocal, init_db
+from utils import check_risk_aggregates, prune_tombstones
+from utils.rescore import rescore_portfolio
+
+
+def migrate(args: argparse.Namespace) -> int:
+    """Apply versioned schema migrations"""
+    from alembic import command
+    from alembic.config import Config
+
+    alembic_config = Config(str(Path(__file__).resolve().parent / "alembic.ini"))
+    alembic_config.set_main_option(
+        "script_location", str(Path(__file__).resolve().parent / "migrations")
+    )
+    command.upgrade(alembic_config, args.revision)
+    return 0
+
+
+def check_aggregates(args: argparse.Namespace) -> int:
+    """Rebuild risk aggregates from the responses and report drift"""
+    db = SessionLocal()
+    try:
+        drift = check_risk_aggregates(db, args.assessment, repair=args.repair)
+    finally:
+        db.close()
+
+    for item in drift:
+        print(
+            f"{item['assessment_id']} [{item['category'] or '-'}] {item['field']}: "
+            f"stored={item['stored']} expected={item['expected']}"
+        )
+
+    assessments = len({item["assessment_id"] for item in drift})
+    if not drift:
+        print("Risk aggregates are consistent")
+    elif args.repair:
+        print(f"Repaired {len(drift)} drifted values across {assessments} assessments")
+    else:
+        print(f"Found {len(drift)} drifted values across {assessments} assessments")
+
+    return 1 if drift and not args.repair else 0
+
+
+def rescore(args: argparse.Namespace) -> int:
+    """Recompute all stored response and assessment risk scores"""
+    db = SessionLocal()
+    try:
+        stats = rescore_portfolio(db, chunk_size=args.chunk_size)
+    finally:
+        db.close()
+
+    print(
+        f"Rescored {stats['responses_scanned']} responses "
+        f"({stats['responses_updated']} changed) and "
+        f"{stats['assessments_updated']} assessments in {stats['elapsed_seconds']}s"
+    )
+    return 0
+
+
+def prune(args: argparse.Namespace) -> int:
+    """Delete deletion records older than the retention period"""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=args.days)
+    db = SessionLocal()
+    try:
+        deleted = prune_tombstones(db, cutoff)
+    finally:
+        db.close()
+
+    print(f"Pruned {deleted} deletion records older than {args.days} days")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Open DPIA Assistant maintenance commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = subparsers.add_parser("migrate", help="Apply schema migrations")
+    migrate_parser.add_argument("--revision", default="head", help="Target revision")
+    migrate_parser.set_defaults(func=migrate)
+
+    check = subparsers.add_parser(
+        "check-aggregates",
+        help="Rebuild risk aggregates from scratch and report drift",
+    )
+    check.add_argument("--assessment", help="Only check a single assessment")
+    check.add_argument("--repair", action="store_true", help="Rewrite drifted aggregates")
+    check.set_defaults(func=check_aggregates)
+
+    rescore_parser = subparsers.add_parser(
+        "rescore",
+        help="Recompute all risk scores after changing weights or thresholds",
+    )
+    rescore_parser.add_argument("--chunk-size", type=int, default=50000, help="Responses per batch")
+    rescore_parser.set_defaults(func=rescore)
+
+    prune_parser = subparsers.add_parser(
+        "prune-tombstones",
+        help="Delete old deletion records; older sync cursors get 410",
+    )
+    prune_parser.add_argument(
+        "--days",
+        type=int,
+        default=TOMBSTONE_RETENTION_DAYS,
+        help="Keep deletion records of the last N days",
+    )
+    prune_parser.set_defaults(func=prune)
+
+    args = parser.parse_args(argv)
+    if args.func is not migrate:
+        init_db()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""Baseline schema and indexes on the hot lookup paths
+
+Databases created by init_db() before this revision have the tables but no
+indexes beyond primary keys. Tables are only created when missing, duplicate
+responses for the same (assessment_id, question_id) are merged so the unique
+index can be built, and each index is only created when it does not exist.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("assessments", "ix_assessments_status_risk_created", ["status", "overall_risk_level", "created_at"], False),
+    ("assessments", "ix_assessments_created_id", ["created_at", "id"], False),
+    ("responses", "ux_responses_assessment_question", ["assessment_id", "question_id"], True),
+    ("mitigations", "ix_mitigations_response_id", ["response_id"], False),
+]
+
+
+def _create_missing_tables(tables: set) -> None:
+    if "assessments" not in tables:
+        op.create_table(
+            "assessments",
+            sa.Column("id", sa.String(36), primary_key=True),
+            sa.Column("title", sa.String(255), nullable=False),
+            sa.Column("description", sa.Text()),
+            sa.Column("organization", sa.String(255), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True)),
+            sa.Column("status", sa.Enum("DRAFT", "IN_PROGRESS", "COMPLETED", name="assessmentstatus")),
+            sa.Column("overall_risk_level", sa.Enum("LOW", "MEDIUM", "HIGH", "CRITICAL", name="risklevel")),
+            sa.Column("overall_risk_score", sa.Float()),
+        )
+
+    if "responses" not in tables:
+        op.create_table(
+            "responses",
+            sa.Column("id", sa.String(36), primary_key=True),
+            sa.Column("assessment_id", sa.String(36), sa.ForeignKey("assessments.id"), nullable=False),
+            sa.Column("question_id", sa.String(50), nullable=False),
+            sa.Column("category", sa.String(100)),
+            sa.Column("answer", sa.JSON(), nullable=False),
+            sa.Column("risk_score", sa.Float()),
+            sa.Column("notes", sa.Text()),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True)),
+        )
+
+    if "mitigations" not in tables:
+        op.create_table(
+            "mitigations",
+            sa.Column("id", sa.String(36), primary_key=True),
+            sa.Column("response_id", sa.String(36), sa.ForeignKey("responses.id"), nullable=False),
+            sa.Column("description", sa.Text(), nullable=False),
+            sa.Column("status", sa.Enum("PROPOSED", "IMPLEMENTED", "REJECTED", name="mitigationstatus")),
+            sa.Column("gdpr_article", sa.String(50)),
+            sa.Column("priority", sa.String(20)),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True)),
+        )
+
+    if "assessment_risk_aggregates" not in tables:
+        op.create_table(
+            "assessment_risk_aggregates",
+            sa.Column("assessment_id", sa.String(36), sa.ForeignKey("assessments.id"), primary_key=True),
+            sa.Column("category", sa.String(100), primary_key=True),
+            sa.Column("score_sum", sa.Float(), nullable=False),
+            sa.Column("response_count", sa.Integer(), nullable=False),
+            sa.Column("high_risk_count", sa.Integer(), nullable=False),
+            sa.Column("special_category_count", sa.Integer(), nullable=False),
+            sa.Column("children_data_count", sa.Integer(), nullable=False),
+        )
+
+
+def _merge_duplicate_responses(bind) -> None:
+    """Keep the most recently written response per question, move mitigations to it"""
+    duplicates = bind.execute(sa.text(
+        "SELECT assessment_id, question_id FROM responses "
+        "GROUP BY assessment_id, question_id HAVING COUNT(*) > 1"
+    )).all()
+
+    for assessment_id, question_id in duplicates:
+        rows = bind.execute(
+            sa.text(
+                "SELECT id FROM responses "
+                "WHERE assessment_id = :assessment_id AND question_id = :question_id "
+                "ORDER BY COALESCE(updated_at, created_at) DESC, id DESC"
+            ),
+            {"assessment_id": assessment_id, "question_id": question_id},
+        ).scalars().all()
+        keep, stale = rows[0], rows[1:]
+
+        for response_id in stale:
+            bind.execute(
+                sa.text("UPDATE mitigations SET response_id = :keep WHERE response_id = :stale"),
+                {"keep": keep, "stale": response_id},
+            )
+            bind.execute(sa.text("DELETE FROM responses WHERE id = :stale"), {"stale": response_id})
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    _create_missing_tables(set(inspector.get_table_names()))
+
+    inspector = sa.inspect(bind)
+    _merge_duplicate_responses(bind)
+
+    for table, name, columns, unique in INDEXES:
+        existing = {index["name"] for index in inspector.get_indexes(table)}
+        if name not in existing:
+            op.create_index(name, table, columns, unique=unique)
+
+
+def downgrade() -> None:
+    for table, name, columns, unique in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
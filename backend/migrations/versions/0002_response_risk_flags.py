@@ -0,0 +1,88 @@
+"""Store risk modifier flags on responses
+
+Adds special_category_data and children_data to responses so aggregates can
+be recomputed in SQL, and backfills them from the stored answers. Then fills
+assessment_risk_aggregates from the responses, so assessments created before
+the aggregates existed keep their risk. The keyword lists and the high-risk
+threshold are frozen copies of utils.risk at the time of this revision.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+SPECIAL_CATEGORY_KEYWORDS = ("special category", "sensitive")
+CHILDREN_KEYWORDS = ("child", "minor")
+HIGH_RISK_SCORE = 0.7
+
+responses = sa.table(
+    "responses",
+    sa.column("id", sa.String),
+    sa.column("answer", sa.JSON),
+    sa.column("special_category_data", sa.Boolean),
+    sa.column("children_data", sa.Boolean),
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    columns = {column["name"] for column in sa.inspect(bind).get_columns("responses")}
+
+    if "special_category_data" not in columns:
+        op.add_column(
+            "responses",
+            sa.Column("special_category_data", sa.Boolean(), nullable=False, server_default=sa.false()),
+        )
+    if "children_data" not in columns:
+        op.add_column(
+            "responses",
+            sa.Column("children_data", sa.Boolean(), nullable=False, server_default=sa.false()),
+        )
+
+    updates = []
+    for response_id, answer in bind.execute(sa.select(responses.c.id, responses.c.answer)):
+        text = str(answer).lower()
+        special = any(keyword in text for keyword in SPECIAL_CATEGORY_KEYWORDS)
+        children = any(keyword in text for keyword in CHILDREN_KEYWORDS)
+        if special or children:
+            updates.append({"response_id": response_id, "special": special, "children": children})
+
+    if updates:
+        bind.execute(
+            responses.update()
+            .where(responses.c.id == sa.bindparam("response_id"))
+            .values(
+                special_category_data=sa.bindparam("special"),
+                children_data=sa.bindparam("children"),
+            ),
+            updates,
+        )
+
+    # The table may have been created empty by create_all; fill it either way
+    bind.execute(sa.text("DELETE FROM assessment_risk_aggregates"))
+    bind.execute(
+        sa.text(
+            "INSERT INTO assessment_risk_aggregates (assessment_id, category, score_sum, "
+            "response_count, high_risk_count, special_category_count, children_data_count) "
+            "SELECT assessment_id, COALESCE(category, ''), COALESCE(SUM(risk_score), 0), COUNT(*), "
+            "SUM(CASE WHEN risk_score > :high_risk THEN 1 ELSE 0 END), "
+            "SUM(CASE WHEN special_category_data THEN 1 ELSE 0 END), "
+            "SUM(CASE WHEN children_data THEN 1 ELSE 0 END) "
+            "FROM responses GROUP BY assessment_id, COALESCE(category, '')"
+        ),
+        {"high_risk": HIGH_RISK_SCORE},
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("responses") as batch_op:
+        batch_op.drop_column("children_data")
+        batch_op.drop_column("special_category_data")
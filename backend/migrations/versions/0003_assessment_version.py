@@ -0,0 +1,32 @@
+"""Version counter on assessments
+
+Adds assessments.version, incremented on every change to an assessment or
+its responses and mitigations. Cached payloads are keyed by it.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("assessments")}
+
+    if "version" not in columns:
+        op.add_column(
+            "assessments",
+            sa.Column("version", sa.Integer(), nullable=False, server_default="1"),
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("assessments") as batch_op:
+        batch_op.drop_column("version")
@@ -0,0 +1,67 @@
+"""Change tracking for delta sync
+
+Adds a revision column to responses and mitigations, holding the assessment
+version of their last change, and a change_tombstones table recording
+deletions. Existing rows are stamped with their assessment's current version
+so a sync from cursor 0 returns them.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    for table in ("responses", "mitigations"):
+        columns = {column["name"] for column in inspector.get_columns(table)}
+        if "revision" not in columns:
+            op.add_column(table, sa.Column("revision", sa.Integer(), nullable=False, server_default="0"))
+
+    bind.execute(sa.text(
+        "UPDATE responses SET revision = "
+        "(SELECT version FROM assessments WHERE assessments.id = responses.assessment_id)"
+    ))
+    bind.execute(sa.text(
+        "UPDATE mitigations SET revision = "
+        "(SELECT responses.revision FROM responses WHERE responses.id = mitigations.response_id)"
+    ))
+
+    if "ix_responses_assessment_revision" not in {index["name"] for index in inspector.get_indexes("responses")}:
+        op.create_index("ix_responses_assessment_revision", "responses", ["assessment_id", "revision"])
+
+    if "change_tombstones" not in inspector.get_table_names():
+        op.create_table(
+            "change_tombstones",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column("assessment_id", sa.String(36), sa.ForeignKey("assessments.id"), nullable=False),
+            sa.Column("entity_type", sa.String(20), nullable=False),
+            sa.Column("entity_id", sa.String(36), nullable=False),
+            sa.Column("revision", sa.Integer(), nullable=False),
+            sa.Column("deleted_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+        op.create_index(
+            "ix_change_tombstones_assessment_revision",
+            "change_tombstones",
+            ["assessment_id", "revision"],
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_change_tombstones_assessment_revision", table_name="change_tombstones")
+    op.drop_table("change_tombstones")
+    op.drop_index("ix_responses_assessment_revision", table_name="responses")
+    with op.batch_alter_table("mitigations") as batch_op:
+        batch_op.drop_column("revision")
+    with op.batch_alter_table("responses") as batch_op:
+        batch_op.drop_column("revision")
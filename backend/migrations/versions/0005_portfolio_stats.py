@@ -0,0 +1,64 @@
+"""Portfolio statistics
+
+Adds the category_risk_totals table, the risk aggregates summed over all
+assessments per category, filled from the existing aggregates, and a
+covering index for the per-organization statistics.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+FIELDS = (
+    "score_sum",
+    "response_count",
+    "high_risk_count",
+    "special_category_count",
+    "children_data_count",
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if "category_risk_totals" not in inspector.get_table_names():
+        op.create_table(
+            "category_risk_totals",
+            sa.Column("category", sa.String(100), primary_key=True),
+            sa.Column("score_sum", sa.Float(), nullable=False, server_default="0"),
+            sa.Column("response_count", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("high_risk_count", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("special_category_count", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("children_data_count", sa.Integer(), nullable=False, server_default="0"),
+        )
+
+    # The table may have been created empty by create_all, with the shard
+    # column of revision 0007; fill it either way
+    sharded = "shard" in {column["name"] for column in inspector.get_columns("category_risk_totals")}
+    bind.execute(sa.text("DELETE FROM category_risk_totals"))
+    bind.execute(sa.text(
+        f"INSERT INTO category_risk_totals (category, {'shard, ' if sharded else ''}{', '.join(FIELDS)}) "
+        f"SELECT category, {'0, ' if sharded else ''}{', '.join(f'SUM({field})' for field in FIELDS)} "
+        "FROM assessment_risk_aggregates GROUP BY category"
+    ))
+
+    if "ix_assessments_organization_score" not in {index["name"] for index in inspector.get_indexes("assessments")}:
+        op.create_index(
+            "ix_assessments_organization_score",
+            "assessments",
+            ["organization", "overall_risk_score"],
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_assessments_organization_score", table_name="assessments")
+    op.drop_table("category_risk_totals")
@@ -0,0 +1,32 @@
+"""Retention of deletion records
+
+Adds assessments.pruned_revision, the highest revision of the change
+tombstones pruned so far. Delta sync cursors below it get 410.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("assessments")}
+
+    if "pruned_revision" not in columns:
+        op.add_column(
+            "assessments",
+            sa.Column("pruned_revision", sa.Integer(), nullable=False, server_default="0"),
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("assessments") as batch_op:
+        batch_op.drop_column("pruned_revision")
@@ -0,0 +1,64 @@
+"""Sharded category totals
+
+Adds a shard to the key of category_risk_totals, so response writes to
+different assessments update different rows instead of waiting on one row
+lock per category. The table is rebuilt from the aggregates into shard 0.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+FIELDS = (
+    "score_sum",
+    "response_count",
+    "high_risk_count",
+    "special_category_count",
+    "children_data_count",
+)
+
+
+def _create_totals(sharded: bool) -> None:
+    op.create_table(
+        "category_risk_totals",
+        sa.Column("category", sa.String(100), primary_key=True),
+        *([sa.Column("shard", sa.Integer(), primary_key=True)] if sharded else []),
+        sa.Column("score_sum", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("response_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("high_risk_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("special_category_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("children_data_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def _fill_totals(sharded: bool) -> None:
+    columns = ", ".join(("category", *(["shard"] if sharded else []), *FIELDS))
+    values = ", ".join(("category", *(["0"] if sharded else []), *(f"SUM({field})" for field in FIELDS)))
+    op.get_bind().execute(sa.text(
+        f"INSERT INTO category_risk_totals ({columns}) "
+        f"SELECT {values} FROM assessment_risk_aggregates GROUP BY category"
+    ))
+
+
+def upgrade() -> None:
+    columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("category_risk_totals")}
+
+    # The totals are derived data; rebuild rather than alter the primary key
+    if "shard" not in columns:
+        op.drop_table("category_risk_totals")
+        _create_totals(sharded=True)
+        _fill_totals(sharded=True)
+
+
+def downgrade() -> None:
+    op.drop_table("category_risk_totals")
+    _create_totals(sharded=False)
+    _fill_totals(sharded=False)
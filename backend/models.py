@@ -1,13 +1,23 @@
 """
 Database models for Open DPIA Assistant
 """
-from sqlalchemy import Column, String, Text, DateTime, Float, ForeignKey, Enum, JSON
-from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy import Column, String, Text, DateTime, Float, Integer, Boolean, ForeignKey, Enum, JSON, Index
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.orm import relationship, selectinload
+from sqlalchemy.sql import func, false
 from db import Base
 import uuid
 import enum
 
+# SQLite's CURRENT_TIMESTAMP has no fractional seconds; bind Python datetimes
+# in the same format so comparisons against stored timestamps line up
+Timestamp = DateTime(timezone=True).with_variant(
+    sqlite.DATETIME(
+        storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"
+    ),
+    "sqlite",
+)
+
 
 class AssessmentStatus(str, enum.Enum):
     """Assessment status enum"""
@@ -34,19 +44,30 @@ class MitigationStatus(str, enum.Enum):
 class Assessment(Base):
     """Assessment model"""
     __tablename__ = "assessments"
+    __table_args__ = (
+        Index("ix_assessments_status_risk_created", "status", "overall_risk_level", "created_at"),
+        Index("ix_assessments_created_id", "created_at", "id"),
+        Index("ix_assessments_organization_score", "organization", "overall_risk_score"),
+    )
 
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     title = Column(String(255), nullable=False)
     description = Column(Text)
     organization = Column(String(255), nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    created_at = Column(Timestamp, server_default=func.now())
+    updated_at = Column(Timestamp, onupdate=func.now())
     status = Column(Enum(AssessmentStatus), default=AssessmentStatus.DRAFT)
     overall_risk_level = Column(Enum(RiskLevel), nullable=True)
     overall_risk_score = Column(Float, default=0.0)
+    # Incremented on every change to the assessment, its responses or mitigations
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    # Highest revision of pruned deletion records; older sync cursors are stale
+    pruned_revision = Column(Integer, nullable=False, default=0, server_default="0")
 
     # Relationships
     responses = relationship("Response", back_populates="assessment", cascade="all, delete-orphan")
+    risk_aggregates = relationship("AssessmentRiskAggregate", cascade="all, delete-orphan")
+    tombstones = relationship("ChangeTombstone", cascade="all, delete-orphan")
 
     def __repr__(self):
         return f"<Assessment {self.title}>"
@@ -55,6 +76,10 @@ class Assessment(Base):
 class Response(Base):
     """Response model for storing answers to questions"""
     __tablename__ = "responses"
+    __table_args__ = (
+        Index("ux_responses_assessment_question", "assessment_id", "question_id", unique=True),
+        Index("ix_responses_assessment_revision", "assessment_id", "revision"),
+    )
 
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     assessment_id = Column(String(36), ForeignKey("assessments.id"), nullable=False)
@@ -62,9 +87,14 @@ class Response(Base):
     category = Column(String(100))
     answer = Column(JSON, nullable=False)  # Stores the actual answer data
     risk_score = Column(Float, default=0.0)
+    # Risk modifier keywords found in the answer (see utils.risk.detect_risk_modifiers)
+    special_category_data = Column(Boolean, nullable=False, default=False, server_default=false())
+    children_data = Column(Boolean, nullable=False, default=False, server_default=false())
     notes = Column(Text)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Assessment version of the last change (delta sync cursor)
+    revision = Column(Integer, nullable=False, default=0, server_default="0")
+    created_at = Column(Timestamp, server_default=func.now())
+    updated_at = Column(Timestamp, onupdate=func.now())
 
     # Relationships
     assessment = relationship("Assessment", back_populates="responses")
@@ -77,6 +107,9 @@ class Response(Base):
 class Mitigation(Base):
     """Mitigation measures for responses"""
     __tablename__ = "mitigations"
+    __table_args__ = (
+        Index("ix_mitigations_response_id", "response_id"),
+    )
 
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     response_id = Column(String(36), ForeignKey("responses.id"), nullable=False)
@@ -84,8 +117,10 @@ class Mitigation(Base):
     status = Column(Enum(MitigationStatus), default=MitigationStatus.PROPOSED)
     gdpr_article = Column(String(50))
     priority = Column(String(20))  # low, medium, high
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Assessment version of the last change (delta sync cursor)
+    revision = Column(Integer, nullable=False, default=0, server_default="0")
+    created_at = Column(Timestamp, server_default=func.now())
+    updated_at = Column(Timestamp, onupdate=func.now())
 
     # Relationships
     response = relationship("Response", back_populates="mitigations")
@@ -93,3 +128,60 @@ class Mitigation(Base):
     def __repr__(self):
         return f"<Mitigation {self.id}>"
 
+
+class AssessmentRiskAggregate(Base):
+    """Running risk totals per assessment category"""
+    __tablename__ = "assessment_risk_aggregates"
+
+    assessment_id = Column(String(36), ForeignKey("assessments.id"), primary_key=True)
+    category = Column(String(100), primary_key=True)  # "" for uncategorised responses
+    score_sum = Column(Float, nullable=False, default=0.0)
+    response_count = Column(Integer, nullable=False, default=0)
+    high_risk_count = Column(Integer, nullable=False, default=0)
+    special_category_count = Column(Integer, nullable=False, default=0)
+    children_data_count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<AssessmentRiskAggregate {self.assessment_id}:{self.category}>"
+
+
+class CategoryRiskTotal(Base):
+    """Risk aggregates summed over the assessments of a shard, per category"""
+    __tablename__ = "category_risk_totals"
+
+    category = Column(String(100), primary_key=True)  # "" for uncategorised responses
+    shard = Column(Integer, primary_key=True)  # see utils.aggregates.category_total_shard
+    score_sum = Column(Float, nullable=False, default=0.0)
+    response_count = Column(Integer, nullable=False, default=0)
+    high_risk_count = Column(Integer, nullable=False, default=0)
+    special_category_count = Column(Integer, nullable=False, default=0)
+    children_data_count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<CategoryRiskTotal {self.category}:{self.shard}>"
+
+
+class ChangeTombstone(Base):
+    """Record of a deleted response or mitigation, for delta sync"""
+    __tablename__ = "change_tombstones"
+    __table_args__ = (
+        Index("ix_change_tombstones_assessment_revision", "assessment_id", "revision"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    assessment_id = Column(String(36), ForeignKey("assessments.id"), nullable=False)
+    entity_type = Column(String(20), nullable=False)  # response, mitigation
+    entity_id = Column(String(36), nullable=False)
+    revision = Column(Integer, nullable=False)  # Assessment version of the deletion
+    deleted_at = Column(Timestamp, server_default=func.now())
+
+    def __repr__(self):
+        return f"<ChangeTombstone {self.entity_type} {self.entity_id}>"
+
+
+# Eager loading for a fully serialized assessment, in a fixed number of
+# queries: the assessment, then its responses joined with their mitigations.
+# (A nested selectinload would query mitigations in batches of 500 responses.)
+ASSESSMENT_DETAIL_LOADERS = (
+    selectinload(Assessment.responses).joinedload(Response.mitigations),
+)
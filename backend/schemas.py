@@ -2,7 +2,7 @@
 Pydantic schemas for request/response validation
 """
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime
 from enum import Enum
 
@@ -87,6 +87,46 @@ class ResponseResponse(ResponseBase):
         from_attributes = True
 
 
+# Delta sync schemas
+class ResponseChange(ResponseBase):
+    id: str
+    assessment_id: str
+    risk_score: float
+    revision: int
+    created_at: datetime
+    updated_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
+
+
+class MitigationChange(MitigationResponse):
+    revision: int
+
+
+class DeletedRecord(BaseModel):
+    type: str  # response, mitigation
+    id: str
+    revision: int
+
+
+class AssessmentChanges(BaseModel):
+    cursor: int
+    responses: List[ResponseChange] = []
+    mitigations: List[MitigationChange] = []
+    deleted: List[DeletedRecord] = []
+
+
+class ResponseBatchItem(BaseModel):
+    question_id: str
+    answer: Dict[str, Any]
+    notes: Optional[str] = None
+
+
+class ResponseBatchCreate(BaseModel):
+    responses: List[ResponseBatchItem] = Field(..., min_length=1)
+
+
 # Assessment schemas
 class AssessmentBase(BaseModel):
     title: str = Field(..., min_length=1, max_length=255)
@@ -140,6 +180,11 @@ class RiskSummary(BaseModel):
     recommendations: List[str]
 
 
+class ResponseBatchResult(BaseModel):
+    responses: List[ResponseResponse]
+    risk_summary: RiskSummary
+
+
 # Question schemas
 class QuestionOption(BaseModel):
     value: str
@@ -178,3 +223,87 @@ class GDPRArticle(BaseModel):
     full_text: Optional[str] = None
     relevance: Optional[str] = None
 
+
+# Search schemas
+class SearchResult(BaseModel):
+    type: str  # question, gdpr_article
+    id: str
+    title: str
+    category: Optional[str] = None
+    score: float
+    snippet: str
+    highlights: List[Tuple[int, int]] = []  # [start, end) offsets in the snippet
+
+
+class SearchResponse(BaseModel):
+    query: str
+    total: int
+    results: List[SearchResult]
+
+
+# Bulk export schemas
+class ExportFormat(str, Enum):
+    """Bulk export file format"""
+    PDF = "pdf"
+    JSON = "json"
+
+
+class TableFormat(str, Enum):
+    """Tabular response export file format"""
+    CSV = "csv"
+    ARROW = "arrow"
+    PARQUET = "parquet"
+
+
+class BulkExportRequest(BaseModel):
+    """Filter selecting the assessments to export; all given criteria must match"""
+    status: Optional[List[AssessmentStatus]] = None
+    risk_level: Optional[List[RiskLevel]] = None
+    organization: Optional[str] = None
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+    formats: List[ExportFormat] = Field(
+        default=[ExportFormat.PDF, ExportFormat.JSON], min_length=1
+    )
+
+
+class BulkExportError(BaseModel):
+    assessment_id: str
+    error: str
+
+
+class BulkExportStatus(BaseModel):
+    id: str
+    status: str  # running, completed, failed, cancelled
+    total: int
+    completed: int
+    failed: int
+    bytes_sent: int
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    errors: List[BulkExportError] = []
+
+
+# Portfolio statistics schemas
+class OrganizationStats(BaseModel):
+    organization: str
+    assessment_count: int
+    average_risk_score: float
+
+
+class CategoryRiskStats(BaseModel):
+    category: str
+    response_count: int
+    high_risk_count: int
+    high_risk_share: float
+    average_risk_score: float
+
+
+class PortfolioStats(BaseModel):
+    total_assessments: int
+    by_status: Dict[str, int]
+    by_risk_level: Dict[str, int]  # includes "unassessed"
+    by_status_and_risk_level: Dict[str, Dict[str, int]]
+    organization_count: int
+    organizations: List[OrganizationStats]
+    high_risk_categories: List[CategoryRiskStats]
@@ -0,0 +1,46 @@
+"""
+Shared fixtures for the backend tests
+
+The tests run against a throwaway SQLite database, configured before the
+application modules are imported.
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import httpx
+import pytest
+import pytest_asyncio
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+DATABASE_DIR = tempfile.mkdtemp(prefix="dpia-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{DATABASE_DIR}/test.db"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ.pop("READ_DATABASE_URL", None)
+# Every export is rendered, so statement counts are not skewed by cache hits
+os.environ["EXPORT_CACHE_MAX_BYTES"] = "0"
+
+
+@pytest.fixture(scope="session")
+def engine():
+    """Sync engine on the test database, with the tables created"""
+    from db import engine, init_db
+
+    init_db()
+    yield engine
+    engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def client(engine):
+    """HTTP client calling the API in process"""
+    from app import app
+    from db import close_db
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+        yield http
+    # Pooled aiosqlite connections belong to this test's event loop
+    await close_db()
@@ -0,0 +1,83 @@
+"""
+Serializing an assessment issues a fixed, small number of SQL statements,
+however many responses it has
+"""
+import uuid
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event, text
+
+# Endpoint -> maximum number of statements
+ENDPOINTS = {
+    "/api/assessments/{id}": 3,
+    "/api/assessments/{id}/responses": 3,
+    "/api/assessments/{id}/risk-summary": 3,
+    "/api/assessments/{id}/export/json": 3,
+    "/api/assessments/{id}/export/html": 3,
+    "/api/assessments/{id}/export/pdf": 3,
+}
+
+
+def populate(engine, size: int) -> str:
+    """Insert an assessment with size responses, every other one mitigated"""
+    assessment_id = str(uuid.uuid4())
+    responses = [
+        {"id": str(uuid.uuid4()), "assessment_id": assessment_id, "question_id": f"q-{i:04d}"}
+        for i in range(size)
+    ]
+
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO assessments (id, title, organization, status, overall_risk_score) "
+            "VALUES (:id, 'Assessment', 'Org', 'IN_PROGRESS', 0.5)"
+        ), {"id": assessment_id})
+        conn.execute(text(
+            "INSERT INTO responses (id, assessment_id, question_id, category, answer, risk_score, "
+            "special_category_data, children_data) "
+            "VALUES (:id, :assessment_id, :question_id, 'general', '{\"v\": \"yes\"}', 0.5, 0, 0)"
+        ), responses)
+        conn.execute(text(
+            "INSERT INTO mitigations (id, response_id, description, status) "
+            "VALUES (:id, :response_id, 'Mitigation', 'PROPOSED')"
+        ), [
+            {"id": str(uuid.uuid4()), "response_id": response["id"]}
+            for response in responses[::2]
+        ])
+
+    return assessment_id
+
+
+@contextmanager
+def count_statements():
+    """Collect the statements executed by the API engines"""
+    from db import async_engine, read_async_engine
+
+    engines = {async_engine.sync_engine, (read_async_engine or async_engine).sync_engine}
+    statements = []
+
+    def listener(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", listener)
+    try:
+        yield statements
+    finally:
+        for engine in engines:
+            event.remove(engine, "before_cursor_execute", listener)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("endpoint, limit", ENDPOINTS.items())
+async def test_statement_count_does_not_grow_with_responses(engine, client, endpoint, limit):
+    counts = {}
+    for size in (10, 600):
+        assessment_id = populate(engine, size)
+        with count_statements() as statements:
+            response = await client.get(endpoint.format(id=assessment_id))
+        assert response.status_code == 200
+        counts[size] = len(statements)
+
+    assert 0 < counts[10] == counts[600], counts
+    assert counts[600] <= limit, counts
@@ -0,0 +1,32 @@
+"""
+The tabular export flattens multi-select answers written through the API
+"""
+import csv
+import io
+
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_multi_select_answer_sets_option_columns(engine, client):
+    created = await client.post("/api/assessments", json={"title": "Export", "organization": "Org"})
+    assessment_id = created.json()["id"]
+    response = await client.post(f"/api/assessments/{assessment_id}/responses", json={
+        "assessment_id": assessment_id,
+        "question_id": "data-collection-q1",
+        "category": "data-collection",
+        "answer": {"value": ["children", "low"]},
+    })
+    assert response.status_code == 201
+
+    exported = await client.get("/api/exports/responses.csv")
+    assert exported.status_code == 200
+
+    rows = [
+        row for row in csv.DictReader(io.StringIO(exported.text))
+        if row["assessment_id"] == assessment_id
+    ]
+    assert len(rows) == 1
+    assert rows[0]["data-collection-q1.children"] == "true"
+    assert rows[0]["data-collection-q1.low"] == "true"
+    assert rows[0]["data-collection-q1.sensitive"] == "false"
@@ -4,21 +4,135 @@ Utility functions for Open DPIA Assistant
 from .risk import (
     calculate_risk_score,
     calculate_response_risk_score,
+    score_responses,
+    get_scoring_plan,
     determine_risk_level,
     calculate_assessment_risk,
+    detect_risk_modifiers,
+)
+from .export import (
+    export_to_pdf,
+    export_to_json,
+    render_pdf,
+    render_report,
+    render_html_report,
+    JSONExportEncoder,
+    HTMLReportRenderer,
+)
+from .helpers import (
+    load_questions,
+    load_gdpr_articles,
+    get_question_by_id,
+    encode_cursor,
+    decode_cursor,
+    format_etag,
+    etag_matches,
+    etag_versions,
+    http_date,
+)
+from .catalog import QuestionCatalog, GDPRArticleCatalog, question_catalog, gdpr_catalog
+from .aggregates import (
+    apply_response_delta,
+    refresh_category_aggregates,
+    read_risk_summary,
+    refresh_assessment_risk,
+    check_risk_aggregates,
+    adjust_category_totals,
+    rebuild_category_totals,
+)
+from .stats import read_portfolio_stats
+from .responses import (
+    touch_assessment,
+    mark_assessment_in_progress,
+    upsert_responses,
+    load_mitigations,
+)
+from .changes import record_tombstones, read_changes, prune_tombstones
+from .pubsub import UpdateHub
+from .payloads import EncodedPayload, negotiate_encoding
+from .search import SearchIndex, get_search_index, tokenize
+from .export_cache import ExportCache, export_cache, export_cache_key, REPORT_TEMPLATE_VERSION
+from .rendering import RenderService, RenderQueueFull, RenderTimeout, report_renderer
+from .bulk_export import BulkExportJob, BulkExportJobs, stream_bulk_export
+from .tabular import ResponseTable, get_response_table, table_encoder, TABLE_MEDIA_TYPES
+from .cache import (
+    CacheBackend,
+    MemoryCache,
+    NullCache,
+    get_cache_backend,
+    set_cache_backend,
+    invalidate_assessment,
 )
-from .export import export_to_pdf, export_to_json
-from .helpers import load_questions, load_gdpr_articles, get_question_by_id
 
 __all__ = [
     "calculate_risk_score",
     "calculate_response_risk_score",
+    "score_responses",
+    "get_scoring_plan",
     "determine_risk_level",
     "calculate_assessment_risk",
+    "detect_risk_modifiers",
     "export_to_pdf",
     "export_to_json",
+    "render_pdf",
+    "render_report",
+    "JSONExportEncoder",
+    "render_html_report",
+    "HTMLReportRenderer",
     "load_questions",
     "load_gdpr_articles",
     "get_question_by_id",
+    "encode_cursor",
+    "decode_cursor",
+    "format_etag",
+    "etag_matches",
+    "etag_versions",
+    "http_date",
+    "QuestionCatalog",
+    "question_catalog",
+    "GDPRArticleCatalog",
+    "gdpr_catalog",
+    "apply_response_delta",
+    "refresh_category_aggregates",
+    "read_risk_summary",
+    "refresh_assessment_risk",
+    "check_risk_aggregates",
+    "adjust_category_totals",
+    "rebuild_category_totals",
+    "read_portfolio_stats",
+    "touch_assessment",
+    "mark_assessment_in_progress",
+    "upsert_responses",
+    "load_mitigations",
+    "record_tombstones",
+    "read_changes",
+    "prune_tombstones",
+    "CacheBackend",
+    "MemoryCache",
+    "NullCache",
+    "get_cache_backend",
+    "set_cache_backend",
+    "invalidate_assessment",
+    "UpdateHub",
+    "EncodedPayload",
+    "negotiate_encoding",
+    "SearchIndex",
+    "get_search_index",
+    "tokenize",
+    "ExportCache",
+    "export_cache",
+    "export_cache_key",
+    "REPORT_TEMPLATE_VERSION",
+    "RenderService",
+    "RenderQueueFull",
+    "RenderTimeout",
+    "report_renderer",
+    "BulkExportJob",
+    "BulkExportJobs",
+    "stream_bulk_export",
+    "ResponseTable",
+    "get_response_table",
+    "table_encoder",
+    "TABLE_MEDIA_TYPES",
 ]
 
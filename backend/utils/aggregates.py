@@ -0,0 +1,336 @@
+"""
+Incrementally maintained risk aggregates for assessments
+
+Every change to the per-assessment aggregates is also applied to the
+per-category totals over all assessments (CategoryRiskTotal), which the
+portfolio statistics read instead of scanning every assessment's rows.
+The totals are split into shards by assessment, so writers to different
+assessments rarely update the same rows; readers sum the shards.
+"""
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import case, delete, func, insert, literal, select, update
+from sqlalchemy.orm import Session
+from config import CATEGORY_TOTAL_SHARDS
+from db import upsert_insert
+from models import Assessment, AssessmentRiskAggregate, CategoryRiskTotal, Response, RiskLevel
+from .risk import HIGH_RISK_SCORE, build_risk_summary, detect_risk_modifiers
+
+AGGREGATE_FIELDS = (
+    "score_sum",
+    "response_count",
+    "high_risk_count",
+    "special_category_count",
+    "children_data_count",
+)
+
+
+def category_total_shard(assessment_id: str) -> int:
+    """Shard of the category totals that an assessment's changes are applied to"""
+    return zlib.crc32(assessment_id.encode()) % CATEGORY_TOTAL_SHARDS
+
+
+def response_contribution(risk_score: Optional[float], answer: Any) -> Dict[str, float]:
+    """Aggregate values contributed by a single response"""
+    risk_score = risk_score or 0.0
+    special, children = detect_risk_modifiers(answer)
+    return {
+        "score_sum": risk_score,
+        "response_count": 1,
+        "high_risk_count": int(risk_score > HIGH_RISK_SCORE),
+        "special_category_count": int(special),
+        "children_data_count": int(children),
+    }
+
+
+def apply_response_delta(
+    db: Session,
+    assessment_id: str,
+    category: Optional[str],
+    risk_score: Optional[float],
+    answer: Any,
+    sign: int = 1
+) -> None:
+    """
+    Add (sign=1) or remove (sign=-1) a response's contribution
+    The change is made in the caller's transaction
+    """
+    contribution = response_contribution(risk_score, answer)
+    category = category or ""
+
+    result = db.execute(
+        update(AssessmentRiskAggregate)
+        .where(
+            AssessmentRiskAggregate.assessment_id == assessment_id,
+            AssessmentRiskAggregate.category == category,
+        )
+        .values({
+            field: getattr(AssessmentRiskAggregate, field) + sign * value
+            for field, value in contribution.items()
+        })
+        .execution_options(synchronize_session=False)
+    )
+
+    if result.rowcount == 0 and sign > 0:
+        db.execute(
+            insert(AssessmentRiskAggregate).values(
+                assessment_id=assessment_id,
+                category=category,
+                **contribution,
+            )
+        )
+
+    stmt = upsert_insert(db, CategoryRiskTotal).values(
+        category=category,
+        shard=category_total_shard(assessment_id),
+        **{field: sign * value for field, value in contribution.items()},
+    )
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=["category", "shard"],
+        set_={field: getattr(CategoryRiskTotal, field) + stmt.excluded[field] for field in AGGREGATE_FIELDS},
+    ))
+
+
+def adjust_category_totals(
+    db: Session,
+    assessment_id: str,
+    sign: int,
+    categories: Optional[Iterable[Optional[str]]] = None
+) -> None:
+    """
+    Add (sign=1) or remove (sign=-1) an assessment's stored aggregates, of
+    some categories or all of them, to the per-category totals
+    Remove them before the aggregates are rewritten or deleted, and add them
+    back afterwards
+    """
+    query = (
+        select(
+            AssessmentRiskAggregate.category,
+            literal(category_total_shard(assessment_id)),
+            *(getattr(AssessmentRiskAggregate, field) * literal(sign) for field in AGGREGATE_FIELDS),
+        )
+        .where(AssessmentRiskAggregate.assessment_id == assessment_id)
+        # A consistent row order keeps concurrent writers from deadlocking
+        .order_by(AssessmentRiskAggregate.category)
+    )
+    if categories is not None:
+        query = query.where(
+            AssessmentRiskAggregate.category.in_(sorted({category or "" for category in categories}))
+        )
+
+    stmt = upsert_insert(db, CategoryRiskTotal).from_select(["category", "shard", *AGGREGATE_FIELDS], query)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=["category", "shard"],
+        set_={field: getattr(CategoryRiskTotal, field) + stmt.excluded[field] for field in AGGREGATE_FIELDS},
+    ))
+
+
+def rebuild_category_totals(db: Session) -> None:
+    """
+    Recompute the per-category totals from all stored aggregates, into
+    shard 0; later changes spread over the shards again
+    """
+    db.execute(delete(CategoryRiskTotal))
+    db.execute(
+        insert(CategoryRiskTotal).from_select(
+            ["category", "shard", *AGGREGATE_FIELDS],
+            select(
+                AssessmentRiskAggregate.category,
+                literal(0),
+                *(func.sum(getattr(AssessmentRiskAggregate, field)) for field in AGGREGATE_FIELDS),
+            ).group_by(AssessmentRiskAggregate.category),
+        )
+    )
+
+
+def refresh_category_aggregates(
+    db: Session,
+    assessment_id: str,
+    categories: Iterable[Optional[str]]
+) -> None:
+    """
+    Recompute the aggregates of some categories from the stored responses
+    with a single INSERT ... SELECT statement, dropping the aggregates of
+    categories left without responses. Used after upserts, where the
+    previous values of the rows are unknown.
+    """
+    categories = sorted({category or "" for category in categories})
+    category = func.coalesce(Response.category, "")
+
+    adjust_category_totals(db, assessment_id, -1, categories)
+    db.execute(
+        delete(AssessmentRiskAggregate).where(
+            AssessmentRiskAggregate.assessment_id == assessment_id,
+            AssessmentRiskAggregate.category.in_(categories),
+        )
+    )
+
+    totals = (
+        select(
+            Response.assessment_id,
+            category,
+            func.coalesce(func.sum(Response.risk_score), 0.0),
+            func.count(),
+            func.sum(case((Response.risk_score > HIGH_RISK_SCORE, 1), else_=0)),
+            func.sum(case((Response.special_category_data, 1), else_=0)),
+            func.sum(case((Response.children_data, 1), else_=0)),
+        )
+        .where(Response.assessment_id == assessment_id, category.in_(categories))
+        .group_by(Response.assessment_id, category)
+    )
+
+    db.execute(
+        insert(AssessmentRiskAggregate).from_select(
+            ["assessment_id", "category", *AGGREGATE_FIELDS],
+            totals,
+        )
+    )
+
+    adjust_category_totals(db, assessment_id, 1, categories)
+
+
+def summarize_aggregates(rows: Iterable[AssessmentRiskAggregate]) -> Dict[str, Any]:
+    """Build the risk analysis from stored aggregate rows"""
+    total_score = 0.0
+    response_count = 0
+    category_totals: Dict[str, Tuple[float, int]] = {}
+    special_category_data = False
+    children_data = False
+
+    for row in rows:
+        if row.response_count <= 0:
+            continue
+        total_score += row.score_sum
+        response_count += row.response_count
+        if row.category:
+            category_totals[row.category] = (row.score_sum, row.response_count)
+        special_category_data = special_category_data or row.special_category_count > 0
+        children_data = children_data or row.children_data_count > 0
+
+    return build_risk_summary(
+        total_score,
+        response_count,
+        category_totals,
+        special_category_data,
+        children_data,
+    )
+
+
+def read_risk_summary(db: Session, assessment_id: str) -> Dict[str, Any]:
+    """Get the risk analysis for an assessment from its aggregates"""
+    rows = db.query(AssessmentRiskAggregate).filter(
+        AssessmentRiskAggregate.assessment_id == assessment_id
+    ).all()
+    return summarize_aggregates(rows)
+
+
+def refresh_assessment_risk(db: Session, assessment_id: str) -> Dict[str, Any]:
+    """
+    Update the assessment's overall risk from its aggregates
+    Call after applying deltas, before committing
+    """
+    risk_analysis = read_risk_summary(db, assessment_id)
+    db.execute(
+        update(Assessment)
+        .where(Assessment.id == assessment_id)
+        .values(
+            overall_risk_score=risk_analysis["overall_risk_score"],
+            overall_risk_level=RiskLevel(risk_analysis["overall_risk_level"]),
+        )
+        .execution_options(synchronize_session="fetch")
+    )
+    return risk_analysis
+
+
+def compute_risk_aggregates(
+    db: Session,
+    assessment_id: Optional[str] = None,
+    chunk_size: int = 1000
+) -> Dict[Tuple[str, str], Dict[str, float]]:
+    """
+    Compute aggregates from scratch from the stored responses
+    Returns {(assessment_id, category): values}
+    """
+    query = db.query(
+        Response.assessment_id,
+        Response.category,
+        Response.risk_score,
+        Response.answer,
+    )
+    if assessment_id:
+        query = query.filter(Response.assessment_id == assessment_id)
+
+    aggregates: Dict[Tuple[str, str], Dict[str, float]] = {}
+    for row_assessment_id, category, risk_score, answer in query.yield_per(chunk_size):
+        key = (row_assessment_id, category or "")
+        contribution = response_contribution(risk_score, answer)
+        values = aggregates.get(key)
+        if values is None:
+            aggregates[key] = contribution
+        else:
+            for field, value in contribution.items():
+                values[field] += value
+
+    return aggregates
+
+
+def check_risk_aggregates(
+    db: Session,
+    assessment_id: Optional[str] = None,
+    repair: bool = False,
+    tolerance: float = 1e-6
+) -> List[Dict[str, Any]]:
+    """
+    Compare stored aggregates with a rebuild from the responses
+    Returns a list of drifted values; with repair=True the stored
+    aggregates and overall assessment risk are rewritten and committed
+    """
+    expected = compute_risk_aggregates(db, assessment_id)
+
+    query = db.query(AssessmentRiskAggregate)
+    if assessment_id:
+        query = query.filter(AssessmentRiskAggregate.assessment_id == assessment_id)
+    stored = {(row.assessment_id, row.category): row for row in query}
+
+    empty = dict.fromkeys(AGGREGATE_FIELDS, 0)
+    drift = []
+    for key in sorted(set(expected) | set(stored)):
+        expected_values = expected.get(key, empty)
+        row = stored.get(key)
+        for field in AGGREGATE_FIELDS:
+            stored_value = getattr(row, field) if row is not None else 0
+            if abs((stored_value or 0) - expected_values[field]) > tolerance:
+                drift.append({
+                    "assessment_id": key[0],
+                    "category": key[1],
+                    "field": field,
+                    "stored": stored_value,
+                    "expected": expected_values[field],
+                })
+
+    if repair and drift:
+        drifted = {item["assessment_id"] for item in drift}
+        for key, row in stored.items():
+            if key[0] in drifted:
+                db.delete(row)
+        db.flush()
+
+        db.add_all(
+            AssessmentRiskAggregate(assessment_id=key[0], category=key[1], **values)
+            for key, values in expected.items()
+            if key[0] in drifted
+        )
+        db.flush()
+
+        for drifted_id in drifted:
+            refresh_assessment_risk(db, drifted_id)
+        rebuild_category_totals(db)
+        db.execute(
+            update(Assessment)
+            .where(Assessment.id.in_(drifted))
+            .values(version=Assessment.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+    return drift
@@ -0,0 +1,185 @@
+"""
+Bulk export of many assessments as one streamed ZIP archive
+
+Assessments are exported concurrently, a bounded number at a time, and each
+one is added to the archive as soon as its files are ready, so entries appear
+in completion order. The archive is sent while it is written: the ZIP is
+written in streaming mode (sizes and checksums follow each entry in a data
+descriptor), so only the entry being added is held in memory. Finished
+exports wait in a bounded queue, so a slow client holds back rendering
+instead of filling memory.
+
+Progress is tracked per job in an in-process registry. With several worker
+processes, a job's status is only known to the worker running it.
+"""
+import asyncio
+import json
+import logging
+import time
+import uuid
+import zipfile
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Files exported for one assessment: (name in the archive, content)
+ExportEntries = List[Tuple[str, bytes]]
+
+# Formats that are already compressed are stored as they are
+STORED_EXTENSIONS = (".pdf",)
+
+MANIFEST_NAME = "manifest.json"
+
+
+class BulkExportJob:
+    """Progress of one bulk export"""
+
+    def __init__(self, total: int):
+        self.id = str(uuid.uuid4())
+        self.status = "running"  # running, completed, failed, cancelled
+        self.total = total
+        self.completed = 0
+        self.failed = 0
+        self.bytes_sent = 0
+        self.created_at = datetime.now()
+        self.finished_at: Optional[datetime] = None
+        self.errors: List[Dict[str, str]] = []
+
+    def finish(self, status: str) -> None:
+        if self.finished_at is None:
+            self.status = status
+            self.finished_at = datetime.now()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "total": self.total,
+            "completed": self.completed,
+            "failed": self.failed,
+            "bytes_sent": self.bytes_sent,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "errors": self.errors,
+        }
+
+
+class BulkExportJobs:
+    """Registry of running and recently finished jobs"""
+
+    def __init__(self, keep: int):
+        self.keep = keep
+        self._jobs: "OrderedDict[str, BulkExportJob]" = OrderedDict()
+
+    def create(self, total: int) -> BulkExportJob:
+        job = BulkExportJob(total)
+        self._jobs[job.id] = job
+
+        # Forget the oldest finished jobs; running ones are always kept
+        finished = [key for key, item in self._jobs.items() if item.finished_at is not None]
+        for key in finished[:max(0, len(self._jobs) - self.keep)]:
+            del self._jobs[key]
+        return job
+
+    def get(self, job_id: str) -> Optional[BulkExportJob]:
+        return self._jobs.get(job_id)
+
+
+class _ZipSink:
+    """Write-only file for zipfile; what it receives is drained into the response"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def stream_bulk_export(
+    job: BulkExportJob,
+    assessment_ids: List[str],
+    export: Callable[[str], Awaitable[ExportEntries]],
+    concurrency: int
+) -> AsyncIterator[bytes]:
+    """
+    Export every assessment with `export` and yield the ZIP archive of the
+    results as it is written. Failed exports are recorded on the job and in
+    the archive's manifest instead of ending the archive.
+    """
+    results: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+    slots = asyncio.Semaphore(concurrency)
+
+    async def export_one(assessment_id: str) -> None:
+        async with slots:
+            try:
+                entries, error = await export(assessment_id), None
+            except Exception as exc:
+                logger.warning("Bulk export of assessment %s failed", assessment_id, exc_info=True)
+                entries, error = None, str(exc) or type(exc).__name__
+            # Holding the slot until the result is taken bounds the finished
+            # exports waiting to be written
+            await results.put((assessment_id, entries, error))
+
+    async def produce() -> None:
+        try:
+            await asyncio.gather(*(export_one(assessment_id) for assessment_id in assessment_ids))
+        finally:
+            await results.put(None)
+
+    producer = asyncio.get_running_loop().create_task(produce())
+    sink = _ZipSink()
+    date_time = time.localtime()[:6]
+    manifest: List[Dict[str, Any]] = []
+
+    def add(archive: zipfile.ZipFile, name: str, content: bytes) -> None:
+        info = zipfile.ZipInfo(name, date_time)
+        info.compress_type = zipfile.ZIP_STORED if name.endswith(STORED_EXTENSIONS) else zipfile.ZIP_DEFLATED
+        archive.writestr(info, content)
+
+    try:
+        with zipfile.ZipFile(sink, "w") as archive:
+            while (result := await results.get()) is not None:
+                assessment_id, entries, error = result
+                if entries is None:
+                    job.failed += 1
+                    job.errors.append({"assessment_id": assessment_id, "error": error})
+                    continue
+
+                for name, content in entries:
+                    # Deflating is done off the event loop
+                    await asyncio.to_thread(add, archive, name, content)
+                    chunk = sink.drain()
+                    job.bytes_sent += len(chunk)
+                    yield chunk
+                manifest.append({"assessment_id": assessment_id, "files": [name for name, _ in entries]})
+                job.completed += 1
+
+            await producer
+            add(archive, MANIFEST_NAME, json.dumps({
+                "job_id": job.id,
+                "created_at": job.created_at.isoformat(),
+                "exports": manifest,
+                "errors": job.errors,
+            }, indent=2).encode())
+
+        # Closing the archive wrote the central directory
+        chunk = sink.drain()
+        job.bytes_sent += len(chunk)
+        yield chunk
+        job.finish("completed")
+    except BaseException as exc:
+        job.finish("cancelled" if isinstance(exc, (asyncio.CancelledError, GeneratorExit)) else "failed")
+        raise
+    finally:
+        producer.cancel()
@@ -0,0 +1,137 @@
+"""
+Caches of pre-encoded response payloads
+
+Entries are grouped by namespace (an assessment id) and keyed within it by
+the view and the assessment's version, so a stale entry can never be served
+once the version has moved on. Deleting a namespace drops every view of an
+assessment at once.
+"""
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from config import RESPONSE_CACHE_MAX_BYTES, RESPONSE_CACHE_TTL
+
+
+class CacheBackend(ABC):
+    """
+    Interface for payload caches
+    Replace the in-memory default with a shared backend (for example one
+    hash per namespace in Redis) when running several workers
+    """
+
+    @abstractmethod
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        """The cached value, or None"""
+
+    @abstractmethod
+    def set(self, namespace: str, key: str, value: bytes) -> None:
+        """Store a value under a key of a namespace"""
+
+    @abstractmethod
+    def delete(self, namespace: str) -> None:
+        """Drop every key of a namespace"""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop everything"""
+
+
+class NullCache(CacheBackend):
+    """Cache that stores nothing"""
+
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        return None
+
+    def set(self, namespace: str, key: str, value: bytes) -> None:
+        pass
+
+    def delete(self, namespace: str) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+
+class MemoryCache(CacheBackend):
+    """
+    In-process LRU cache bounded by the total size of the stored values,
+    with a time to live per entry
+    """
+
+    def __init__(self, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = 0
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, bytes]]" = OrderedDict()
+        self._namespaces: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                self._remove((namespace, key))
+                return None
+            self._entries.move_to_end((namespace, key))
+            return value
+
+    def set(self, namespace: str, key: str, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            if (namespace, key) in self._entries:
+                self._remove((namespace, key))
+            self._entries[(namespace, key)] = (time.monotonic() + self.ttl, value)
+            self._namespaces.setdefault(namespace, set()).add(key)
+            self.size += len(value)
+            while self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def delete(self, namespace: str) -> None:
+        with self._lock:
+            for key in list(self._namespaces.get(namespace, ())):
+                self._remove((namespace, key))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._namespaces.clear()
+            self.size = 0
+
+    def _remove(self, entry_key: Tuple[str, str]) -> None:
+        _, value = self._entries.pop(entry_key)
+        self.size -= len(value)
+        namespace, key = entry_key
+        keys = self._namespaces[namespace]
+        keys.discard(key)
+        if not keys:
+            del self._namespaces[namespace]
+
+
+response_cache: CacheBackend = (
+    MemoryCache(RESPONSE_CACHE_MAX_BYTES, RESPONSE_CACHE_TTL)
+    if RESPONSE_CACHE_MAX_BYTES > 0
+    else NullCache()
+)
+
+
+def set_cache_backend(backend: CacheBackend) -> None:
+    """Replace the response cache, e.g. with a shared backend"""
+    global response_cache
+    response_cache = backend
+
+
+def get_cache_backend() -> CacheBackend:
+    """The response cache currently in use"""
+    return response_cache
+
+
+def invalidate_assessment(assessment_id: str) -> None:
+    """Drop every cached view of an assessment; call after committing a change"""
+    response_cache.delete(assessment_id)
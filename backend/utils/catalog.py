@@ -0,0 +1,170 @@
+"""
+In-memory catalogs for the static JSON data files
+"""
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from config import QUESTIONS_FILE, GDPR_ARTICLES_FILE, CATALOG_CHECK_INTERVAL
+
+
+class JSONCatalog:
+    """
+    Parsed, indexed view of a JSON data file.
+
+    The file is parsed once and kept in memory. It is only re-read when its
+    mtime changes, and only re-indexed when its content hash changes. The
+    mtime itself is checked at most once every ``check_interval`` seconds,
+    so lookups normally never touch the disk.
+    """
+
+    def __init__(self, path: Path, check_interval: float = CATALOG_CHECK_INTERVAL):
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self._data: Dict[str, Any] = {}
+        self.content_hash: Optional[str] = None
+        self._mtime: Optional[float] = None
+        self._next_check = 0.0
+        self._derived: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Reload the file if it changed on disk
+        Returns True if the indexes were rebuilt
+        """
+        now = time.monotonic()
+        if not force and now < self._next_check:
+            return False
+
+        with self._lock:
+            if not force and now < self._next_check:
+                return False
+            self._next_check = now + self.check_interval
+
+            try:
+                mtime = self.path.stat().st_mtime
+            except FileNotFoundError:
+                mtime = None
+
+            if not force and mtime == self._mtime and self.content_hash is not None:
+                return False
+            self._mtime = mtime
+
+            try:
+                raw = self.path.read_bytes() if mtime is not None else b""
+            except FileNotFoundError:
+                raw = b""
+
+            content_hash = hashlib.sha256(raw).hexdigest()
+            if not force and content_hash == self.content_hash:
+                return False
+
+            try:
+                data = json.loads(raw) if raw else {}
+            except json.JSONDecodeError:
+                data = {}
+
+            self._build_indexes(data)
+            self._data = data
+            self.content_hash = content_hash
+            self._derived = {}
+            return True
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        """Parsed file contents (shared, treat as read-only)"""
+        self.refresh()
+        return self._data
+
+    def derived(self, name: str, factory: Callable[["JSONCatalog"], Any]) -> Any:
+        """
+        Get a value computed from the catalog contents
+        The value is cached until the file changes
+        """
+        self.refresh()
+        derived = self._derived
+        if name not in derived:
+            derived[name] = factory(self)
+        return derived[name]
+
+    def _build_indexes(self, data: Dict[str, Any]) -> None:
+        """Build lookup indexes for freshly loaded data"""
+
+
+class QuestionCatalog(JSONCatalog):
+    """Question catalog indexed by question id and category id"""
+
+    _questions: Dict[str, Dict[str, Any]] = {}
+    _categories: Dict[str, Dict[str, Any]] = {}
+
+    def _build_indexes(self, data: Dict[str, Any]) -> None:
+        questions: Dict[str, Dict[str, Any]] = {}
+        categories: Dict[str, Dict[str, Any]] = {}
+
+        for category in data.get("categories", []):
+            category_id = category.get("id")
+            categories.setdefault(category_id, category)
+            for question in category.get("questions", []):
+                question_id = question.get("id")
+                if question_id not in questions:
+                    questions[question_id] = {**question, "category": category_id}
+
+        self._questions = questions
+        self._categories = categories
+
+    def get_question(self, question_id: str) -> Optional[Dict[str, Any]]:
+        """Get a question (with its category id) by ID"""
+        self.refresh()
+        return self._questions.get(question_id)
+
+    def get_category(self, category_id: str) -> Optional[Dict[str, Any]]:
+        """Get a category with its questions by ID"""
+        self.refresh()
+        return self._categories.get(category_id)
+
+    def get_category_questions(self, category_id: str) -> List[Dict[str, Any]]:
+        """Get all questions for a specific category"""
+        category = self.get_category(category_id)
+        return category.get("questions", []) if category else []
+
+    @property
+    def questions(self) -> Dict[str, Dict[str, Any]]:
+        """All questions keyed by ID"""
+        self.refresh()
+        return self._questions
+
+    @property
+    def categories(self) -> Dict[str, Dict[str, Any]]:
+        """All categories keyed by ID"""
+        self.refresh()
+        return self._categories
+
+
+class GDPRArticleCatalog(JSONCatalog):
+    """GDPR article catalog indexed by article number"""
+
+    _articles: Dict[str, Dict[str, Any]] = {}
+
+    def _build_indexes(self, data: Dict[str, Any]) -> None:
+        articles: Dict[str, Dict[str, Any]] = {}
+        for article in data.get("articles", []):
+            articles.setdefault(article.get("number"), article)
+        self._articles = articles
+
+    def get_article(self, article_number: str) -> Optional[Dict[str, Any]]:
+        """Get an article by number"""
+        self.refresh()
+        return self._articles.get(article_number)
+
+    @property
+    def articles(self) -> List[Dict[str, Any]]:
+        """All articles in file order"""
+        return self.data.get("articles", [])
+
+
+# Shared catalog instances
+question_catalog = QuestionCatalog(QUESTIONS_FILE)
+gdpr_catalog = GDPRArticleCatalog(GDPR_ARTICLES_FILE)
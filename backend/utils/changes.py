@@ -0,0 +1,116 @@
+"""
+Change tracking for delta sync
+
+Every write bumps the assessment's version under its row lock and stamps the
+changed responses and mitigations with the new version as their revision.
+Deletions leave a tombstone with the same revision. The version therefore
+works as a monotonically increasing cursor: everything with a revision above
+a client's cursor changed after the client last synced.
+
+Tombstones are pruned after a retention period. Each assessment remembers
+the highest pruned revision; a cursor below it may have missed deletions,
+so the client has to sync again from scratch.
+"""
+from datetime import datetime
+from typing import Any, Dict, Iterable
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session
+from models import Assessment, ChangeTombstone, Mitigation, Response
+
+
+def record_tombstones(
+    db: Session,
+    assessment_id: str,
+    revision: int,
+    entity_type: str,
+    entity_ids: Iterable[str]
+) -> None:
+    """Record the deletion of responses or mitigations at a revision. Does not commit."""
+    rows = [
+        {
+            "assessment_id": assessment_id,
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "revision": revision,
+        }
+        for entity_id in entity_ids
+    ]
+    if rows:
+        db.execute(insert(ChangeTombstone), rows)
+
+
+def prune_tombstones(db: Session, older_than: datetime) -> int:
+    """
+    Delete the tombstones recorded before a cutoff and raise the pruned
+    revision of their assessments. Commits. Returns the number deleted.
+    """
+    expired = ChangeTombstone.deleted_at < older_than
+
+    # Revisions grow with time, so the new maximum is never below the old one
+    db.execute(
+        update(Assessment)
+        .where(Assessment.id.in_(select(ChangeTombstone.assessment_id).where(expired)))
+        .values(
+            pruned_revision=(
+                select(func.max(ChangeTombstone.revision))
+                .where(ChangeTombstone.assessment_id == Assessment.id, expired)
+                .scalar_subquery()
+            ),
+            # Not a change to the assessment
+            updated_at=Assessment.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    deleted = db.execute(
+        delete(ChangeTombstone).where(expired).execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+
+    return deleted
+
+
+def read_changes(db: Session, assessment_id: str, since: int, until: int) -> Dict[str, Any]:
+    """
+    Responses, mitigations and deletions of an assessment with a revision in
+    (since, until], using the (assessment_id, revision) indexes
+    """
+    responses = db.scalars(
+        select(Response)
+        .where(
+            Response.assessment_id == assessment_id,
+            Response.revision > since,
+            Response.revision <= until,
+        )
+        .order_by(Response.revision, Response.id)
+    ).all()
+
+    mitigations = db.scalars(
+        select(Mitigation)
+        .join(Response, Mitigation.response_id == Response.id)
+        .where(
+            Response.assessment_id == assessment_id,
+            Mitigation.revision > since,
+            Mitigation.revision <= until,
+        )
+        .order_by(Mitigation.revision, Mitigation.id)
+    ).all()
+
+    deleted = db.execute(
+        select(ChangeTombstone.entity_type, ChangeTombstone.entity_id, ChangeTombstone.revision)
+        .where(
+            ChangeTombstone.assessment_id == assessment_id,
+            ChangeTombstone.revision > since,
+            ChangeTombstone.revision <= until,
+        )
+        .order_by(ChangeTombstone.revision, ChangeTombstone.id)
+    ).all()
+
+    return {
+        "cursor": until,
+        "responses": responses,
+        "mitigations": mitigations,
+        "deleted": [
+            {"type": row.entity_type, "id": row.entity_id, "revision": row.revision}
+            for row in deleted
+        ],
+    }
@@ -1,11 +1,26 @@
 """
 Export functionality for generating PDF and JSON reports
 """
+import io
 import json
+import re
 from datetime import datetime
-from typing import Dict, Any
+from html import escape as html_escape
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
 from pathlib import Path
-from config import EXPORT_DIR
+from xml.sax.saxutils import escape
+from .catalog import question_catalog
+from .export_cache import export_cache, export_cache_key
+
+# ReportLab styles, built on first use (see get_pdf_styles)
+_PDF_STYLES: Optional[Tuple[Any, Any, Any]] = None
+
+
+def _write_export(key: str, content: bytes, extension: str) -> Path:
+    """Write an export to EXPORT_DIR when the export cache is disabled"""
+    path = export_cache.directory / f"{key}.{extension}"
+    path.write_bytes(content)
+    return path
 
 
 def export_to_json(assessment_data: Dict[str, Any]) -> str:
@@ -31,93 +46,144 @@ def export_to_json(assessment_data: Dict[str, Any]) -> str:
         "risk_summary": assessment_data.get("risk_summary", {}),
     }
     
-    # Generate filename
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"dpia_assessment_{assessment_data.get('id')}_{timestamp}.json"
-    filepath = EXPORT_DIR / filename
+    # Write to the export cache, reusing an earlier export of the same data
+    key = export_cache_key(assessment_data, "json")
+    cached = export_cache.get(key)
+    if cached:
+        return str(cached[0])
     
-    # Write to file
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(export_data, f, indent=2, default=str)
-    
-    return str(filepath)
+    content = json.dumps(export_data, indent=2, default=str).encode("utf-8")
+    return str(export_cache.put(key, content, "json") or _write_export(key, content, "json"))
 
 
-def export_to_pdf(assessment_data: Dict[str, Any]) -> str:
+class JSONExportEncoder:
     """
-    Export assessment to PDF format
-    Returns path to the exported file
+    Incremental encoder for the JSON export document
     
-    Note: This is a simplified version. For production, use libraries like:
-    - ReportLab
-    - WeasyPrint
-    - xhtml2pdf
+    Produces the same document as export_to_json, piece by piece: start()
+    with the assessment, responses() once per batch of responses, then end()
+    with the risk summary. With indent=None the output is compact.
     """
-    try:
-        from reportlab.lib.pagesizes import letter, A4
+    
+    def __init__(self, indent: Optional[int] = 2):
+        self.indent = indent
+        self.newline = "\n" if indent else ""
+        self.colon = ": " if indent else ":"
+        self.separators = None if indent else (",", ":")
+        self._first = True
+    
+    def _pad(self, level: int) -> str:
+        return self.newline + " " * ((self.indent or 0) * level)
+    
+    def _encode(self, value: Any, level: int) -> str:
+        # JSON strings never contain raw newlines, so nested values can be
+        # shifted to their depth by indenting every line break
+        encoded = json.dumps(value, indent=self.indent, separators=self.separators, default=str)
+        return encoded.replace("\n", self._pad(level)) if self.indent else encoded
+    
+    def _key(self, key: str, value: Any) -> str:
+        return f"{self._pad(1)}{json.dumps(key)}{self.colon}{self._encode(value, 1)}"
+    
+    def start(self, assessment: Dict[str, Any], export_date: Optional[datetime] = None) -> bytes:
+        export_date = (export_date or datetime.now()).isoformat()
+        return (
+            "{"
+            + self._key("export_date", export_date) + ","
+            + self._key("assessment", assessment) + ","
+            + f"{self._pad(1)}\"responses\"{self.colon}["
+        ).encode()
+    
+    def responses(self, responses: Iterable[Dict[str, Any]]) -> bytes:
+        parts = []
+        for response in responses:
+            parts.append(("" if self._first else ",") + self._pad(2) + self._encode(response, 2))
+            self._first = False
+        return "".join(parts).encode()
+    
+    def end(self, risk_summary: Dict[str, Any]) -> bytes:
+        close = "]" if self._first else self._pad(1) + "]"
+        return (close + "," + self._key("risk_summary", risk_summary) + self.newline + "}").encode()
+
+
+def get_pdf_styles() -> Tuple[Any, Any, Any]:
+    """
+    ReportLab sample stylesheet and the custom title and heading styles
+    Built once per process; raises ImportError without ReportLab
+    """
+    global _PDF_STYLES
+    if _PDF_STYLES is None:
         from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.lib.units import inch
-        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
         from reportlab.lib import colors
-        from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+        from reportlab.lib.enums import TA_CENTER
+        
+        styles = getSampleStyleSheet()
+        
+        # Custom styles
+        title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=24,
+            textColor=colors.HexColor('#1a1a1a'),
+            spaceAfter=30,
+            alignment=TA_CENTER
+        )
+        
+        heading_style = ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading2'],
+            fontSize=16,
+            textColor=colors.HexColor('#2d2d2d'),
+            spaceAfter=12,
+            spaceBefore=12
+        )
+        
+        _PDF_STYLES = (styles, title_style, heading_style)
+    return _PDF_STYLES
+
+
+def warm_pdf_renderer() -> None:
+    """Import ReportLab and build the styles ahead of the first export"""
+    try:
+        get_pdf_styles()
     except ImportError:
-        # Fallback: create a simple HTML file if ReportLab is not available
-        return _export_to_html(assessment_data)
+        pass
+
+
+def render_pdf(assessment_data: Dict[str, Any]) -> bytes:
+    """
+    Render the PDF report in memory
+    Requires ReportLab
+    """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+    from reportlab.lib import colors
     
-    # Generate filename
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"dpia_assessment_{assessment_data.get('id')}_{timestamp}.pdf"
-    filepath = EXPORT_DIR / filename
+    styles, title_style, heading_style = get_pdf_styles()
     
     # Create PDF
-    doc = SimpleDocTemplate(str(filepath), pagesize=A4)
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4)
     story = []
-    styles = getSampleStyleSheet()
-    
-    # Custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        textColor=colors.HexColor('#1a1a1a'),
-        spaceAfter=30,
-        alignment=TA_CENTER
-    )
-    
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=16,
-        textColor=colors.HexColor('#2d2d2d'),
-        spaceAfter=12,
-        spaceBefore=12
-    )
     
     # Title page
     story.append(Spacer(1, 2*inch))
     story.append(Paragraph("Data Protection Impact Assessment", title_style))
     story.append(Spacer(1, 0.3*inch))
-    story.append(Paragraph(f"<b>{assessment_data.get('title', 'Untitled Assessment')}</b>", styles['Heading2']))
+    story.append(Paragraph(f"<b>{escape(assessment_data.get('title') or 'Untitled Assessment')}</b>", styles['Heading2']))
     story.append(Spacer(1, 0.2*inch))
-    story.append(Paragraph(f"Organization: {assessment_data.get('organization', 'N/A')}", styles['Normal']))
+    story.append(Paragraph(f"Organization: {escape(assessment_data.get('organization') or 'N/A')}", styles['Normal']))
     story.append(Paragraph(f"Date: {datetime.now().strftime('%B %d, %Y')}", styles['Normal']))
     story.append(PageBreak())
     
     # Executive Summary
     story.append(Paragraph("Executive Summary", heading_style))
-    story.append(Paragraph(assessment_data.get('description', 'No description provided.'), styles['Normal']))
+    story.append(Paragraph(escape(assessment_data.get('description') or 'No description provided.'), styles['Normal']))
     story.append(Spacer(1, 0.2*inch))
     
     # Risk Summary
-    risk_level = assessment_data.get('overall_risk_level', 'N/A').upper()
-    risk_score = assessment_data.get('overall_risk_score', 0)
-    
-    risk_color = {
-        'LOW': colors.green,
-        'MEDIUM': colors.orange,
-        'HIGH': colors.orangered,
-        'CRITICAL': colors.red
-    }.get(risk_level, colors.gray)
+    risk_level = (assessment_data.get('overall_risk_level') or 'N/A').upper()
+    risk_score = assessment_data.get('overall_risk_score') or 0
     
     story.append(Paragraph("Risk Assessment", heading_style))
     
@@ -148,82 +214,224 @@ def export_to_pdf(assessment_data: Dict[str, Any]) -> str:
         story.append(Paragraph("Assessment Responses", heading_style))
         
         for idx, response in enumerate(responses, 1):
-            story.append(Paragraph(f"<b>Question {idx}:</b> {response.get('question_id', 'N/A')}", styles['Normal']))
-            story.append(Paragraph(f"Answer: {json.dumps(response.get('answer', 'N/A'))}", styles['Normal']))
-            story.append(Paragraph(f"Risk Score: {response.get('risk_score', 0):.2f}", styles['Normal']))
+            story.append(Paragraph(f"<b>Question {idx}:</b> {escape(str(response.get('question_id', 'N/A')))}", styles['Normal']))
+            story.append(Paragraph(f"Answer: {escape(json.dumps(response.get('answer', 'N/A')))}", styles['Normal']))
+            story.append(Paragraph(f"Risk Score: {response.get('risk_score') or 0:.2f}", styles['Normal']))
             if response.get('notes'):
-                story.append(Paragraph(f"Notes: {response.get('notes')}", styles['Normal']))
+                story.append(Paragraph(f"Notes: {escape(response.get('notes'))}", styles['Normal']))
             story.append(Spacer(1, 0.15*inch))
     
     # Build PDF
     doc.build(story)
     
-    return str(filepath)
-
-
-def _export_to_html(assessment_data: Dict[str, Any]) -> str:
-    """
-    Fallback HTML export if PDF libraries are not available
-    """
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"dpia_assessment_{assessment_data.get('id')}_{timestamp}.html"
-    filepath = EXPORT_DIR / filename
-    
-    html_content = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>DPIA Assessment - {assessment_data.get('title')}</title>
-        <style>
-            body {{ font-family: Arial, sans-serif; margin: 40px; }}
-            h1 {{ color: #2c3e50; }}
-            h2 {{ color: #34495e; margin-top: 30px; }}
-            .risk-badge {{ 
-                display: inline-block;
-                padding: 5px 15px;
-                border-radius: 5px;
-                font-weight: bold;
-            }}
-            .risk-low {{ background-color: #2ecc71; color: white; }}
-            .risk-medium {{ background-color: #f39c12; color: white; }}
-            .risk-high {{ background-color: #e74c3c; color: white; }}
-            .risk-critical {{ background-color: #c0392b; color: white; }}
-            .response {{ margin: 20px 0; padding: 15px; background-color: #ecf0f1; border-radius: 5px; }}
-        </style>
-    </head>
-    <body>
-        <h1>Data Protection Impact Assessment</h1>
-        <h2>{assessment_data.get('title')}</h2>
-        <p><strong>Organization:</strong> {assessment_data.get('organization')}</p>
-        <p><strong>Date:</strong> {datetime.now().strftime('%B %d, %Y')}</p>
-        
-        <h2>Risk Assessment</h2>
-        <p>
-            <strong>Risk Level:</strong> 
-            <span class="risk-badge risk-{assessment_data.get('overall_risk_level', 'low')}">
-                {assessment_data.get('overall_risk_level', 'N/A').upper()}
-            </span>
-        </p>
-        <p><strong>Risk Score:</strong> {assessment_data.get('overall_risk_score', 0):.2f}</p>
-        
-        <h2>Description</h2>
-        <p>{assessment_data.get('description', 'No description provided.')}</p>
-        
-        <h2>Responses</h2>
-        {"".join(f'''
-        <div class="response">
-            <p><strong>Question:</strong> {r.get('question_id')}</p>
-            <p><strong>Answer:</strong> {json.dumps(r.get('answer'))}</p>
-            <p><strong>Risk Score:</strong> {r.get('risk_score', 0):.2f}</p>
-            {f"<p><strong>Notes:</strong> {r.get('notes')}</p>" if r.get('notes') else ""}
-        </div>
-        ''' for r in assessment_data.get('responses', []))}
-    </body>
-    </html>
+    return buffer.getvalue()
+
+
+def render_report(assessment_data: Dict[str, Any]) -> Tuple[str, bytes]:
     """
+    Render the report as a PDF, or as HTML if ReportLab is not installed
+    Returns (media type, content)
+    """
+    try:
+        get_pdf_styles()
+    except ImportError:
+        return "text/html", b"".join(render_html_report(assessment_data))
+    return "application/pdf", render_pdf(assessment_data)
+
+
+def export_to_pdf(assessment_data: Dict[str, Any]) -> str:
+    """
+    Export assessment to PDF format (HTML if ReportLab is not available)
+    Returns path to the exported file in the export cache
+    """
+    key = export_cache_key(assessment_data, "pdf")
+    cached = export_cache.get(key)
+    if cached:
+        return str(cached[0])
+    
+    media_type, content = render_report(assessment_data)
+    extension = "pdf" if media_type == "application/pdf" else "html"
+    return str(export_cache.put(key, content, extension) or _write_export(key, content, extension))
+
+
+def compile_template(source: str) -> str:
+    """
+    Turn a template with $name fields into a str.format string, so the
+    literal text is parsed once and rendering is a single format_map call
+    """
+    escaped = source.replace("{", "{{").replace("}", "}}")
+    return re.sub(r"\$(\w+)", r"{\1}", escaped)
+
+
+_HTML_HEAD = compile_template("""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>DPIA Assessment - $title</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 40px; }
+        h1 { color: #2c3e50; }
+        h2 { color: #34495e; margin-top: 30px; }
+        .risk-badge {
+            display: inline-block;
+            padding: 5px 15px;
+            border-radius: 5px;
+            font-weight: bold;
+        }
+        .risk-low { background-color: #2ecc71; color: white; }
+        .risk-medium { background-color: #f39c12; color: white; }
+        .risk-high { background-color: #e74c3c; color: white; }
+        .risk-critical { background-color: #c0392b; color: white; }
+        .response { margin: 20px 0; padding: 15px; background-color: #ecf0f1; border-radius: 5px; }
+        .question-id { color: #7f8c8d; font-size: 0.85em; }
+    </style>
+</head>
+<body>
+    <h1>Data Protection Impact Assessment</h1>
+    <h2>$title</h2>
+    <p><strong>Organization:</strong> $organization</p>
+    <p><strong>Date:</strong> $date</p>
+
+    <h2>Risk Assessment</h2>
+    <p>
+        <strong>Risk Level:</strong>
+        <span class="risk-badge risk-$risk_class">$risk_level</span>
+    </p>
+    <p><strong>Risk Score:</strong> $risk_score</p>
+
+    <h2>Description</h2>
+    <p>$description</p>
+
+    <h2>Responses</h2>
+""")
+
+
+def _html_response(
+    number: int,
+    question: str,
+    question_id: str,
+    answer: str,
+    risk_score: str,
+    notes: str
+) -> str:
+    """One response of the report, as an f-string: format_map per response costs more"""
+    return f"""    <div class="response">
+        <p><strong>Question {number}:</strong> {question} <span class="question-id">({question_id})</span></p>
+        <p><strong>Answer:</strong> {answer}</p>
+        <p><strong>Risk Score:</strong> {risk_score}</p>{notes}
+    </div>
+"""
+
+
+def _html_notes(notes: str) -> str:
+    """Notes paragraph of a response"""
+    return f"""
+        <p><strong>Notes:</strong> {notes}</p>"""
+
+
+_HTML_TAIL = """</body>
+</html>
+"""
+
+
+def _report_questions(catalog) -> Dict[str, Tuple[str, str, Dict[Any, str]]]:
+    """Question id -> (escaped question text, escaped id, option value -> escaped label)"""
+    questions = {}
+    for question_id, question in catalog.questions.items():
+        labels = {}
+        for option in question.get("options") or []:
+            try:
+                labels[option.get("value")] = html_escape(str(option.get("label") or option.get("value")))
+            except TypeError:
+                continue
+        questions[question_id] = (
+            html_escape(str(question.get("text") or question_id)),
+            html_escape(str(question_id)),
+            labels,
+        )
+    return questions
+
+
+def _answer_html(answer: Any, labels: Dict[Any, str]) -> str:
+    """Escaped, readable answer: option labels for choices, JSON for structured answers"""
+    if isinstance(answer, str):
+        label = labels.get(answer)
+        return label if label is not None else html_escape(answer)
+    if answer is None:
+        return "N/A"
+    if isinstance(answer, list) and all(isinstance(value, (str, int, float)) for value in answer):
+        return ", ".join(
+            labels.get(value) or html_escape(str(value)) for value in answer
+        )
+    if isinstance(answer, (int, float)) and not isinstance(answer, bool):
+        return str(answer)
+    return html_escape(json.dumps(answer, default=str))
+
+
+class HTMLReportRenderer:
+    """
+    Incremental renderer for the HTML report
     
-    with open(filepath, "w", encoding="utf-8") as f:
-        f.write(html_content)
+    start() with the assessment, responses() once per batch of responses,
+    then end(). Every field taken from the assessment is HTML-escaped, and
+    questions are shown with their text from the question catalog.
+    """
+    
+    def __init__(self):
+        self.questions = question_catalog.derived("report_questions", _report_questions)
+        self._number = 0
+    
+    def start(self, assessment: Dict[str, Any], date: Optional[datetime] = None) -> bytes:
+        risk_level = str(assessment.get("overall_risk_level") or "low")
+        return _HTML_HEAD.format_map({
+            "title": html_escape(str(assessment.get("title") or "Untitled Assessment")),
+            "organization": html_escape(str(assessment.get("organization") or "N/A")),
+            "date": (date or datetime.now()).strftime("%B %d, %Y"),
+            "risk_class": html_escape(risk_level.lower()),
+            "risk_level": html_escape(risk_level.upper()),
+            "risk_score": f"{assessment.get('overall_risk_score') or 0:.2f}",
+            "description": html_escape(str(assessment.get("description") or "No description provided.")),
+        }).encode("utf-8")
     
-    return str(filepath)
+    def responses(self, responses: Iterable[Dict[str, Any]]) -> bytes:
+        questions = self.questions
+        number = self._number
+        parts = []
+        for response in responses:
+            number += 1
+            question_id = response.get("question_id")
+            question = questions.get(question_id)
+            if question is None:
+                escaped_id = html_escape(str(question_id))
+                question = (escaped_id, escaped_id, {})
+            text, escaped_id, labels = question
+            notes = response.get("notes")
+            parts.append(_html_response(
+                number,
+                text,
+                escaped_id,
+                _answer_html(response.get("answer"), labels),
+                f"{response.get('risk_score') or 0:.2f}",
+                _html_notes(html_escape(str(notes))) if notes else "",
+            ))
+        self._number = number
+        return "".join(parts).encode("utf-8")
+    
+    def end(self) -> bytes:
+        return _HTML_TAIL.encode("utf-8")
+
 
+# Responses rendered per chunk by render_html_report
+HTML_REPORT_CHUNK = 200
+
+
+def render_html_report(assessment_data: Dict[str, Any]) -> Iterator[bytes]:
+    """Render the HTML report in chunks of encoded HTML"""
+    renderer = HTMLReportRenderer()
+    yield renderer.start(assessment_data)
+    
+    responses = assessment_data.get("responses") or []
+    for start in range(0, len(responses), HTML_REPORT_CHUNK):
+        yield renderer.responses(responses[start:start + HTML_REPORT_CHUNK])
+    
+    yield renderer.end()
@@ -0,0 +1,188 @@
+"""
+Content-addressed cache of rendered exports in EXPORT_DIR
+
+An export is keyed by a hash of everything that goes into it: the
+assessment's fields, responses and risk, the report template version and the
+format. Re-exporting an unchanged assessment serves the stored file instead
+of rendering again.
+
+The directory is bounded by total size and evicted least recently used
+first. It is the only record of the cache: a hit touches the file's
+modification time, and eviction lists the directory and evicts by it.
+Several worker processes therefore enforce one bound over one LRU order.
+Listing is O(number of files), so a store only lists the directory when a
+running total of the size says the bound is reached, or when the total is
+older than SIZE_RESCAN_SECONDS and may miss other processes' stores; and
+eviction frees some headroom below the bound. Between listings, other
+processes' stores can take the directory past the bound for a while.
+Files written before the cache existed are evicted as the oldest entries.
+"""
+import hashlib
+import json
+import mimetypes
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import EXPORT_DIR, EXPORT_CACHE_MAX_BYTES
+
+# Extensions of the stored exports, tried in order on lookup
+EXTENSIONS = ("pdf", "html", "json")
+
+# Written by earlier versions of the cache
+LEGACY_INDEX_FILE = "index.json"
+
+# Age after which a leftover temporary file is removed
+STALE_TEMPORARY_SECONDS = 3600
+
+# Age after which the running size total is recounted from the directory
+SIZE_RESCAN_SECONDS = 60
+
+# Share of the size bound that eviction frees the directory down to
+EVICT_TO_FRACTION = 0.9
+
+# Bump when the layout of the rendered reports changes
+REPORT_TEMPLATE_VERSION = "2"
+
+
+def export_cache_key(assessment_data: Dict[str, Any], format: str) -> str:
+    """Hash of the data an export is rendered from, the template version and the format"""
+    digest = hashlib.sha256()
+    digest.update(f"{REPORT_TEMPLATE_VERSION}:{format}:".encode())
+    digest.update(json.dumps(assessment_data, sort_keys=True, separators=(",", ":"), default=str).encode())
+    return digest.hexdigest()
+
+
+class ExportCache:
+    """
+    LRU cache of export files in a directory, bounded by total bytes
+
+    The directory is the only state: a file's modification time is its last
+    use, so worker processes sharing the directory share the LRU order and
+    the size bound. The size of the directory is tracked between listings.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # Size of the directory as of the last listing plus later stores
+        self._size: Optional[int] = None
+        self._counted_at = 0.0
+
+    def get(self, key: str) -> Optional[Tuple[Path, Optional[str]]]:
+        """Path and media type of a cached export, or None"""
+        for extension in EXTENSIONS:
+            path = self.directory / f"{key}.{extension}"
+            try:
+                # Mark as most recently used
+                os.utime(path)
+            except FileNotFoundError:
+                continue
+            return path, mimetypes.guess_type(path.name)[0]
+        return None
+
+    def put(self, key: str, content: bytes, extension: str) -> Optional[Path]:
+        """
+        Store an export, evicting the least recently used ones over the size
+        bound. Returns the stored file, or None if the cache stores nothing.
+        """
+        path = self.directory / f"{key}.{extension}"
+
+        # Write under a temporary name so readers never see a partial file
+        temporary = self.directory / f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        temporary.write_bytes(content)
+        os.replace(temporary, path)
+
+        with self._lock:
+            if (
+                self._size is None
+                or self._size + len(content) > self.max_bytes
+                or time.monotonic() - self._counted_at > SIZE_RESCAN_SECONDS
+            ):
+                self._evict(keep=path.name)
+            else:
+                self._size += len(content)
+        return path
+
+    def load(self) -> None:
+        """Create the directory, count its size and evict down to the bound"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Index left by earlier versions of the cache
+        try:
+            (self.directory / LEGACY_INDEX_FILE).unlink()
+        except FileNotFoundError:
+            pass
+        with self._lock:
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            for _, name, _ in self._scan():
+                self._unlink(name)
+            self._size = None
+
+    def _scan(self) -> List[Tuple[float, str, int]]:
+        """(last use, file name, size) of the stored exports, least recently used first"""
+        entries = []
+        now = time.time()
+        for entry in os.scandir(self.directory):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                # Evicted by another process meanwhile
+                continue
+            if entry.name.startswith("."):
+                # Temporary file of a write that never finished
+                if entry.name.endswith(".tmp") and now - stat.st_mtime > STALE_TEMPORARY_SECONDS:
+                    self._unlink(entry.name)
+                continue
+            if entry.is_file():
+                entries.append((stat.st_mtime, entry.name, stat.st_size))
+        entries.sort()
+        return entries
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        entries = self._scan()
+        size = sum(entry[2] for entry in entries)
+        # Once over the bound, leave room so the next stores need no listing
+        target = self.max_bytes if size <= self.max_bytes else int(self.max_bytes * EVICT_TO_FRACTION)
+        for _, name, file_size in entries:
+            if size <= target:
+                break
+            if name != keep:
+                self._unlink(name)
+                size -= file_size
+        self._size = size
+        self._counted_at = time.monotonic()
+
+    def _unlink(self, name: str) -> None:
+        try:
+            (self.directory / name).unlink()
+        except FileNotFoundError:
+            pass
+
+
+class NullExportCache(ExportCache):
+    """Export cache that stores nothing"""
+
+    def get(self, key: str) -> Optional[Tuple[Path, Optional[str]]]:
+        return None
+
+    def put(self, key: str, content: bytes, extension: str) -> Optional[Path]:
+        return None
+
+    def load(self) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+
+export_cache: ExportCache = (
+    ExportCache(EXPORT_DIR, EXPORT_CACHE_MAX_BYTES)
+    if EXPORT_CACHE_MAX_BYTES > 0
+    else NullExportCache(EXPORT_DIR, 0)
+)
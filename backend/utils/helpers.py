@@ -1,10 +1,13 @@
 """
 Helper functions for data loading and processing
 """
+import base64
 import json
+from datetime import datetime, timezone
+from email.utils import format_datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Any
-from config import QUESTIONS_FILE, GDPR_ARTICLES_FILE
+from .catalog import gdpr_catalog, question_catalog
 
 
 def load_json_file(file_path: Path) -> Dict[str, Any]:
@@ -19,50 +22,28 @@ def load_json_file(file_path: Path) -> Dict[str, Any]:
 
 
 def load_questions() -> Dict[str, Any]:
-    """Load questions from JSON file"""
-    return load_json_file(QUESTIONS_FILE)
+    """Load questions from the in-memory catalog"""
+    return question_catalog.data
 
 
 def load_gdpr_articles() -> Dict[str, Any]:
-    """Load GDPR articles from JSON file"""
-    return load_json_file(GDPR_ARTICLES_FILE)
+    """Load GDPR articles from the in-memory catalog"""
+    return gdpr_catalog.data
 
 
 def get_question_by_id(question_id: str) -> Optional[Dict[str, Any]]:
     """Get a specific question by ID"""
-    questions_data = load_questions()
-    
-    for category in questions_data.get("categories", []):
-        for question in category.get("questions", []):
-            if question.get("id") == question_id:
-                return {
-                    **question,
-                    "category": category.get("id")
-                }
-    
-    return None
+    return question_catalog.get_question(question_id)
 
 
 def get_category_questions(category_id: str) -> List[Dict[str, Any]]:
     """Get all questions for a specific category"""
-    questions_data = load_questions()
-    
-    for category in questions_data.get("categories", []):
-        if category.get("id") == category_id:
-            return category.get("questions", [])
-    
-    return []
+    return question_catalog.get_category_questions(category_id)
 
 
 def get_gdpr_article(article_number: str) -> Optional[Dict[str, Any]]:
     """Get a specific GDPR article by number"""
-    gdpr_data = load_gdpr_articles()
-    
-    for article in gdpr_data.get("articles", []):
-        if article.get("number") == article_number:
-            return article
-    
-    return None
+    return gdpr_catalog.get_article(article_number)
 
 
 def validate_answer(question: Dict[str, Any], answer: Any) -> bool:
@@ -81,3 +62,71 @@ def validate_answer(question: Dict[str, Any], answer: Any) -> bool:
     
     return True
 
+
+def encode_cursor(values: List[Any]) -> str:
+    """Encode keyset pagination values as an opaque cursor token"""
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> List[Any]:
+    """
+    Decode a cursor token created by encode_cursor
+    Raises ValueError for malformed tokens
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+
+    return values
+
+
+def format_etag(version: int) -> str:
+    """Strong entity tag for an assessment version"""
+    return f'"{version}"'
+
+
+def parse_etags(header: str) -> Optional[List[str]]:
+    """
+    Entity tags listed in an If-Match / If-None-Match header
+    Returns None for "*"; weak tags keep their W/ prefix
+    """
+    if header.strip() == "*":
+        return None
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header with the current tag"""
+    tags = parse_etags(header)
+    if tags is None:
+        return True
+    return any(tag.removeprefix("W/") == etag for tag in tags)
+
+
+def etag_versions(header: str) -> Optional[List[int]]:
+    """
+    Versions named by an If-Match header (strong comparison)
+    Returns None for "*"; weak or foreign tags match nothing
+    """
+    tags = parse_etags(header)
+    if tags is None:
+        return None
+
+    versions = []
+    for tag in tags:
+        if tag.startswith('"') and tag.endswith('"') and tag[1:-1].isdigit():
+            versions.append(int(tag[1:-1]))
+    return versions
+
+
+def http_date(value: datetime) -> str:
+    """Format a timestamp for Last-Modified; naive values are UTC"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
@@ -0,0 +1,94 @@
+"""
+Pre-encoded payloads for static API responses
+
+Payloads that only change with the data files are serialized once, compressed
+ahead of time and identified by a hash of their content, so serving one is a
+dict lookup: no validation, encoding or compression per request.
+"""
+import gzip
+import hashlib
+from typing import Dict, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+# Bodies smaller than this are not worth compressing
+COMPRESS_MIN_BYTES = 512
+
+# Preferred content codings, best first
+ENCODINGS = ("br", "gzip", "identity")
+
+
+class EncodedPayload:
+    """
+    A response body with its gzip (and, if the brotli package is installed,
+    brotli) variants and a content-hash ETag
+    """
+
+    __slots__ = ("digest", "variants")
+
+    def __init__(self, body: bytes):
+        self.digest = hashlib.sha256(body).hexdigest()[:32]
+        self.variants: Dict[str, bytes] = {"identity": body}
+
+        if len(body) >= COMPRESS_MIN_BYTES:
+            compressed = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+            if brotli is not None:
+                compressed["br"] = brotli.compress(body, quality=11)
+            for encoding, data in compressed.items():
+                if len(data) < len(body):
+                    self.variants[encoding] = data
+
+    @property
+    def body(self) -> bytes:
+        return self.variants["identity"]
+
+    def etag(self, encoding: str = "identity") -> str:
+        """Strong ETag of one variant; variants differ by a coding suffix"""
+        if encoding == "identity":
+            return f'"{self.digest}"'
+        return f'"{self.digest}-{encoding}"'
+
+    @property
+    def etags(self) -> Tuple[str, ...]:
+        return tuple(self.etag(encoding) for encoding in self.variants)
+
+    def select(self, accept_encoding: Optional[str]) -> Tuple[str, bytes]:
+        """Pick the variant to send for an Accept-Encoding header"""
+        encoding = negotiate_encoding(accept_encoding, self.variants)
+        return encoding, self.variants[encoding]
+
+
+def negotiate_encoding(accept_encoding: Optional[str], available) -> str:
+    """
+    Choose a content coding from an Accept-Encoding header: the available
+    coding with the highest q-value, ties going to the smaller coding.
+    Falls back to identity.
+    """
+    if not accept_encoding:
+        return "identity"
+
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if coding:
+            weights[coding] = q
+
+    best, best_q = "identity", 0.0
+    for encoding in ENCODINGS:
+        if encoding not in available:
+            continue
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
@@ -0,0 +1,87 @@
+"""
+In-process publish/subscribe for pushed assessment updates
+
+Writers publish an assessment id after committing. The first publish opens
+a debounce window; further publishes within it are coalesced, and when it
+closes the payload is computed once and handed to every subscriber of the
+assessment. Subscribers only ever hold the latest payload, so a slow client
+skips intermediate updates instead of buffering them.
+
+Each worker process has its own hub: with several workers, a client only
+sees writes handled by the worker it is connected to unless publishes are
+relayed between processes (for example over Redis pub/sub).
+"""
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (assessment version, encoded payload), or None once the assessment is gone
+Update = Optional[Tuple[int, bytes]]
+
+
+class UpdateHub:
+    """Debounced fan-out of one computed payload per assessment"""
+
+    def __init__(self, compute: Callable[[str], Awaitable[Update]], debounce: float):
+        self.compute = compute
+        self.debounce = debounce
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._pending: Dict[str, asyncio.Task] = {}
+
+    @asynccontextmanager
+    async def subscribe(self, assessment_id: str) -> AsyncIterator[asyncio.Queue]:
+        """Queue receiving the updates of an assessment while the context is open"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        self._subscribers.setdefault(assessment_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            subscribers = self._subscribers.get(assessment_id)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[assessment_id]
+
+    def subscriber_count(self, assessment_id: str) -> int:
+        return len(self._subscribers.get(assessment_id, ()))
+
+    def publish(self, assessment_id: str) -> None:
+        """Schedule an update of an assessment; call after committing a change"""
+        if assessment_id not in self._subscribers or assessment_id in self._pending:
+            return
+        self._pending[assessment_id] = asyncio.get_running_loop().create_task(
+            self._flush(assessment_id)
+        )
+
+    async def _flush(self, assessment_id: str) -> None:
+        try:
+            await asyncio.sleep(self.debounce)
+        finally:
+            # Writes committed from here on open a new window
+            self._pending.pop(assessment_id, None)
+
+        if assessment_id not in self._subscribers:
+            return
+
+        try:
+            update = await self.compute(assessment_id)
+        except Exception:
+            logger.exception("Computing the update of assessment %s failed", assessment_id)
+            return
+
+        for queue in list(self._subscribers.get(assessment_id, ())):
+            # Replace an update the subscriber has not consumed yet
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(update)
+
+    async def close(self) -> None:
+        """Cancel pending updates"""
+        tasks = list(self._pending.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._pending.clear()
@@ -0,0 +1,129 @@
+"""
+Report rendering in a pool of worker processes
+
+ReportLab rendering is CPU-bound and holds the GIL, so reports are rendered
+in separate processes. Each worker imports ReportLab and builds the styles
+once when it starts. The number of jobs waiting or running is bounded, and
+every job has a deadline: the worker aborts a render that runs past it and
+skips a job that waited past it.
+"""
+import asyncio
+import multiprocessing
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from typing import Any, Dict, Optional, Tuple
+
+from config import PDF_RENDER_WORKERS, PDF_RENDER_QUEUE, PDF_RENDER_TIMEOUT
+from .export import render_report, warm_pdf_renderer
+
+
+class RenderQueueFull(Exception):
+    """Raised when as many jobs as the pool accepts are already pending"""
+
+
+class RenderTimeout(TimeoutError):
+    """Raised when a job did not finish before its deadline"""
+
+
+@contextmanager
+def _deadline(deadline: float):
+    """Interrupt the block at a wall-clock deadline (where SIGALRM exists)"""
+    remaining = deadline - time.time()
+    if remaining <= 0:
+        raise RenderTimeout("Deadline passed before rendering started")
+
+    if not hasattr(signal, "setitimer"):
+        yield
+        return
+
+    def interrupt(signum, frame):
+        raise RenderTimeout("Rendering exceeded its deadline")
+
+    previous = signal.signal(signal.SIGALRM, interrupt)
+    signal.setitimer(signal.ITIMER_REAL, remaining)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _render_job(assessment_data: Dict[str, Any], deadline: float) -> Tuple[str, bytes]:
+    """Runs in a worker process"""
+    with _deadline(deadline):
+        return render_report(assessment_data)
+
+
+class RenderService:
+    """Bounded, deadline-aware process pool for report rendering"""
+
+    def __init__(self, workers: int, queue_size: int, timeout: float):
+        self.workers = workers
+        self.max_pending = workers + queue_size
+        self.timeout = timeout
+        self.pending = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._capacity: Optional[asyncio.Condition] = None
+
+    def start(self) -> None:
+        """Start the workers so the first export does not pay for it"""
+        if self._executor is not None:
+            return
+        # Spawned workers do not inherit the parent's threads, event loop
+        # or database connections
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=warm_pdf_renderer,
+        )
+        for _ in range(self.workers):
+            self._executor.submit(time.sleep, 0)
+
+    async def render(self, assessment_data: Dict[str, Any], wait: bool = False) -> Tuple[str, bytes]:
+        """
+        Render a report without blocking the event loop
+        When the pool is full, raises RenderQueueFull, or with wait=True waits
+        for a job to finish
+        Returns (media type, content)
+        """
+        if self.pending >= self.max_pending:
+            if not wait:
+                raise RenderQueueFull(f"{self.pending} reports are already being rendered")
+            if self._capacity is None:
+                self._capacity = asyncio.Condition()
+            async with self._capacity:
+                await self._capacity.wait_for(lambda: self.pending < self.max_pending)
+
+        self.start()
+        self.pending += 1
+        try:
+            future = self._executor.submit(_render_job, assessment_data, time.time() + self.timeout)
+            try:
+                # Leave the worker a moment to report its own timeout
+                return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout + 1)
+            except asyncio.TimeoutError:
+                # Drops the job if it is still queued
+                future.cancel()
+                raise RenderTimeout("Rendering exceeded its deadline")
+            except BrokenProcessPool:
+                # A worker died (e.g. killed for memory); start a fresh pool next time
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+                raise
+        finally:
+            self.pending -= 1
+            if self._capacity is not None:
+                async with self._capacity:
+                    self._capacity.notify()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+# Shared rendering service; workers start on first use or at application startup
+report_renderer = RenderService(PDF_RENDER_WORKERS, PDF_RENDER_QUEUE, PDF_RENDER_TIMEOUT)
@@ -0,0 +1,379 @@
+"""
+Vectorized portfolio-wide risk recomputation
+"""
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session
+from config import RISK_THRESHOLDS
+from models import Assessment, AssessmentRiskAggregate, Response, RiskLevel
+from .aggregates import rebuild_category_totals
+from .catalog import question_catalog
+from .risk import (
+    HIGH_RISK_SCORE,
+    detect_risk_modifiers,
+    get_scoring_plans,
+    _score_multi_select,
+    _score_select,
+    _score_number,
+    _score_text,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+# Question type codes used in the compiled index
+TYPE_DEFAULT = 0
+TYPE_MULTI_SELECT = 1
+TYPE_SELECT = 2
+TYPE_NUMBER = 3
+TYPE_TEXT = 4
+
+_TYPE_CODES = {
+    _score_multi_select: TYPE_MULTI_SELECT,
+    _score_select: TYPE_SELECT,
+    _score_number: TYPE_NUMBER,
+    _score_text: TYPE_TEXT,
+}
+
+RISK_LEVELS = ["low", "medium", "high", "critical"]
+
+
+class CompiledQuestionIndex:
+    """
+    Array form of the scoring plans.
+
+    Questions and their options are numbered so that a chunk of responses
+    can be scored with NumPy indexing instead of per-row dict lookups.
+    """
+
+    def __init__(self, plans: Dict[str, Any]):
+        self.question_index: Dict[str, int] = {}
+        self.option_index: List[Dict[Any, int]] = []
+        type_codes = []
+        base_weights = []
+        option_weights = []
+
+        for question_id, plan in plans.items():
+            self.question_index[question_id] = len(type_codes)
+            type_codes.append(_TYPE_CODES.get(plan.scorer, TYPE_DEFAULT))
+            base_weights.append(plan.base_weight)
+
+            options = {}
+            for value, weight in plan.weights.items():
+                options[value] = len(option_weights)
+                option_weights.append(weight)
+            self.option_index.append(options)
+
+        self.type_code_list = type_codes
+        self.type_codes = np.array(type_codes, dtype=np.int8)
+        self.base_weights = np.array(base_weights, dtype=np.float64)
+        self.option_weights = np.array(option_weights, dtype=np.float64)
+
+
+def get_compiled_index() -> CompiledQuestionIndex:
+    """Get the compiled index, rebuilt when the question catalog changes"""
+    return question_catalog.derived(
+        "compiled_question_index",
+        lambda catalog: CompiledQuestionIndex(get_scoring_plans()),
+    )
+
+
+class _GroupTotals:
+    """Growable per-(assessment, category) aggregate arrays"""
+
+    def __init__(self, capacity: int = 1024):
+        self.keys: List[Tuple[str, str]] = []
+        self.index: Dict[Tuple[str, str], int] = {}
+        self.values = np.zeros((5, capacity), dtype=np.float64)
+
+    def lookup(self, key: Tuple[str, str]) -> int:
+        idx = self.index.get(key)
+        if idx is None:
+            idx = self.index[key] = len(self.keys)
+            self.keys.append(key)
+        return idx
+
+    def add(self, group: "np.ndarray", columns: List["np.ndarray"]) -> None:
+        size = len(self.keys)
+        if size > self.values.shape[1]:
+            grown = np.zeros((5, max(size, self.values.shape[1] * 2)), dtype=np.float64)
+            grown[:, :self.values.shape[1]] = self.values
+            self.values = grown
+        for row, column in enumerate(columns):
+            self.values[row, :size] += np.bincount(group, weights=column, minlength=size)
+
+
+def _score_chunk(
+    index: CompiledQuestionIndex,
+    answers: List[Any],
+    question_ids: List[str],
+    old_scores: "np.ndarray"
+) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    """
+    Score a chunk of responses
+    Returns (scores, special_category_flags, children_flags)
+    """
+    n = len(answers)
+    question = np.full(n, -1, dtype=np.int64)
+    numbers = np.zeros(n, dtype=np.float64)
+    valid_number = np.zeros(n, dtype=bool)
+    non_empty = np.zeros(n, dtype=bool)
+    special = np.zeros(n, dtype=bool)
+    children = np.zeros(n, dtype=bool)
+    entry_rows: List[int] = []
+    entry_options: List[int] = []
+
+    question_index = index.question_index
+    option_index = index.option_index
+    type_codes = index.type_code_list
+
+    # Decode answers into flat arrays
+    for row, (question_id, answer) in enumerate(zip(question_ids, answers)):
+        special[row], children[row] = detect_risk_modifiers(answer)
+
+        q = question_index.get(question_id)
+        if q is None:
+            continue
+        question[row] = q
+        type_code = type_codes[q]
+
+        if type_code == TYPE_MULTI_SELECT:
+            if isinstance(answer, list):
+                options = option_index[q]
+                seen = set()
+                for value in answer:
+                    try:
+                        option = options.get(value)
+                    except TypeError:
+                        continue
+                    if option is not None and option not in seen:
+                        seen.add(option)
+                        entry_rows.append(row)
+                        entry_options.append(option)
+        elif type_code == TYPE_SELECT:
+            try:
+                option = option_index[q].get(answer)
+            except TypeError:
+                option = None
+            if option is not None:
+                entry_rows.append(row)
+                entry_options.append(option)
+        elif type_code == TYPE_NUMBER:
+            try:
+                numbers[row] = float(answer)
+                valid_number[row] = True
+            except (ValueError, TypeError):
+                pass
+        elif type_code == TYPE_TEXT:
+            non_empty[row] = bool(answer) and len(str(answer)) > 0
+
+    known = question >= 0
+    safe_question = np.where(known, question, 0)
+    types = np.where(known, index.type_codes[safe_question], TYPE_DEFAULT)
+    base = index.base_weights[safe_question] if len(index.base_weights) else np.zeros(n)
+
+    entry_rows_array = np.array(entry_rows, dtype=np.int64)
+    entry_weights = index.option_weights[np.array(entry_options, dtype=np.int64)]
+    option_sums = np.bincount(entry_rows_array, weights=entry_weights, minlength=n)
+    option_counts = np.bincount(entry_rows_array, minlength=n)
+
+    scores = base * 0.5
+    scores = np.where(
+        types == TYPE_MULTI_SELECT,
+        np.where(option_counts > 0, option_sums / np.maximum(option_counts, 1), 0.0),
+        scores,
+    )
+    scores = np.where(
+        types == TYPE_SELECT,
+        np.where(option_counts > 0, option_sums, base * 0.5),
+        scores,
+    )
+    scores = np.where(
+        types == TYPE_NUMBER,
+        np.where(valid_number, base * np.minimum(numbers / 100, 1.0), 0.0),
+        scores,
+    )
+    scores = np.where(types == TYPE_TEXT, np.where(non_empty, base * 0.5, 0.0), scores)
+
+    # Questions no longer in the catalog keep their stored score
+    scores = np.where(known, scores, old_scores)
+
+    return scores, special, children
+
+
+def rescore_portfolio(
+    db: Session,
+    chunk_size: int = 50000,
+    tolerance: float = 1e-12
+) -> Dict[str, Any]:
+    """
+    Recompute every stored response score, the risk aggregates and the
+    overall risk of every assessment, writing results back with bulk UPDATEs
+    Returns statistics about the run
+    """
+    if np is None:
+        raise RuntimeError("Batch rescoring requires numpy (pip install numpy)")
+
+    started = time.perf_counter()
+    index = get_compiled_index()
+    groups = _GroupTotals()
+    responses_scanned = 0
+    responses_updated = 0
+    last_id: Optional[str] = None
+    connection = db.connection()
+
+    # Rescored responses are stamped with the next version of their
+    # assessment so delta sync picks them up; only assessments that end up
+    # changing are moved to that version
+    stored = {
+        assessment_id: (version, score, level)
+        for assessment_id, version, score, level in connection.execute(
+            select(
+                Assessment.id,
+                Assessment.version,
+                Assessment.overall_risk_score,
+                Assessment.overall_risk_level,
+            )
+        )
+    }
+    versions = {assessment_id: row[0] + 1 for assessment_id, row in stored.items()}
+    changed_assessments = set()
+
+    while True:
+        query = (
+            select(
+                Response.id,
+                Response.assessment_id,
+                Response.category,
+                Response.question_id,
+                Response.answer,
+                Response.risk_score,
+            )
+            .order_by(Response.id)
+            .limit(chunk_size)
+        )
+        if last_id is not None:
+            query = query.where(Response.id > last_id)
+
+        rows = connection.execute(query).all()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        responses_scanned += len(rows)
+
+        ids, assessment_ids, categories, question_ids, answers, old = zip(*rows)
+        old_scores = np.array([score or 0.0 for score in old], dtype=np.float64)
+        scores, special, children = _score_chunk(index, list(answers), list(question_ids), old_scores)
+
+        # Write back changed scores
+        changed = np.flatnonzero(np.abs(scores - old_scores) > tolerance)
+        if len(changed):
+            db.execute(
+                update(Response),
+                [
+                    {
+                        "id": ids[i],
+                        "risk_score": float(scores[i]),
+                        "revision": versions[assessment_ids[i]],
+                    }
+                    for i in changed
+                ],
+            )
+            responses_updated += len(changed)
+            changed_assessments.update(assessment_ids[i] for i in changed)
+
+        # Accumulate aggregates
+        lookup = groups.lookup
+        group = np.fromiter(
+            (lookup((a, c or "")) for a, c in zip(assessment_ids, categories)),
+            dtype=np.int64,
+            count=len(rows),
+        )
+        groups.add(group, [
+            scores,
+            np.ones(len(rows)),
+            (scores > HIGH_RISK_SCORE).astype(np.float64),
+            special.astype(np.float64),
+            children.astype(np.float64),
+        ])
+
+    # Rewrite the risk aggregates
+    size = len(groups.keys)
+    values = groups.values[:, :size]
+    db.execute(delete(AssessmentRiskAggregate))
+    if size:
+        db.execute(
+            insert(AssessmentRiskAggregate),
+            [
+                {
+                    "assessment_id": key[0],
+                    "category": key[1],
+                    "score_sum": float(values[0, i]),
+                    "response_count": int(values[1, i]),
+                    "high_risk_count": int(values[2, i]),
+                    "special_category_count": int(values[3, i]),
+                    "children_data_count": int(values[4, i]),
+                }
+                for i, key in enumerate(groups.keys)
+            ],
+        )
+    rebuild_category_totals(db)
+
+    # Overall assessment risk; assessments without responses drop to zero
+    overall_risk = {assessment_id: (0.0, RiskLevel.LOW) for assessment_id in stored}
+    assessment_keys: Dict[str, int] = {}
+    group_assessment = np.fromiter(
+        (assessment_keys.setdefault(key[0], len(assessment_keys)) for key in groups.keys),
+        dtype=np.int64,
+        count=size,
+    )
+    assessments = len(assessment_keys)
+    if assessments:
+        totals = np.bincount(group_assessment, weights=values[0], minlength=assessments)
+        counts = np.bincount(group_assessment, weights=values[1], minlength=assessments)
+        specials = np.bincount(group_assessment, weights=values[3], minlength=assessments)
+        childrens = np.bincount(group_assessment, weights=values[4], minlength=assessments)
+
+        overall = totals / counts
+        overall = overall * np.where(specials > 0, 1.3, 1.0)
+        overall = overall * np.where(childrens > 0, 1.2, 1.0)
+        overall = np.minimum(overall, 1.0)
+        levels = np.digitize(
+            overall,
+            [RISK_THRESHOLDS["low"], RISK_THRESHOLDS["medium"], RISK_THRESHOLDS["high"]],
+        )
+        rounded = np.round(overall, 3)
+
+        for assessment_id, i in assessment_keys.items():
+            overall_risk[assessment_id] = (float(rounded[i]), RiskLevel(RISK_LEVELS[levels[i]]))
+
+    # Write back and bump the version of changed assessments only, so
+    # untouched cached payloads and ETags stay valid
+    updates = []
+    for assessment_id, (score, level) in overall_risk.items():
+        _, old_score, old_level = stored[assessment_id]
+        if (
+            assessment_id in changed_assessments
+            or old_level != level
+            or abs((old_score or 0.0) - score) > tolerance
+        ):
+            updates.append({
+                "id": assessment_id,
+                "overall_risk_score": score,
+                "overall_risk_level": level,
+                "version": versions[assessment_id],
+            })
+    if updates:
+        db.execute(update(Assessment), updates)
+
+    db.commit()
+
+    return {
+        "responses_scanned": responses_scanned,
+        "responses_updated": responses_updated,
+        "assessments_updated": len(updates),
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+    }
@@ -0,0 +1,155 @@
+"""
+Write paths for assessment responses
+"""
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import case, func, literal, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from db import upsert_insert
+from models import Assessment, AssessmentStatus, Mitigation, Response
+from .aggregates import read_risk_summary, refresh_assessment_risk, refresh_category_aggregates
+
+UPSERT_FIELDS = (
+    "category",
+    "answer",
+    "risk_score",
+    "special_category_data",
+    "children_data",
+    "notes",
+)
+
+
+def touch_assessment(
+    db: Session,
+    assessment_id: str,
+    expected_versions: Optional[List[int]] = None
+) -> Optional[int]:
+    """
+    Bump the version and updated_at of an assessment before a change to it
+    or its responses and mitigations. With expected_versions, only bump if
+    the current version is one of them (If-Match). Returns the new version,
+    which changed rows store as their revision, or None if the assessment
+    does not exist or its version did not match.
+    """
+    stmt = update(Assessment).where(Assessment.id == assessment_id)
+    if expected_versions is not None:
+        stmt = stmt.where(Assessment.version.in_(expected_versions))
+
+    return db.execute(
+        stmt
+        .values(version=Assessment.version + 1, updated_at=func.now())
+        .returning(Assessment.version)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+
+
+def mark_assessment_in_progress(db: Session, assessment_id: str) -> Optional[int]:
+    """
+    Move a draft assessment to in progress and bump its version and
+    updated_at in one UPDATE. The row lock taken here serializes concurrent
+    writers of the assessment. Returns the new version, or None if the
+    assessment does not exist.
+    """
+    status_type = Assessment.status.type
+    return db.execute(
+        update(Assessment)
+        .where(Assessment.id == assessment_id)
+        .values(
+            status=case(
+                (
+                    Assessment.status == literal(AssessmentStatus.DRAFT, status_type),
+                    literal(AssessmentStatus.IN_PROGRESS, status_type),
+                ),
+                else_=Assessment.status,
+            ),
+            version=Assessment.version + 1,
+            updated_at=func.now(),
+        )
+        .returning(Assessment.version)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+
+
+def upsert_responses(
+    db: Session,
+    assessment_id: str,
+    rows: List[Dict[str, Any]],
+    revision: int
+) -> Tuple[List[Response], Dict[str, Any]]:
+    """
+    Insert or update responses keyed by (assessment_id, question_id) with a
+    single INSERT ... ON CONFLICT DO UPDATE ... RETURNING statement, then
+    refresh the risk aggregates of the touched categories, old and new.
+
+    Each row holds question_id plus the UPSERT_FIELDS values; question ids
+    must be unique. The rows are stamped with the given revision (the new
+    assessment version). Returns the stored responses in the order of the
+    rows and the refreshed risk analysis. Does not commit.
+    """
+    if not rows:
+        return [], read_risk_summary(db, assessment_id)
+
+    params = [
+        {
+            "id": str(uuid.uuid4()),
+            "assessment_id": assessment_id,
+            "question_id": row["question_id"],
+            "revision": revision,
+            **{field: row.get(field) for field in UPSERT_FIELDS},
+        }
+        for row in rows
+    ]
+
+    # A row moved to another category leaves its old category's aggregate stale
+    categories = {row.get("category") for row in rows}
+    categories.update(db.scalars(
+        select(Response.category)
+        .where(
+            Response.assessment_id == assessment_id,
+            Response.question_id.in_([row["question_id"] for row in rows]),
+        )
+        .distinct()
+    ))
+
+    stmt = upsert_insert(db, Response)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["assessment_id", "question_id"],
+        set_={
+            **{field: stmt.excluded[field] for field in UPSERT_FIELDS},
+            "revision": stmt.excluded.revision,
+            "updated_at": func.now(),
+        },
+    ).returning(Response)
+
+    # RETURNING order is not guaranteed for multi-row VALUES
+    stored = {
+        response.question_id: response
+        for response in db.scalars(
+            stmt,
+            params,
+            execution_options={"populate_existing": True},
+        )
+    }
+    responses = [stored[row["question_id"]] for row in rows]
+
+    refresh_category_aggregates(db, assessment_id, categories)
+    risk_analysis = refresh_assessment_risk(db, assessment_id)
+
+    return responses, risk_analysis
+
+
+def load_mitigations(db: Session, responses: List[Response]) -> None:
+    """Populate the mitigations of many responses with a single query"""
+    by_response: Dict[str, List[Mitigation]] = {response.id: [] for response in responses}
+    if not by_response:
+        return
+
+    mitigations = db.scalars(
+        select(Mitigation).where(Mitigation.response_id.in_(list(by_response)))
+    )
+    for mitigation in mitigations:
+        by_response[mitigation.response_id].append(mitigation)
+
+    for response in responses:
+        set_committed_value(response, "mitigations", by_response[response.id])
@@ -1,9 +1,137 @@
 """
 Risk calculation and assessment logic
 """
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Iterable, Optional, Tuple
 from config import RISK_WEIGHTS, RISK_THRESHOLDS
-from .helpers import get_question_by_id
+from .catalog import question_catalog
+
+# Responses and categories scoring above this are flagged as high risk
+HIGH_RISK_SCORE = 0.7
+
+# Answer keywords that trigger the overall risk modifiers
+SPECIAL_CATEGORY_KEYWORDS = ("special category", "sensitive")
+CHILDREN_KEYWORDS = ("child", "minor")
+
+
+class ScoringPlan:
+    """
+    Precompiled scoring data for a single question.
+
+    Option risk weights are stored in a value -> weight dict with the
+    question's base weight already multiplied in, and the scorer for the
+    question type is chosen once at compile time.
+    """
+    __slots__ = ("question_id", "category", "base_weight", "weights", "scorer")
+
+    def __init__(self, question_data: Dict[str, Any]):
+        self.question_id = question_data.get("id")
+        self.category = question_data.get("category")
+        self.base_weight = question_data.get("risk_weight", 0.5)
+
+        weights: Dict[Any, float] = {}
+        for option in question_data.get("options") or []:
+            value = option.get("value")
+            try:
+                if value not in weights:
+                    weights[value] = self.base_weight * option.get("risk_weight", 0.5)
+            except TypeError:
+                continue
+        self.weights = weights
+        self.scorer = _SCORERS.get(question_data.get("type"), _score_default)
+
+    def score(self, answer: Any) -> float:
+        """Score an answer to this question"""
+        return self.scorer(self, answer)
+
+
+def _score_multi_select(plan: ScoringPlan, answer: Any) -> float:
+    if not isinstance(answer, list):
+        return 0.0
+
+    weights = plan.weights
+    seen = set()
+    total = 0.0
+    count = 0
+
+    for value in answer:
+        try:
+            weight = weights.get(value)
+        except TypeError:
+            continue
+        if weight is not None and value not in seen:
+            seen.add(value)
+            total += weight
+            count += 1
+
+    # Take the average of selected risk weights
+    return total / count if count else 0.0
+
+
+def _score_select(plan: ScoringPlan, answer: Any) -> float:
+    try:
+        weight = plan.weights.get(answer)
+    except TypeError:
+        weight = None
+    return weight if weight is not None else plan.base_weight * 0.5
+
+
+def _score_number(plan: ScoringPlan, answer: Any) -> float:
+    # Normalize to 0-1 range (assuming 0-100 scale for most questions)
+    try:
+        value = float(answer)
+    except (ValueError, TypeError):
+        return 0.0
+    return plan.base_weight * min(value / 100, 1.0)
+
+
+def _score_text(plan: ScoringPlan, answer: Any) -> float:
+    # For text responses, use default weight
+    # Could implement NLP-based risk assessment here
+    if answer and len(str(answer)) > 0:
+        return plan.base_weight * 0.5
+    return 0.0
+
+
+def _score_default(plan: ScoringPlan, answer: Any) -> float:
+    return plan.base_weight * 0.5
+
+
+_SCORERS = {
+    "multi-select": _score_multi_select,
+    "select": _score_select,
+    "radio": _score_select,
+    "number": _score_number,
+    "text": _score_text,
+    "textarea": _score_text,
+}
+
+
+def _compile_scoring_plans(catalog) -> Dict[str, ScoringPlan]:
+    return {
+        question_id: ScoringPlan(question)
+        for question_id, question in catalog.questions.items()
+    }
+
+
+def get_scoring_plans() -> Dict[str, ScoringPlan]:
+    """
+    Get compiled scoring plans for all catalog questions
+    Plans are rebuilt when the question catalog changes
+    """
+    return question_catalog.derived("scoring_plans", _compile_scoring_plans)
+
+
+def get_scoring_plan(
+    question_id: str,
+    question_data: Optional[Dict[str, Any]] = None
+) -> Optional[ScoringPlan]:
+    """
+    Get the scoring plan for a question
+    Question data that does not come from the catalog is compiled on the fly
+    """
+    if question_data is not None and question_data is not question_catalog.get_question(question_id):
+        return ScoringPlan(question_data)
+    return get_scoring_plans().get(question_id)
 
 
 def calculate_response_risk_score(
@@ -14,65 +142,27 @@ def calculate_response_risk_score(
     """
     Calculate risk score for a single response
     """
-    if not question_data:
-        question_data = get_question_by_id(question_id)
-    
-    if not question_data:
-        return 0.0
-    
-    base_weight = question_data.get("risk_weight", 0.5)
-    question_type = question_data.get("type")
-    
-    # Calculate score based on question type
-    if question_type == "multi-select":
-        if not isinstance(answer, list):
-            return 0.0
-        
-        # Check if any high-risk options are selected
-        options = question_data.get("options", [])
-        selected_risk_weights = []
-        
-        for option in options:
-            if option.get("value") in answer:
-                selected_risk_weights.append(option.get("risk_weight", 0.5))
-        
-        if selected_risk_weights:
-            # Take the average of selected risk weights
-            option_risk = sum(selected_risk_weights) / len(selected_risk_weights)
-            return base_weight * option_risk
-        
-        return 0.0
-    
-    elif question_type in ["select", "radio"]:
-        # Find the selected option's risk weight
-        options = question_data.get("options", [])
-        
-        for option in options:
-            if option.get("value") == answer:
-                option_risk = option.get("risk_weight", 0.5)
-                return base_weight * option_risk
-        
-        return base_weight * 0.5
-    
-    elif question_type == "number":
-        # Normalize number-based risk
-        # This is a simplified approach - can be customized per question
-        try:
-            value = float(answer)
-            # Normalize to 0-1 range (assuming 0-100 scale for most questions)
-            normalized = min(value / 100, 1.0)
-            return base_weight * normalized
-        except (ValueError, TypeError):
-            return 0.0
-    
-    elif question_type in ["text", "textarea"]:
-        # For text responses, use default weight
-        # Could implement NLP-based risk assessment here
-        if answer and len(str(answer)) > 0:
-            return base_weight * 0.5
+    plan = get_scoring_plan(question_id, question_data or None)
+
+    if not plan:
         return 0.0
-    
-    return base_weight * 0.5
+
+    return plan.score(answer)
+
+
+def score_responses(items: Iterable[Tuple[str, Any]]) -> List[float]:
+    """
+    Calculate risk scores for many (question_id, answer) pairs in one call
+    Unknown questions score 0.0
+    """
+    plans = get_scoring_plans()
+    scores = []
+
+    for question_id, answer in items:
+        plan = plans.get(question_id)
+        scores.append(plan.scorer(plan, answer) if plan else 0.0)
+
+    return scores
 
 
 def calculate_category_risk(
@@ -95,18 +185,101 @@ def calculate_category_risk(
     high_risk_questions = [
         r.get("question_id")
         for r in category_responses
-        if r.get("risk_score", 0.0) > 0.7
+        if r.get("risk_score", 0.0) > HIGH_RISK_SCORE
     ]
     
     return avg_score, high_risk_questions
 
 
-def calculate_assessment_risk(responses: List[Dict[str, Any]]) -> Dict[str, Any]:
+def detect_risk_modifiers(answer: Any) -> Tuple[bool, bool]:
     """
-    Calculate overall assessment risk from all responses
-    Returns comprehensive risk analysis
+    Check an answer for high-risk scenario keywords
+    Returns: (special_category_data, children_data)
+    """
+    text = str(answer).lower()
+    return (
+        any(keyword in text for keyword in SPECIAL_CATEGORY_KEYWORDS),
+        any(keyword in text for keyword in CHILDREN_KEYWORDS),
+    )
+
+
+class RiskAggregator:
+    """
+    Single-pass accumulator for assessment risk.
+
+    Collects the overall sum, per-category sums and counts, high-risk
+    questions and modifier flags in one walk over the responses.
+    """
+
+    def __init__(self):
+        self.total_score = 0.0
+        self.response_count = 0
+        self.category_totals: Dict[str, List[float]] = {}
+        self.high_risk_questions: Dict[str, List[str]] = {}
+        self.special_category_data = False
+        self.children_data = False
+
+    def add(
+        self,
+        risk_score: float,
+        category: Optional[str] = None,
+        question_id: Optional[str] = None,
+        answer: Any = ""
+    ) -> None:
+        """Add a single response"""
+        self.total_score += risk_score
+        self.response_count += 1
+
+        if category:
+            totals = self.category_totals.get(category)
+            if totals is None:
+                totals = self.category_totals[category] = [0.0, 0]
+                self.high_risk_questions[category] = []
+            totals[0] += risk_score
+            totals[1] += 1
+            if risk_score > HIGH_RISK_SCORE:
+                self.high_risk_questions[category].append(question_id)
+
+        if not (self.special_category_data and self.children_data):
+            special, children = detect_risk_modifiers(answer)
+            self.special_category_data = self.special_category_data or special
+            self.children_data = self.children_data or children
+
+    def add_responses(self, responses: Iterable[Dict[str, Any]]) -> "RiskAggregator":
+        """Add response dicts as used by calculate_assessment_risk"""
+        add = self.add
+        for r in responses:
+            add(
+                r.get("risk_score", 0.0),
+                r.get("category"),
+                r.get("question_id"),
+                r.get("answer", ""),
+            )
+        return self
+
+    def summary(self) -> Dict[str, Any]:
+        """Build the risk analysis for the collected responses"""
+        return build_risk_summary(
+            self.total_score,
+            self.response_count,
+            self.category_totals,
+            self.special_category_data,
+            self.children_data,
+        )
+
+
+def build_risk_summary(
+    total_score: float,
+    response_count: int,
+    category_totals: Dict[str, Tuple[float, int]],
+    special_category_data: bool,
+    children_data: bool
+) -> Dict[str, Any]:
+    """
+    Build the risk analysis from aggregated sums and counts
+    category_totals maps category -> (score_sum, response_count)
     """
-    if not responses:
+    if not response_count:
         return {
             "overall_risk_score": 0.0,
             "overall_risk_level": "low",
@@ -114,48 +287,34 @@ def calculate_assessment_risk(responses: List[Dict[str, Any]]) -> Dict[str, Any]
             "high_risk_areas": [],
             "recommendations": []
         }
-    
-    # Calculate overall score
-    total_score = sum(r.get("risk_score", 0.0) for r in responses)
-    overall_score = total_score / len(responses)
-    
+
+    overall_score = total_score / response_count
+
     # Apply modifiers for high-risk scenarios
-    special_category_data = any(
-        "special category" in str(r.get("answer", "")).lower() or
-        "sensitive" in str(r.get("answer", "")).lower()
-        for r in responses
-    )
-    
-    children_data = any(
-        "child" in str(r.get("answer", "")).lower() or
-        "minor" in str(r.get("answer", "")).lower()
-        for r in responses
-    )
-    
     if special_category_data:
         overall_score *= 1.3
-    
+
     if children_data:
         overall_score *= 1.2
-    
+
     # Cap at 1.0
     overall_score = min(overall_score, 1.0)
-    
+
     # Calculate category scores
-    categories = set(r.get("category") for r in responses if r.get("category"))
-    category_scores = {}
-    high_risk_areas = []
-    
-    for category in categories:
-        cat_score, high_risk_questions = calculate_category_risk(responses, category)
-        category_scores[category] = cat_score
-        
-        if cat_score > 0.7:
-            high_risk_areas.append(category)
-    
+    category_scores = {
+        category: score_sum / count
+        for category, (score_sum, count) in category_totals.items()
+        if count
+    }
+    high_risk_areas = [
+        category
+        for category, score in category_scores.items()
+        if score > HIGH_RISK_SCORE
+    ]
+
     # Determine risk level
     risk_level = determine_risk_level(overall_score)
-    
+
     # Generate recommendations
     recommendations = generate_recommendations(
         overall_score,
@@ -164,7 +323,7 @@ def calculate_assessment_risk(responses: List[Dict[str, Any]]) -> Dict[str, Any]
         special_category_data,
         children_data
     )
-    
+
     return {
         "overall_risk_score": round(overall_score, 3),
         "overall_risk_level": risk_level,
@@ -174,6 +333,14 @@ def calculate_assessment_risk(responses: List[Dict[str, Any]]) -> Dict[str, Any]
     }
 
 
+def calculate_assessment_risk(responses: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Calculate overall assessment risk from all responses
+    Returns comprehensive risk analysis
+    """
+    return RiskAggregator().add_responses(responses).summary()
+
+
 def determine_risk_level(score: float) -> str:
     """
     Determine risk level based on score
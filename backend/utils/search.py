@@ -0,0 +1,245 @@
+"""
+In-memory full-text search over the GDPR articles and the question catalog
+
+Documents are tokenized into an inverted index when the data files are
+loaded. Every posting stores its precomputed BM25 contribution, so a query
+is a handful of dict lookups and additions. Query terms also match the
+index terms they are a prefix of (found by bisecting the sorted
+vocabulary), at a slightly lower weight than exact matches.
+"""
+import math
+import re
+import threading
+import unicodedata
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Tuple
+from .catalog import gdpr_catalog, question_catalog
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Relative weight of a term in a document's title
+TITLE_WEIGHT = 2.0
+
+# Weight of a prefix match relative to an exact match
+PREFIX_WEIGHT = 0.8
+
+# Most index terms a single query term expands to
+MAX_PREFIX_EXPANSIONS = 64
+
+SNIPPET_CHARS = 160
+SNIPPET_LEAD = 40
+
+_WORD = re.compile(r"\w+")
+
+
+def normalize_token(token: str) -> str:
+    """Case-fold and strip accents, so "Données" matches "donnees" """
+    decomposed = unicodedata.normalize("NFKD", token.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Split text into normalized word tokens"""
+    if not text:
+        return []
+    return [normalize_token(match.group()) for match in _WORD.finditer(text)]
+
+
+class SearchDocument:
+    """A searchable entry: a title and body texts, with its source reference"""
+
+    __slots__ = ("type", "id", "title", "body", "category")
+
+    def __init__(
+        self,
+        type: str,
+        id: str,
+        title: str,
+        body: List[str],
+        category: Optional[str] = None
+    ):
+        self.type = type
+        self.id = id
+        self.title = title
+        self.body = [text for text in body if text]
+        self.category = category
+
+
+class SearchIndex:
+    """Inverted index with precomputed BM25 postings"""
+
+    def __init__(self, documents: List[SearchDocument]):
+        self.documents = documents
+
+        # Weighted term frequencies per document
+        frequencies: List[Dict[str, float]] = []
+        lengths: List[float] = []
+        for document in documents:
+            counts: Dict[str, float] = {}
+            for token in tokenize(document.title):
+                counts[token] = counts.get(token, 0.0) + TITLE_WEIGHT
+            for text in document.body:
+                for token in tokenize(text):
+                    counts[token] = counts.get(token, 0.0) + 1.0
+            frequencies.append(counts)
+            lengths.append(sum(counts.values()))
+
+        average_length = (sum(lengths) / len(lengths)) if lengths else 0.0
+        document_frequency: Dict[str, int] = {}
+        for counts in frequencies:
+            for term in counts:
+                document_frequency[term] = document_frequency.get(term, 0) + 1
+
+        total = len(documents)
+        self.postings: Dict[str, List[Tuple[int, float]]] = {}
+        for doc, counts in enumerate(frequencies):
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[doc] / (average_length or 1.0))
+            for term, tf in counts.items():
+                df = document_frequency[term]
+                idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+                self.postings.setdefault(term, []).append(
+                    (doc, idf * tf * (BM25_K1 + 1) / (tf + norm))
+                )
+
+        self.vocabulary = sorted(self.postings)
+
+    def expand(self, token: str) -> List[Tuple[str, float]]:
+        """Index terms matching a query token, with their weights"""
+        matches = []
+        start = bisect_left(self.vocabulary, token)
+        for term in self.vocabulary[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not term.startswith(token):
+                break
+            matches.append((term, 1.0 if term == token else PREFIX_WEIGHT))
+        return matches
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        type: Optional[str] = None
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Rank documents for a query
+        Returns the number of matching documents and the top results with snippets
+        """
+        scores: Dict[int, float] = {}
+        matched_terms = set()
+
+        for token in dict.fromkeys(tokenize(query)):
+            # A query token counts once per document, through its best expansion
+            best: Dict[int, float] = {}
+            for term, weight in self.expand(token):
+                matched_terms.add(term)
+                for doc, score in self.postings[term]:
+                    score *= weight
+                    if score > best.get(doc, 0.0):
+                        best[doc] = score
+            for doc, score in best.items():
+                scores[doc] = scores.get(doc, 0.0) + score
+
+        if type is not None:
+            scores = {doc: score for doc, score in scores.items() if self.documents[doc].type == type}
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        results = []
+        for doc, score in ranked:
+            document = self.documents[doc]
+            snippet, highlights = make_snippet(document, matched_terms)
+            results.append({
+                "type": document.type,
+                "id": document.id,
+                "title": document.title,
+                "category": document.category,
+                "score": round(score, 4),
+                "snippet": snippet,
+                "highlights": highlights,
+            })
+        return len(scores), results
+
+
+def make_snippet(document: SearchDocument, terms) -> Tuple[str, List[Tuple[int, int]]]:
+    """
+    Excerpt of the first body text containing a matched term (the start of
+    the body if none does), with the offsets of the matched words in it
+    """
+    if not document.body:
+        return "", []
+
+    text, matches = document.body[0], []
+    for candidate in document.body:
+        matches = [
+            match for match in _WORD.finditer(candidate)
+            if normalize_token(match.group()) in terms
+        ]
+        if matches:
+            text = candidate
+            break
+
+    start = 0
+    if matches and matches[0].start() > SNIPPET_LEAD:
+        # Start at a word boundary shortly before the first match
+        start = text.rfind(" ", 0, matches[0].start() - SNIPPET_LEAD) + 1
+    end = min(len(text), start + SNIPPET_CHARS)
+    if end < len(text):
+        end = text.rfind(" ", start, end) if " " in text[start:end] else end
+
+    prefix = "…" if start > 0 else ""
+    snippet = prefix + text[start:end].rstrip() + ("…" if end < len(text) else "")
+    offset = len(prefix) - start
+    highlights = [
+        (match.start() + offset, match.end() + offset)
+        for match in matches
+        if start <= match.start() and match.end() <= end
+    ]
+    return snippet, highlights
+
+
+def _question_documents(catalog) -> List[SearchDocument]:
+    documents = []
+    for question in catalog.questions.values():
+        documents.append(SearchDocument(
+            "question",
+            question.get("id"),
+            question.get("text") or "",
+            [question.get("help_text")] + [
+                option.get("label") for option in question.get("options") or []
+            ],
+            question.get("category"),
+        ))
+    return documents
+
+
+def _article_documents(catalog) -> List[SearchDocument]:
+    return [
+        SearchDocument(
+            "gdpr_article",
+            article.get("number"),
+            article.get("title") or "",
+            [article.get("summary"), article.get("full_text"), article.get("relevance")],
+        )
+        for article in catalog.articles
+    ]
+
+
+_index_lock = threading.Lock()
+_index: Optional[Tuple[Tuple[Any, Any], SearchIndex]] = None
+
+
+def get_search_index() -> SearchIndex:
+    """Get the search index, rebuilt when either data file changes"""
+    global _index
+    questions = question_catalog.derived("search_documents", _question_documents)
+    articles = gdpr_catalog.derived("search_documents", _article_documents)
+
+    cached = _index
+    if cached is not None and cached[0][0] is questions and cached[0][1] is articles:
+        return cached[1]
+
+    with _index_lock:
+        cached = _index
+        if cached is None or cached[0][0] is not questions or cached[0][1] is not articles:
+            cached = _index = ((questions, articles), SearchIndex(articles + questions))
+        return cached[1]
@@ -0,0 +1,95 @@
+"""
+Portfolio statistics for the dashboard
+
+Computed with grouped aggregates: assessment counts from the status/risk
+index, organization averages from the organization/score index, and the
+high-risk categories from the sharded per-category totals kept up to date
+on every response write. None of them reads the individual responses.
+"""
+from typing import Any, Dict
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from models import Assessment, CategoryRiskTotal
+
+UNASSESSED = "unassessed"
+
+
+def _value(member: Any) -> Any:
+    return getattr(member, "value", member)
+
+
+def read_portfolio_stats(db: Session, limit: int = 10) -> Dict[str, Any]:
+    """
+    Assessment counts by status and risk level, the organizations with the
+    most assessments and the categories with the most high-risk responses
+    """
+    by_status: Dict[str, int] = {}
+    by_risk_level: Dict[str, int] = {}
+    matrix: Dict[str, Dict[str, int]] = {}
+    total = 0
+
+    rows = db.execute(
+        select(Assessment.status, Assessment.overall_risk_level, func.count())
+        .group_by(Assessment.status, Assessment.overall_risk_level)
+    ).all()
+    for status, risk_level, count in rows:
+        status = _value(status)
+        risk_level = _value(risk_level) if risk_level is not None else UNASSESSED
+        total += count
+        by_status[status] = by_status.get(status, 0) + count
+        by_risk_level[risk_level] = by_risk_level.get(risk_level, 0) + count
+        matrix.setdefault(status, {})[risk_level] = count
+
+    assessment_count = func.count().label("assessment_count")
+    organizations = db.execute(
+        select(
+            Assessment.organization,
+            assessment_count,
+            func.avg(Assessment.overall_risk_score),
+            # Number of organizations, before the limit
+            func.count().over(),
+        )
+        .group_by(Assessment.organization)
+        .order_by(assessment_count.desc(), Assessment.organization)
+        .limit(limit)
+    ).all()
+
+    high_risk_count = func.sum(CategoryRiskTotal.high_risk_count).label("high_risk_count")
+    categories = db.execute(
+        select(
+            CategoryRiskTotal.category,
+            func.sum(CategoryRiskTotal.response_count).label("response_count"),
+            high_risk_count,
+            func.sum(CategoryRiskTotal.score_sum).label("score_sum"),
+        )
+        .group_by(CategoryRiskTotal.category)
+        .having(high_risk_count > 0)
+        .order_by(high_risk_count.desc(), CategoryRiskTotal.category)
+        .limit(limit)
+    ).all()
+
+    return {
+        "total_assessments": total,
+        "by_status": by_status,
+        "by_risk_level": by_risk_level,
+        "by_status_and_risk_level": matrix,
+        "organization_count": organizations[0][3] if organizations else 0,
+        "organizations": [
+            {
+                "organization": organization,
+                "assessment_count": count,
+                "average_risk_score": round(average or 0.0, 3),
+            }
+            for organization, count, average, _ in organizations
+        ],
+        "high_risk_categories": [
+            {
+                "category": row.category,
+                "response_count": row.response_count,
+                "high_risk_count": row.high_risk_count,
+                "high_risk_share": round(row.high_risk_count / row.response_count, 3),
+                "average_risk_score": round(row.score_sum / row.response_count, 3),
+            }
+            for row in categories
+        ],
+    }
@@ -0,0 +1,255 @@
+"""
+Tabular export of every response, for loading into analytics tools
+
+One row per response, with the fields of its assessment alongside. Answers
+to multi-select questions are also flattened into one boolean column per
+option of the question catalog, named "<question id>.<option value>": true
+or false on that question's rows, empty on the rows of other questions.
+
+Rows are encoded a chunk at a time as CSV, Apache Arrow IPC stream or
+Parquet (one row group per chunk); the columnar formats need pyarrow.
+"""
+import csv
+import io
+import json
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from .catalog import question_catalog
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pq = None
+
+# Fixed columns and their types, before the option columns
+BASE_COLUMNS: List[Tuple[str, str]] = [
+    ("assessment_id", "string"),
+    ("assessment_title", "string"),
+    ("organization", "string"),
+    ("assessment_status", "string"),
+    ("overall_risk_level", "string"),
+    ("overall_risk_score", "float"),
+    ("response_id", "string"),
+    ("question_id", "string"),
+    ("category", "string"),
+    ("answer", "string"),
+    ("risk_score", "float"),
+    ("special_category_data", "bool"),
+    ("children_data", "bool"),
+    ("notes", "string"),
+    ("created_at", "timestamp"),
+    ("updated_at", "timestamp"),
+]
+
+TABLE_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def _answer_text(answer: Any) -> Optional[str]:
+    """Text answers as they are, anything else as JSON"""
+    if answer is None or isinstance(answer, str):
+        return answer
+    return json.dumps(answer, default=str)
+
+
+def _enum_value(value: Any) -> Any:
+    return getattr(value, "value", value)
+
+
+class ResponseTable:
+    """Column layout of the response export for one version of the question catalog"""
+
+    def __init__(self, questions: Sequence[Mapping[str, Any]]):
+        self.columns: List[Tuple[str, str]] = list(BASE_COLUMNS)
+        # question id -> (option value -> column position, all its positions)
+        self.option_columns: Dict[str, Tuple[Dict[Any, int], List[int]]] = {}
+
+        for question in questions:
+            if question.get("type") != "multi-select":
+                continue
+            positions: Dict[Any, int] = {}
+            for option in question.get("options") or []:
+                value = option.get("value")
+                if value in positions:
+                    continue
+                positions[value] = len(self.columns)
+                self.columns.append((f"{question.get('id')}.{value}", "bool"))
+            if positions:
+                self.option_columns[question.get("id")] = (positions, list(positions.values()))
+
+        self.names = [name for name, _ in self.columns]
+        self.width = len(self.columns)
+
+    @classmethod
+    def from_catalog(cls, catalog) -> "ResponseTable":
+        return cls(list(catalog.questions.values()))
+
+    def rows(self, records: Sequence[Mapping[str, Any]]) -> List[List[Any]]:
+        """Flatten joined response/assessment records into rows"""
+        padding = [None] * (self.width - len(BASE_COLUMNS))
+        rows = []
+        for record in records:
+            answer = record["answer"]
+            row = [
+                record["assessment_id"],
+                record["assessment_title"],
+                record["organization"],
+                _enum_value(record["assessment_status"]),
+                _enum_value(record["overall_risk_level"]),
+                record["overall_risk_score"],
+                record["response_id"],
+                record["question_id"],
+                record["category"],
+                _answer_text(answer),
+                record["risk_score"],
+                record["special_category_data"],
+                record["children_data"],
+                record["notes"],
+                record["created_at"],
+                record["updated_at"],
+            ]
+            row.extend(padding)
+
+            options = self.option_columns.get(record["question_id"])
+            if options is not None:
+                positions, all_positions = options
+                for position in all_positions:
+                    row[position] = False
+                # Answers are stored as {"value": [...]}, or bare lists by older clients
+                selected = answer.get("value") if isinstance(answer, dict) else answer
+                if isinstance(selected, list):
+                    for value in selected:
+                        try:
+                            position = positions.get(value)
+                        except TypeError:
+                            continue
+                        if position is not None:
+                            row[position] = True
+            rows.append(row)
+        return rows
+
+
+def get_response_table() -> ResponseTable:
+    """Get the column layout, rebuilt when the question catalog changes"""
+    return question_catalog.derived("response_table", ResponseTable.from_catalog)
+
+
+class _OutputSink:
+    """Write-only file collecting what a writer produces, drained after each chunk"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class TableEncoder(ABC):
+    """Incremental encoder: start(), then chunk() per batch of records, then end()"""
+
+    def __init__(self, table: ResponseTable):
+        self.table = table
+
+    def start(self) -> bytes:
+        return b""
+
+    @abstractmethod
+    def chunk(self, records: Sequence[Mapping[str, Any]]) -> bytes:
+        """Encoded rows of a batch of records"""
+
+    def end(self) -> bytes:
+        return b""
+
+
+class CSVTableEncoder(TableEncoder):
+    """RFC 4180 CSV with a header row; timestamps in ISO 8601, booleans as true/false"""
+
+    def _encode(self, rows: List[List[Any]]) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\r\n").writerows(rows)
+        return buffer.getvalue().encode("utf-8")
+
+    def start(self) -> bytes:
+        return self._encode([self.table.names])
+
+    def chunk(self, records: Sequence[Mapping[str, Any]]) -> bytes:
+        rows = self.table.rows(records)
+        for row in rows:
+            for position, value in enumerate(row):
+                if isinstance(value, bool):
+                    row[position] = "true" if value else "false"
+                elif isinstance(value, datetime):
+                    row[position] = value.isoformat()
+        return self._encode(rows)
+
+
+class ArrowTableEncoder(TableEncoder):
+    """Arrow IPC stream (format "arrow") or Parquet (format "parquet")"""
+
+    def __init__(self, table: ResponseTable, format: str):
+        if pa is None:
+            raise RuntimeError("Arrow and Parquet exports require pyarrow (pip install pyarrow)")
+        super().__init__(table)
+        types = {
+            "string": pa.string(),
+            "float": pa.float64(),
+            "bool": pa.bool_(),
+            "timestamp": pa.timestamp("us"),
+        }
+        self.schema = pa.schema([(name, types[kind]) for name, kind in table.columns])
+        self._sink = _OutputSink()
+        output = pa.PythonFile(self._sink, mode="w")
+        if format == "parquet":
+            self._writer = pq.ParquetWriter(output, self.schema, compression="snappy")
+        else:
+            self._writer = pa.ipc.new_stream(output, self.schema)
+
+    def start(self) -> bytes:
+        return self._sink.drain()
+
+    def chunk(self, records: Sequence[Mapping[str, Any]]) -> bytes:
+        columns = list(zip(*self.table.rows(records))) or [()] * self.table.width
+        batch = pa.RecordBatch.from_arrays(
+            [pa.array(column, type=field.type) for column, field in zip(columns, self.schema)],
+            schema=self.schema,
+        )
+        self._writer.write_batch(batch)
+        return self._sink.drain()
+
+    def end(self) -> bytes:
+        self._writer.close()
+        return self._sink.drain()
+
+
+def table_encoder(format: str, table: Optional[ResponseTable] = None) -> TableEncoder:
+    """Encoder for an export format: csv, arrow or parquet"""
+    table = table or get_response_table()
+    if format == "csv":
+        return CSVTableEncoder(table)
+    return ArrowTableEncoder(table, format)
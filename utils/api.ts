@@ -67,6 +67,7 @@ export interface AssessmentUpdate {
 export interface AssessmentListParams {
     status?: string;
     risk_level?: string;
+    cursor?: string;
     skip?: number;
     limit?: number;
 }